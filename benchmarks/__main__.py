@@ -0,0 +1,45 @@
+"""Run the In-Process Load Benchmarks: python -m benchmarks --help"""
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import sys
+
+# Settings are Read at Import Time, so the Environment is Prepared before the App is Imported
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./benchmarks.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("HASHING_ALGORITHM", "HS256")
+os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "whsec_benchmark")
+os.environ.setdefault("APPLICATION_URL", "http://bench.local")
+# Every Simulated Client Shares one Address, so Limits would Measure the Limiter, not the API
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="In-Process Load Benchmarks for the API")
+    parser.add_argument("--scenarios", default="all",
+                        help="Comma Separated Scenario Names, or 'all'")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="Requests per Scenario")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="Requests in Flight per Scenario")
+    parser.add_argument("--users", type=int, default=1000,
+                        help="Seeded Users (each with one Account)")
+    parser.add_argument("--history", type=int, default=20000,
+                        help="Seeded Transactions on the Hot Account")
+    parser.add_argument("--hot-accounts", type=int, default=3,
+                        help="Receiver Accounts Targeted by the Transfer Scenario")
+    parser.add_argument("--stripe-latency", type=float, default=0.0,
+                        help="Simulated Stripe Latency in Seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="-",
+                        help="Path of the JSON Report ('-' for stdout)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    from benchmarks.runner import run_benchmarks
+    asyncio.run(run_benchmarks(parse_args()))
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from uuid import uuid4
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+
+
+# In-Process Stand-In for the Stripe Gateway (Swapped in with set_stripe_gateway)
+class FakeStripeGateway:
+    def __init__(self, products: int = 5, latency: float = 0.0):
+        self.latency = latency
+        self.products = [SimpleNamespace(id=f"prod_bench_{i}",
+                                         name=f"Plan {i}",
+                                         description=f"Benchmark Plan {i}")
+                         for i in range(products)]
+        self.prices = [SimpleNamespace(id=f"price_bench_{i}",
+                                       product=f"prod_bench_{i}",
+                                       unit_amount=500 * (i + 1),
+                                       currency="usd",
+                                       recurring={"interval": "month"})
+                       for i in range(products)]
+        self.calls = 0
+
+    async def _respond(self, value):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return value
+
+    async def list_products(self) -> list:
+        return await self._respond(list(self.products))
+
+    async def list_prices(self) -> list:
+        return await self._respond(list(self.prices))
+
+    async def create_checkout_session(self, **params):
+        return await self._respond(SimpleNamespace(id=f"cs_bench_{uuid4().hex}",
+                                                   url="https://checkout.invalid/bench"))
+
+    def shutdown(self):
+        pass
+
+
+# Util Function to Sign a Webhook Payload the Way Stripe Does
+def sign_webhook(event: dict, secret: str) -> tuple[bytes, dict]:
+    payload = json.dumps(event).encode()
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload,
+                         hashlib.sha256).hexdigest()
+    return payload, {"stripe-signature": f"t={timestamp},v1={signature}",
+                     "content-type": "application/json"}
+
+
+# Util Function to Build an invoice.paid Event for a Customer Email
+def invoice_paid_event(email: str, amount_paid: int = 500) -> dict:
+    now = int(time.time())
+    return {
+        "id": f"evt_bench_{uuid4().hex}",
+        "object": "event",
+        "type": "invoice.paid",
+        "data": {"object": {
+            "object": "invoice",
+            "customer_email": email,
+            "subscription": f"sub_bench_{uuid4().hex[:16]}",
+            "currency": "usd",
+            "amount_paid": amount_paid,
+            "lines": {"data": [{"period": {"start": now, "end": now + 30 * 86400}}]},
+        }},
+    }
@@ -0,0 +1,253 @@
+"""Fill the Database with Synthetic Data: python -m benchmarks.generate --help"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import insert, select, func
+from schemas.roles import Role, ValidRoles
+from schemas.users import User
+from schemas.accounts import Account, ValidAccountStatus
+from schemas.transactions import Transaction, ValidTransactionStatus
+from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from utils.db import engine
+from utils.migrations import migrate_database
+from utils.hashing import bcrypt_context
+from passlib.utils.binary import bcrypt64
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from uuid import UUID
+import numpy as np
+
+# Password Shared by every Generated User (Hashed once, not per Row, with a Salt Drawn from
+# the Seed, so Reruns and Resumed Runs Write the Same Hash)
+SYNTHETIC_PASSWORD = "synthetic-password-123"
+
+# Independent Random Streams, so each Table and Batch can be Regenerated on its Own
+(USER_IDS, ACCOUNT_IDS, HOT_RANKING, USERS, ACCOUNTS, TRANSACTIONS, SUBSCRIPTIONS, ACTIVE_OWNERS,
+ PASSWORD_SALT) = range(9)
+
+TRANSACTION_STATUSES = np.array([ValidTransactionStatus.COMPLETED,
+                                 ValidTransactionStatus.REJECTED,
+                                 ValidTransactionStatus.CANCELED], dtype=object)
+TRANSACTION_STATUS_WEIGHTS = [0.97, 0.02, 0.01]
+
+SUBSCRIPTION_STATUSES = np.array([ValidSubscriptionStatus.ACTIVE,
+                                  ValidSubscriptionStatus.ENDED,
+                                  ValidSubscriptionStatus.CANCELED], dtype=object)
+SUBSCRIPTION_STATUS_WEIGHTS = [0.6, 0.3, 0.1]
+SUBSCRIPTION_PLANS = np.array([5.0, 20.0, 50.0])
+SUBSCRIPTION_PERIOD_US = np.int64(30 * 86400 * 1e6)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def batch_rng(seed: int, stream: int, batch: int) -> np.random.Generator:
+    return np.random.default_rng([seed, stream, batch])
+
+
+# Util Function to Draw Version 4 UUIDs as a (count, 16) Byte Array
+def random_uuids(rng: np.random.Generator, count: int) -> np.ndarray:
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+
+def uuid_block(seed: int, stream: int, count: int) -> np.ndarray:
+    return random_uuids(np.random.default_rng([seed, stream]), count)
+
+
+def as_uuids(block: np.ndarray) -> list[UUID]:
+    data = block.tobytes()
+    return [UUID(bytes=data[i:i + 16]) for i in range(0, len(data), 16)]
+
+
+def as_datetimes(micros: np.ndarray) -> list[datetime]:
+    return [EPOCH + timedelta(microseconds=value) for value in micros.tolist()]
+
+
+# Subscription Periods are Naive UTC Columns, Like the Ones the Stripe Webhook Writes
+def as_naive_datetimes(micros: np.ndarray) -> list[datetime]:
+    return [moment.replace(tzinfo=None) for moment in as_datetimes(micros)]
+
+
+def usernames(indices: np.ndarray) -> list[str]:
+    return [f"synthetic_{index:08d}" for index in indices.tolist()]
+
+
+# Vectorized Row Builders, one Batch per Call
+class SyntheticLedger:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.user_ids = uuid_block(args.seed, USER_IDS, args.users)
+        self.account_ids = uuid_block(args.seed, ACCOUNT_IDS, args.users)
+
+        # Zipf Ranks are Mapped through a Fixed Permutation, so Hot Accounts are Spread Out
+        self.ranking = np.random.default_rng([args.seed, HOT_RANKING]).permutation(args.users)
+
+        # Owners of Active Subscriptions, Distinct so no User Gets a Second Active one
+        self.active_owners = np.random.default_rng([args.seed, ACTIVE_OWNERS]).permutation(args.users)
+
+        salt = bcrypt64.encode_bytes(np.random.default_rng([args.seed, PASSWORD_SALT]).bytes(16)).decode()
+        self.password = bcrypt_context.handler().using(salt=salt).hash(SYNTHETIC_PASSWORD)
+        self.end = datetime.fromisoformat(args.end).replace(tzinfo=timezone.utc)
+        self.start_us = int((self.end - timedelta(days=args.days) - EPOCH).total_seconds() * 1e6)
+        self.span_us = args.days * 86400 * 1e6
+
+    def hot_accounts(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        ranks = (rng.zipf(self.args.zipf, size) - 1) % self.args.users
+        return self.ranking[ranks]
+
+    def users(self, start: int, stop: int) -> dict:
+        indices = np.arange(start, stop)
+        names = usernames(indices)
+        created = as_datetimes(self.start_us + (indices * (self.span_us / self.args.users)).astype(np.int64))
+        return {"id": as_uuids(self.user_ids[start:stop]),
+                "username": names,
+                "email": [f"{name}@synthetic.local" for name in names],
+                "password": [self.password] * len(names),
+                "role_id": [self.args.role_id] * len(names),
+                "created_at": created,
+                "updated_at": created}
+
+    def accounts(self, rng: np.random.Generator, start: int, stop: int) -> dict:
+        count = stop - start
+        return {"id": as_uuids(self.account_ids[start:stop]),
+                "user_id": as_uuids(self.user_ids[start:stop]),
+                "currency": ["USD"] * count,
+                "balance": np.round(rng.lognormal(7, 1.5, count), 2).tolist(),
+                "status": [ValidAccountStatus.ACTIVE] * count}
+
+    def transactions(self, rng: np.random.Generator, start: int, stop: int) -> dict:
+        count = stop - start
+        senders = self.hot_accounts(rng, count)
+        receivers = self.hot_accounts(rng, count)
+        receivers = np.where(receivers == senders, (receivers + 1) % self.args.users, receivers)
+
+        # Global Positions are Spread Evenly over the Time Span, so made_at Rises with Row Order
+        step_us = self.span_us / self.args.transactions
+        positions = np.arange(start, stop) + rng.random(count)
+        made_at = self.start_us + (positions * step_us).astype(np.int64)
+
+        return {"id": as_uuids(random_uuids(rng, count)),
+                "sender_account_id": as_uuids(self.account_ids[senders]),
+                "receiver_account_id": as_uuids(self.account_ids[receivers]),
+                "sender_username": usernames(senders),
+                "receiver_username": usernames(receivers),
+                "transfer_amount": np.round(rng.lognormal(3, 1.2, count), 2).tolist(),
+                "made_at": as_datetimes(made_at),
+                "status": rng.choice(TRANSACTION_STATUSES, count, p=TRANSACTION_STATUS_WEIGHTS).tolist()}
+
+    def subscriptions(self, rng: np.random.Generator, start: int, stop: int) -> dict:
+        count = stop - start
+        owners = rng.integers(0, self.args.users, count)
+        history_us = self.span_us - SUBSCRIPTION_PERIOD_US
+        started = self.start_us + (rng.random(count) * history_us).astype(np.int64)
+        drawn = rng.choice(len(SUBSCRIPTION_STATUSES), count, p=SUBSCRIPTION_STATUS_WEIGHTS)
+
+        # Row i can be Active only while i < users, and then Belongs to the i-th Active Owner.
+        # Active Periods Start in the Final Period of the Span, so they are each Owner's Latest.
+        indices = np.arange(start, stop)
+        active = (drawn == 0) & (indices < self.args.users)
+        drawn[(drawn == 0) & ~active] = 1
+        owners = np.where(active, self.active_owners[np.minimum(indices, self.args.users - 1)], owners)
+        latest = self.start_us + history_us + (rng.random(count) * SUBSCRIPTION_PERIOD_US).astype(np.int64)
+        started = np.where(active, latest, started)
+
+        return {"id": as_uuids(random_uuids(rng, count)),
+                "user_id": as_uuids(self.user_ids[owners]),
+                "source_id": [f"sub_synthetic_{index:010d}" for index in range(start, stop)],
+                "currency": ["usd"] * count,
+                "amount": rng.choice(SUBSCRIPTION_PLANS, count).tolist(),
+                "started_at": as_naive_datetimes(started),
+                "ended_at": as_naive_datetimes(started + SUBSCRIPTION_PERIOD_US),
+                "status": SUBSCRIPTION_STATUSES[drawn].tolist()}
+
+
+# Util Function to Load one Batch of Columns (COPY on asyncpg, executemany Otherwise)
+async def load_batch(conn, model, columns: dict):
+    if engine.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        enums = {name for name, values in columns.items() if values and hasattr(values[0], "name")}
+        records = zip(*[[value.name for value in values] if name in enums else values
+                        for name, values in columns.items()])
+        await raw.driver_connection.copy_records_to_table(model.__tablename__,
+                                                          records=records,
+                                                          columns=list(columns))
+    else:
+        names = list(columns)
+        await conn.execute(insert(model), [dict(zip(names, row)) for row in zip(*columns.values())])
+
+
+# Util Function to Fill a Table Batch by Batch, Skipping Batches Already Committed
+async def fill_table(model, total: int, batch_size: int, build, seed: int, stream: int):
+    async with engine.connect() as conn:
+        existing = (await conn.execute(select(func.count()).select_from(model))).scalar_one()
+
+    # Batches Depend on the Arguments, so a Run must be Resumed with the Same Ones
+    first_batch = existing // batch_size
+    batches = (total + batch_size - 1) // batch_size
+    if existing >= total:
+        print(f"{model.__tablename__}: Already Holds {existing} Rows, Skipping")
+        return
+    if first_batch:
+        print(f"{model.__tablename__}: Resuming at Batch {first_batch + 1}/{batches}")
+
+    for batch in range(first_batch, batches):
+        started = perf_counter()
+        start, stop = batch * batch_size, min(total, (batch + 1) * batch_size)
+        columns = build(batch_rng(seed, stream, batch), start, stop)
+
+        # Each Batch Commits on its Own, so an Interrupted Run Resumes at a Batch Boundary
+        async with engine.begin() as conn:
+            await load_batch(conn, model, columns)
+
+        elapsed = perf_counter() - started
+        print(f"{model.__tablename__}: Batch {batch + 1}/{batches} "
+              f"({stop - start} Rows, {(stop - start) / elapsed:,.0f} Rows/s)")
+
+
+async def generate(args: argparse.Namespace):
+    await migrate_database()
+    async with engine.begin() as conn:
+        if not (await conn.execute(select(func.count()).select_from(Role))).scalar_one():
+            await conn.execute(insert(Role), [{"level": 0, "position": ValidRoles.USER},
+                                              {"level": 1, "position": ValidRoles.DEVELOPER},
+                                              {"level": 2, "position": ValidRoles.ADMIN}])
+
+    ledger = SyntheticLedger(args)
+    await fill_table(User, args.users, args.batch_size,
+                     lambda rng, start, stop: ledger.users(start, stop), args.seed, USERS)
+    await fill_table(Account, args.users, args.batch_size, ledger.accounts, args.seed, ACCOUNTS)
+    await fill_table(Transaction, args.transactions, args.batch_size,
+                     ledger.transactions, args.seed, TRANSACTIONS)
+    await fill_table(Subscription, args.subscriptions, args.batch_size,
+                     ledger.subscriptions, args.seed, SUBSCRIPTIONS)
+    await engine.dispose()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.generate",
+                                     description="Deterministic Synthetic Ledger Generator")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--transactions", type=int, default=10_000_000)
+    parser.add_argument("--subscriptions", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=50_000,
+                        help="Rows per Committed Batch (Keep it Fixed when Resuming)")
+    parser.add_argument("--days", type=int, default=365,
+                        help="Time Span Covered by made_at")
+    parser.add_argument("--end", default="2026-01-01",
+                        help="Date the Time Span Ends on (Fixed by Default, so Runs on any Day Match)")
+    parser.add_argument("--zipf", type=float, default=1.3,
+                        help="Zipf Exponent of Sender/Receiver Popularity (> 1)")
+    parser.add_argument("--role-id", type=int, default=2,
+                        help="Role ID Given to Generated Users")
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(generate(parse_args()))
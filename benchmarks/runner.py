@@ -0,0 +1,86 @@
+from httpx import AsyncClient, ASGITransport
+from benchmarks.fakes import FakeStripeGateway
+from benchmarks.seed import seed_database
+from benchmarks.stats import LatencyRecorder
+from benchmarks.scenarios import SCENARIOS, BenchmarkContext
+from utils.auth import create_access_token
+from utils.db import engine
+from utils.roles import role_registry
+from utils.stripe_gateway import set_stripe_gateway
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+import argparse
+import platform
+import subprocess
+import random
+import json
+import os
+import sys
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+# Boot the App In-Process, Seed the Database, Run the Scenarios and Write a JSON Report
+async def run_benchmarks(args: argparse.Namespace) -> dict:
+    import main
+
+    names = list(SCENARIOS) if args.scenarios == "all" else args.scenarios.split(",")
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown Scenarios: {', '.join(unknown)}")
+
+    set_stripe_gateway(FakeStripeGateway(latency=args.stripe_latency))
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": engine.dialect.name,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "history": args.history,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+
+    async with main.app.router.lifespan_context(main.app):
+        data = await seed_database(args.users, args.history, args.seed)
+        await role_registry.load()
+
+        # Tokens are Minted Directly, so only the Login Scenario Pays for bcrypt
+        tokens = [create_access_token(username, user_id, data.role, timedelta(hours=1))
+                  for username, user_id in zip(data.usernames, data.user_ids)]
+
+        transport = ASGITransport(app=main.app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name in names:
+                context = BenchmarkContext(client=client,
+                                           data=data,
+                                           tokens=tokens,
+                                           webhook_secret=os.environ["STRIPE_WEBHOOK_SECRET"],
+                                           hot_accounts=args.hot_accounts,
+                                           history_rows=args.history,
+                                           rng=random.Random(args.seed))
+                recorder = LatencyRecorder()
+                started = perf_counter()
+                extras = await SCENARIOS[name](context, recorder, args.requests, args.concurrency)
+                summary = recorder.summary(perf_counter() - started)
+                summary.update(extras)
+                report["scenarios"][name] = summary
+                print(f"{name}: {summary['wall_seconds']:.2f}s", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w") as report_file:
+            report_file.write(output)
+    return report
@@ -0,0 +1,153 @@
+from httpx import AsyncClient, Response
+from benchmarks.fakes import sign_webhook, invoice_paid_event
+from benchmarks.seed import SeededData, BENCH_PASSWORD
+from benchmarks.stats import LatencyRecorder
+from utils.db import AsyncSessionLocal
+from utils.webhooks import webhook_worker
+from dataclasses import dataclass
+from time import perf_counter
+import asyncio
+import random
+
+
+# Shared State Handed to every Scenario
+@dataclass
+class BenchmarkContext:
+    client: AsyncClient
+    data: SeededData
+    tokens: list[str]
+    webhook_secret: str
+    hot_accounts: int
+    history_rows: int
+    rng: random.Random
+
+    def auth(self, index: int) -> dict:
+        return {"Authorization": f"Bearer {self.tokens[index]}"}
+
+
+# Util Function to Run `total` Calls of `task` with at Most `concurrency` in Flight
+async def drive(total: int, concurrency: int, task):
+    indices = iter(range(total))
+
+    async def worker():
+        for index in indices:
+            await task(index)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, total)))))
+
+
+async def timed(ctx: BenchmarkContext, recorder: LatencyRecorder, endpoint: str,
+                method: str, url: str, **kwargs) -> Response:
+    started = perf_counter()
+    response = await ctx.client.request(method, url, **kwargs)
+    recorder.record(endpoint, perf_counter() - started, response.status_code)
+    return response
+
+
+# Concurrent Logins, Dominated by bcrypt Verification on the Hashing Pool
+async def login_storm(ctx: BenchmarkContext, recorder: LatencyRecorder,
+                      requests: int, concurrency: int) -> dict:
+    users = len(ctx.data.usernames)
+
+    async def login(index: int):
+        await timed(ctx, recorder, "POST /api/auth/login", "POST",
+                    f"/api/auth/login?mode={ctx.data.role}",
+                    data={"username": ctx.data.usernames[index % users],
+                          "password": BENCH_PASSWORD})
+
+    await drive(requests, concurrency, login)
+    return {}
+
+
+# Transfers from Many Senders into a Few Hot Receiver Accounts
+async def transfer_contention(ctx: BenchmarkContext, recorder: LatencyRecorder,
+                              requests: int, concurrency: int) -> dict:
+    users = len(ctx.data.usernames)
+
+    async def transfer(index: int):
+        sender = ctx.rng.randrange(ctx.hot_accounts, users)
+        receiver = ctx.rng.randrange(0, ctx.hot_accounts)
+        await timed(ctx, recorder, "POST /api/accounts/transfer", "POST",
+                    "/api/accounts/transfer", headers=ctx.auth(sender),
+                    json={"receiver_account_id": str(ctx.data.account_ids[receiver]),
+                          "receiver_username": ctx.data.usernames[receiver],
+                          "transfer_amount": 1.0})
+
+    await drive(requests, concurrency, transfer)
+    return {}
+
+
+# Deep History Reads of the Hot Account, by Cursor Walks and by Random Offsets
+async def history_paging(ctx: BenchmarkContext, recorder: LatencyRecorder,
+                         requests: int, concurrency: int) -> dict:
+    headers = ctx.auth(0)
+    pages = 0
+
+    async def walk(index: int):
+        nonlocal pages
+        params = {"limit": 100}
+        for _ in range(max(1, requests // concurrency)):
+            response = await timed(ctx, recorder, "GET /api/accounts/transactions?cursor", "GET",
+                                   "/api/accounts/transactions", headers=headers, params=params)
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params = {"limit": 100, "cursor": cursor}
+
+    async def offset_page(index: int):
+        await timed(ctx, recorder, "GET /api/accounts/transactions?offset", "GET",
+                    "/api/accounts/transactions", headers=headers,
+                    params={"limit": 100, "offset": ctx.rng.randrange(0, max(1, ctx.history_rows))})
+
+    await drive(concurrency, concurrency, walk)
+    await drive(requests, concurrency, offset_page)
+    return {"cursor_pages": pages}
+
+
+# Bursts of Signed invoice.paid Webhooks, then the Time for the Inbox to Drain
+async def webhook_burst(ctx: BenchmarkContext, recorder: LatencyRecorder,
+                        requests: int, concurrency: int) -> dict:
+    emails = ctx.data.emails
+
+    async def deliver(index: int):
+        payload, headers = sign_webhook(invoice_paid_event(ctx.rng.choice(emails)), ctx.webhook_secret)
+        await timed(ctx, recorder, "POST /api/payment/webhook", "POST",
+                    "/api/payment/webhook", content=payload, headers=headers)
+
+    await drive(requests, concurrency, deliver)
+
+    started = perf_counter()
+    webhook_worker.notify()
+    pending = -1
+    while pending != 0 and perf_counter() - started < 60:
+        async with AsyncSessionLocal() as db:
+            pending = (await webhook_worker.metrics(db))["pending"]
+        if pending:
+            await asyncio.sleep(0.05)
+    return {"inbox_drain_seconds": perf_counter() - started, "inbox_pending": pending}
+
+
+# Product Catalog Reads, Half of them Revalidating with If-None-Match
+async def catalog_reads(ctx: BenchmarkContext, recorder: LatencyRecorder,
+                        requests: int, concurrency: int) -> dict:
+    etag = (await ctx.client.get("/api/plan/products")).headers.get("ETag")
+
+    async def read(index: int):
+        if index % 2 and etag:
+            await timed(ctx, recorder, "GET /api/plan/products (If-None-Match)", "GET",
+                        "/api/plan/products", headers={"If-None-Match": etag})
+        else:
+            await timed(ctx, recorder, "GET /api/plan/products", "GET", "/api/plan/products")
+
+    await drive(requests, concurrency, read)
+    return {}
+
+
+SCENARIOS = {
+    "login_storm": login_storm,
+    "transfer_contention": transfer_contention,
+    "history_paging": history_paging,
+    "webhook_burst": webhook_burst,
+    "catalog_reads": catalog_reads,
+}
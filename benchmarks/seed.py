@@ -0,0 +1,85 @@
+from sqlalchemy import insert, delete
+from schemas.roles import Role, ValidRoles
+from schemas.users import User
+from schemas.accounts import Account, ValidAccountStatus
+from schemas.transactions import Transaction, ValidTransactionStatus
+from utils.db import AsyncSessionLocal
+from utils.hashing import bcrypt_context
+from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+import random
+
+BENCH_PASSWORD = "bench-password-123"
+SEED_CHUNK_SIZE = 1000
+
+
+# Identities and Accounts Created for a Benchmark Run
+@dataclass
+class SeededData:
+    usernames: list[str] = field(default_factory=list)
+    emails: list[str] = field(default_factory=list)
+    user_ids: list[UUID] = field(default_factory=list)
+    account_ids: list[UUID] = field(default_factory=list)
+    role: str = ValidRoles.DEVELOPER.value
+
+
+async def _insert_chunked(db, model, rows: list[dict]):
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        await db.execute(insert(model), rows[start:start + SEED_CHUNK_SIZE])
+
+
+# Util Function to Reset the Tables and Seed Users, Accounts and a Deep History
+# The Password is Hashed once and Reused, so Seeding Skips bcrypt per User.
+async def seed_database(users: int, history_rows: int, seed: int) -> SeededData:
+    rng = random.Random(seed)
+    data = SeededData()
+    hashed = bcrypt_context.hash(BENCH_PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    async with AsyncSessionLocal() as db:
+        for model in (Transaction, Account, User, Role):
+            await db.execute(delete(model))
+
+        await db.execute(insert(Role), [{"id": 1, "level": 0, "position": ValidRoles.USER},
+                                        {"id": 2, "level": 1, "position": ValidRoles.DEVELOPER},
+                                        {"id": 3, "level": 2, "position": ValidRoles.ADMIN}])
+
+        user_rows, account_rows = [], []
+        for i in range(users):
+            user_id, account_id = uuid4(), uuid4()
+            username = f"bench_user_{i:06d}"
+            email = f"{username}@bench.local"
+            user_rows.append({"id": user_id, "username": username, "email": email,
+                              "password": hashed, "role_id": 2,
+                              "created_at": now, "updated_at": now})
+            account_rows.append({"id": account_id, "user_id": user_id, "currency": "USD",
+                                 "balance": 1_000_000_000.0, "status": ValidAccountStatus.ACTIVE})
+            data.usernames.append(username)
+            data.emails.append(email)
+            data.user_ids.append(user_id)
+            data.account_ids.append(account_id)
+
+        await _insert_chunked(db, User, user_rows)
+        await _insert_chunked(db, Account, account_rows)
+
+        # The First Account Carries the Deep History, Half Sent and Half Received
+        hot_account, hot_username = data.account_ids[0], data.usernames[0]
+        transaction_rows = []
+        for i in range(history_rows):
+            other = rng.randrange(1, users)
+            sent = i % 2 == 0
+            transaction_rows.append({
+                "id": uuid4(),
+                "sender_account_id": hot_account if sent else data.account_ids[other],
+                "receiver_account_id": data.account_ids[other] if sent else hot_account,
+                "sender_username": hot_username if sent else data.usernames[other],
+                "receiver_username": data.usernames[other] if sent else hot_username,
+                "transfer_amount": round(rng.uniform(1, 500), 2),
+                "made_at": now - timedelta(seconds=history_rows - i),
+                "status": ValidTransactionStatus.COMPLETED,
+            })
+        await _insert_chunked(db, Transaction, transaction_rows)
+        await db.commit()
+
+    return data
@@ -0,0 +1,128 @@
+"""Compare the ORM and Core Read Paths per Page: python -m benchmarks.serialization --help"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from pydantic import TypeAdapter
+from schemas.base import Base
+from schemas.transactions import Transaction, ValidTransactionStatus
+from utils.serializers import model_columns, rows_response
+from validations.accounts import TransactionResponse
+from datetime import datetime, timedelta, timezone
+from time import perf_counter, process_time
+from typing import List
+from uuid import uuid4
+import tracemalloc
+import json
+
+# Mirrors FastAPI's response_model Step (Dump the Returned Models, Validate them Again,
+# Serialize to JSON-Safe Python, then json.dumps in JSONResponse)
+response_field = TypeAdapter(List[TransactionResponse])
+
+
+def serialize_response(content: list) -> bytes:
+    prepared = [item.model_dump(by_alias=True) for item in content]
+    return json.dumps(response_field.dump_python(response_field.validate_python(prepared),
+                                                 mode="json")).encode()
+
+
+async def orm_path(session, page_size: int) -> bytes:
+    result = await session.execute(select(Transaction).limit(page_size))
+    transactions = result.scalars().all()
+    body = serialize_response([TransactionResponse.model_validate(t) for t in transactions])
+    session.expunge_all()
+    return body
+
+
+async def core_path(session, page_size: int) -> bytes:
+    result = await session.execute(
+        select(*model_columns(Transaction, TransactionResponse)).limit(page_size))
+    return rows_response(result.all(), TransactionResponse).body
+
+
+async def measure(session_factory, path, page_size: int, iterations: int) -> dict:
+    async with session_factory() as session:
+        await path(session, page_size)
+
+        tracemalloc.start()
+        await path(session, page_size)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cpu, wall = process_time(), perf_counter()
+        for _ in range(iterations):
+            await path(session, page_size)
+        cpu, wall = process_time() - cpu, perf_counter() - wall
+
+    return {"cpu_ms_per_page": cpu / iterations * 1000,
+            "wall_ms_per_page": wall / iterations * 1000,
+            "peak_alloc_kib_per_page": peak / 1024}
+
+
+# Serialization Alone, on Rows Fetched once (Excludes the Driver Round Trip)
+async def measure_serialization(session_factory, page_size: int, iterations: int) -> dict:
+    async with session_factory() as session:
+        transactions = (await session.execute(select(Transaction).limit(page_size))).scalars().all()
+        rows = (await session.execute(
+            select(*model_columns(Transaction, TransactionResponse)).limit(page_size))).all()
+
+    def orm_serialize():
+        return serialize_response([TransactionResponse.model_validate(t) for t in transactions])
+
+    def core_serialize():
+        return rows_response(rows, TransactionResponse).body
+
+    timings = {}
+    for name, serialize in (("orm_model_validate", orm_serialize), ("core_type_adapter", core_serialize)):
+        started = process_time()
+        for _ in range(iterations):
+            serialize()
+        timings[name] = (process_time() - started) / iterations * 1000
+    timings["cpu_speedup"] = timings["orm_model_validate"] / timings["core_type_adapter"]
+    return timings
+
+
+async def main(args: argparse.Namespace):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Transaction.__table__])
+        now = datetime.now(timezone.utc)
+        await conn.execute(insert(Transaction), [{
+            "id": uuid4(),
+            "sender_account_id": uuid4(),
+            "receiver_account_id": uuid4(),
+            "sender_username": f"sender_{i:05d}",
+            "receiver_username": f"receiver_{i:05d}",
+            "transfer_amount": 10.0 + i,
+            "made_at": now - timedelta(seconds=i),
+            "status": ValidTransactionStatus.COMPLETED,
+        } for i in range(args.page_size)])
+
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+    orm = await measure(sessions, orm_path, args.page_size, args.iterations)
+    core = await measure(sessions, core_path, args.page_size, args.iterations)
+    serialization = await measure_serialization(sessions, args.page_size, args.iterations)
+    await engine.dispose()
+
+    print(json.dumps({
+        "page_size": args.page_size,
+        "iterations": args.iterations,
+        "orm_model_validate": orm,
+        "core_type_adapter": core,
+        "cpu_speedup": orm["cpu_ms_per_page"] / core["cpu_ms_per_page"],
+        "alloc_ratio": core["peak_alloc_kib_per_page"] / orm["peak_alloc_kib_per_page"],
+        "serialization_cpu_ms_per_page": serialization,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization",
+                                     description="ORM vs Core Read Path Cost per Page")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
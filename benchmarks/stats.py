@@ -0,0 +1,37 @@
+from math import ceil
+
+
+# Util Function to Pick the Nearest-Rank Percentile of Sorted Samples
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[max(0, ceil(pct / 100 * len(samples)) - 1)]
+
+
+# Latency and Status Samples of one Scenario, Grouped by Endpoint Label
+class LatencyRecorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.statuses: dict[str, dict[int, int]] = {}
+
+    def record(self, endpoint: str, elapsed: float, status_code: int):
+        self.samples.setdefault(endpoint, []).append(elapsed)
+        statuses = self.statuses.setdefault(endpoint, {})
+        statuses[status_code] = statuses.get(status_code, 0) + 1
+
+    def summary(self, wall_seconds: float) -> dict:
+        endpoints = {}
+        for endpoint, samples in self.samples.items():
+            ordered = sorted(samples)
+            statuses = self.statuses[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(ordered),
+                "errors": sum(count for code, count in statuses.items() if code >= 400),
+                "statuses": {str(code): count for code, count in sorted(statuses.items())},
+                "throughput_rps": len(ordered) / wall_seconds if wall_seconds else 0.0,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return {"wall_seconds": wall_seconds, "endpoints": endpoints}
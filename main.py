@@ -1,8 +1,17 @@
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
-from utils.db import create_database
+from utils.db import engine
+from utils.migrations import migrate_database
+from utils.hashing import hashing_service
+from utils.stripe_gateway import get_stripe_gateway
+from utils.webhooks import webhook_worker
+from utils.roles import role_registry
+from utils.metrics import MetricsMiddleware, metrics_registry
+from utils.events import event_hub, event_fanout
+from utils.partitions import partition_maintainer
 
 import sys
 from pathlib import Path
@@ -20,14 +29,35 @@ from routers.authentication.auth_routes import router as auth_router
 from routers.product.products_routes import router as product_router
 from routers.subscription.payments_routes import router as payment_router
 from routers.account.accounts_routes import router as accounts_router
+from routers.admin.admin_routes import router as admin_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize or Connect Database
-    await create_database()
+    # Apply Pending Schema Migrations (a Single Version Check when Current)
+    await migrate_database()
+
+    # Load Roles once, Access Checks are Served from Memory
+    await role_registry.load()
+
+    # Drain the Webhook Inbox in the Background
+    webhook_worker.start()
+
+    # Receive Account Events Published by other Workers
+    event_fanout.start()
+
+    # Keep Transaction Partitions Created Ahead and Archive those Past Retention
+    partition_maintainer.start()
 
     yield
 
+    # Open Streams End First, so Shutdown does not Wait on Idle Clients
+    event_hub.close_all()
+    await event_fanout.stop()
+    await partition_maintainer.stop()
+    await webhook_worker.stop()
+    hashing_service.shutdown()
+    get_stripe_gateway().shutdown()
+    await engine.dispose()
     print("Shutting Down")
 
 
@@ -43,6 +73,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record Per-Route Latency, Response Sizes and SQL Work (Outermost, so CORS is Timed Too)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get('/')
 async def greet():
@@ -54,6 +87,12 @@ async def greet():
     }
 
 
+@app.get('/metrics', include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(metrics_registry.render(),
+                             media_type="text/plain; version=0.0.4")
+
+
 app.include_router(auth_router, prefix="/api", tags=["Authentication"])
 app.include_router(roles_router, prefix="/api", tags=["Roles"])
 app.include_router(users_router, prefix="/api", tags=["Users"])
@@ -61,6 +100,7 @@ app.include_router(product_router, prefix="/api", tags=["Products"])
 app.include_router(payment_router, prefix="/api", tags=["Payments"])
 app.include_router(subscription_router, prefix="/api", tags=["Subscriptions"])
 app.include_router(accounts_router, prefix="/api", tags=["Accounts"])
+app.include_router(admin_router, prefix="/api", tags=["Admin"])
 
 
 if __name__ == "__main__":
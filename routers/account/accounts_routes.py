@@ -1,15 +1,23 @@
-from fastapi import APIRouter, status, HTTPException, Query
-from utils.db import db_dependency
-from utils.auth import user_dependency
+from fastapi import APIRouter, status, HTTPException, Query, WebSocket, Depends
+from fastapi.responses import StreamingResponse
+from utils.db import db_dependency, read_db_dependency
+from utils.auth import user_dependency, decode_token
+from utils.transfers import execute_transfer, execute_transfer_batch
+from utils.history import account_history_query
+from utils.pagination import encode_cursor, decode_cursor
+from utils.export import stream_account_history, EXPORT_MEDIA_TYPES
+from utils.serializers import rows_response
+from utils.balance_cache import balance_cache, BalanceEntry
+from utils.events import event_hub, sse_frames, serve_websocket
+from utils.rate_limit import rate_limit
 from validations.accounts import (
-    AccountUpdateRequest, TransactionRequest, AccountResponse, TransactionResponse, AccountBalanceResponse)
+    AccountUpdateRequest, TransactionRequest, AccountResponse, TransactionResponse, AccountBalanceResponse,
+    TransactionBatchRequest, TransactionBatchResponse)
 from schemas.accounts import Account
-from schemas.transactions import Transaction, ValidTransactionStatus
 from sqlalchemy.future import select
-from sqlalchemy import or_
 from uuid import UUID
-from datetime import datetime, timezone
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Literal
 
 
 router = APIRouter(prefix="/accounts")
@@ -23,7 +31,7 @@ async def update_account(account_id: UUID,
                          current_user: user_dependency):
     try:
         stmt = select(Account).where(Account.id == account_id,
-                                     Account.user_id == current_user["id"])
+                                     Account.user_id == current_user.id)
         result = await db.execute(stmt)
         account = result.scalar_one_or_none()
 
@@ -35,9 +43,14 @@ async def update_account(account_id: UUID,
             account.currency = account_update.currency
         if account_update.status is not None:
             account.status = account_update.status
+        account.version = Account.version + 1
 
         await db.commit()
         await db.refresh(account)
+        await balance_cache.put(account.user_id, BalanceEntry(currency=account.currency,
+                                                              balance=account.balance,
+                                                              last_updated=account.last_updated,
+                                                              version=account.version))
 
         return AccountResponse.model_validate(account)
 
@@ -49,87 +62,77 @@ async def update_account(account_id: UUID,
 
 
 # Transfer Money
-@router.post("/transfer", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/transfer", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(rate_limit("transfer"))])
 async def transfer_money(transfer_data: TransactionRequest,
                          db: db_dependency,
                          current_user: user_dependency):
     try:
-        stmt_sender = select(Account).where(Account.user_id == current_user["id"])
-        result_sender = await db.execute(stmt_sender)
-        sender = result_sender.scalar_one_or_none()
-
-        if not sender or sender.balance < transfer_data.transfer_amount:
-            raise HTTPException(
-                400, detail="Insufficient Balance or Invalid Sender Account")
-
-        stmt_receiver = select(Account).where(
-            Account.id == transfer_data.receiver_account_id)
-        result_receiver = await db.execute(stmt_receiver)
-        receiver = result_receiver.scalar_one_or_none()
-        if not receiver:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                                detail="Receiver Account Not Found")
-
-        transaction = Transaction(
-            sender_account_id=sender.id,
-            receiver_account_id=receiver.id,
-            sender_username=current_user["username"],
-            receiver_username=transfer_data.receiver_username,
-            transfer_amount=transfer_data.transfer_amount,
-            made_at=datetime.now(timezone.utc),
-            status=ValidTransactionStatus.COMPLETED
-        )
+        return await execute_transfer(db,
+                                      sender_user_id=current_user.id,
+                                      sender_username=current_user.username,
+                                      transfer_data=transfer_data)
 
-        sender.balance -= transfer_data.transfer_amount
-        receiver.balance += transfer_data.transfer_amount
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Processing Transfer: {str(e)}")
 
-        db.add(transaction)
-        await db.commit()
-        await db.refresh(transaction)
-        return TransactionResponse.model_validate(transaction)
+
+# Settle Many Transfers in One Database Transaction
+@router.post("/transfer/batch", response_model=TransactionBatchResponse, status_code=status.HTTP_200_OK,
+             dependencies=[Depends(rate_limit("transfer_batch"))])
+async def transfer_money_batch(batch_data: TransactionBatchRequest,
+                               db: db_dependency,
+                               current_user: user_dependency):
+    try:
+        return await execute_transfer_batch(db,
+                                            sender_user_id=current_user.id,
+                                            sender_username=current_user.username,
+                                            batch=batch_data)
 
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                            detail=f"Error Processing Transfer: {str(e)}")
+                            detail=f"Error Processing Batch Transfer: {str(e)}")
 
 
 # Get Transaction History
 @router.get("/transactions", response_model=List[TransactionResponse], status_code=status.HTTP_200_OK)
-async def get_transactions(db: db_dependency,
+async def get_transactions(db: read_db_dependency,
                            current_user: user_dependency,
                            limit: int = Query(50, ge=1, le=100),
                            offset: int = Query(0, ge=0),
+                           cursor: Optional[str] = Query(
+                               None, description="Opaque Cursor from the X-Next-Cursor Header, Replaces offset"),
                            date_from: Optional[datetime] = Query(None),
                            date_till: Optional[datetime] = Query(None)):
     try:
-        stmt = select(Account).where(Account.user_id == current_user["id"])
+        stmt = select(Account.id).where(Account.user_id == current_user.id)
         result = await db.execute(stmt)
-        account = result.scalar_one_or_none()
-        if not account:
+        account_id = result.scalar_one_or_none()
+        if not account_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Account Not Found")
 
-        stmt_tx = select(Transaction).where(
-            or_(
-                Transaction.sender_account_id == account.id,
-                Transaction.receiver_account_id == account.id
-            )
-        )
-
-        if date_from:
-            stmt_tx = stmt_tx.where(Transaction.made_at >= date_from)
-        if date_till:
-            stmt_tx = stmt_tx.where(Transaction.made_at <= date_till)
-
-        stmt_tx = stmt_tx.order_by(
-            Transaction.made_at.desc()).offset(offset).limit(limit)
+        stmt_tx = account_history_query(account_id,
+                                        date_from=date_from,
+                                        date_till=date_till,
+                                        cursor=decode_cursor(cursor) if cursor else None,
+                                        limit=limit,
+                                        offset=0 if cursor else offset)
 
         result_tx = await db.execute(stmt_tx)
-        transactions = result_tx.scalars().all()
+        transactions = result_tx.all()
+
+        headers = None
+        if len(transactions) == limit:
+            last = transactions[-1]
+            headers = {"X-Next-Cursor": encode_cursor(last.made_at, last.id)}
 
-        return [TransactionResponse.model_validate(t) for t in transactions]
+        return rows_response(transactions, TransactionResponse, headers=headers)
 
     except HTTPException as e:
         raise e
@@ -138,14 +141,70 @@ async def get_transactions(db: db_dependency,
                             detail=f"Error Fetching Transactions: {str(e)}")
 
 
+# Stream the Full Transaction History of the Current Account
+@router.get("/transactions/export", status_code=status.HTTP_200_OK)
+async def export_transactions(db: read_db_dependency,
+                              current_user: user_dependency,
+                              export_format: Literal["ndjson", "csv"] = Query(
+                                  "ndjson", alias="format"),
+                              date_from: Optional[datetime] = Query(None),
+                              date_till: Optional[datetime] = Query(None)):
+    try:
+        stmt = select(Account.id).where(Account.user_id == current_user.id)
+        result = await db.execute(stmt)
+        account_id = result.scalar_one_or_none()
+        if not account_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Account Not Found")
+
+        return StreamingResponse(
+            stream_account_history(account_id, export_format,
+                                   date_from=date_from, date_till=date_till),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition":
+                     f'attachment; filename="transactions-{account_id}.{export_format}"'}
+        )
+
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Exporting Transactions: {str(e)}")
+
+
+# Push Balance Changes and New Transactions of the Current User as Server-Sent Events
+@router.get("/stream", status_code=status.HTTP_200_OK)
+async def stream_account_events(current_user: user_dependency):
+    return StreamingResponse(sse_frames(current_user.id),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# WebSocket Equivalent of the Event Stream; Browsers Pass the JWT as the token Query Parameter
+@router.websocket("/ws")
+async def websocket_account_events(websocket: WebSocket, token: Optional[str] = Query(None)):
+    authorization = websocket.headers.get("authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+
+    try:
+        principal = decode_token(token or "")
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    await serve_websocket(websocket, event_hub.subscribe(principal.id))
+
+
 # Get Current Account Details
 @router.get("/{account_id}", response_model=AccountResponse, status_code=status.HTTP_200_OK)
 async def get_account_details(account_id: UUID,
-                              db: db_dependency,
+                              db: read_db_dependency,
                               current_user: user_dependency):
     try:
         stmt = select(Account).where(Account.id == account_id,
-                                     Account.user_id == current_user["id"])
+                                     Account.user_id == current_user.id)
         result = await db.execute(stmt)
         account = result.scalar_one_or_none()
 
@@ -164,18 +223,27 @@ async def get_account_details(account_id: UUID,
 
 
 # Get Current Account Balance
+# Served from the Balance Cache, Kept Current Write-Through by the Code that Changes Balances
 @router.get("/balance/me", response_model=AccountBalanceResponse, status_code=status.HTTP_200_OK)
-async def get_balance(db: db_dependency, current_user: user_dependency):
+async def get_balance(db: read_db_dependency, current_user: user_dependency):
     try:
-        stmt = select(Account).where(Account.user_id == current_user["id"])
-        result = await db.execute(stmt)
-        account = result.scalar_one_or_none()
-
-        if not account:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
-                                detail="Account Not Found")
-
-        return AccountBalanceResponse.model_validate(account)
+        entry = await balance_cache.get(current_user.id)
+        if entry is None:
+            stmt = select(Account.currency, Account.balance, Account.last_updated,
+                          Account.version).where(Account.user_id == current_user.id)
+            result = await db.execute(stmt)
+            account = result.first()
+
+            if not account:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                    detail="Account Not Found")
+
+            entry = BalanceEntry(**account._asdict())
+            await balance_cache.put(current_user.id, entry)
+
+        return AccountBalanceResponse(currency=entry.currency,
+                                      balance=entry.balance,
+                                      last_updated=entry.last_updated)
 
     except HTTPException as e:
         raise e
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, status, Depends
+from typing import Annotated
+from utils.auth import require_role, Principal, token_cache
+from utils.hashing import hashing_service
+from utils.webhooks import webhook_worker
+from utils.subscription_status import subscription_status_cache
+from utils.balance_cache import balance_cache
+from utils.events import event_hub, event_fanout
+from utils.rate_limit import rate_limiter
+from utils.partitions import partition_maintainer
+from utils.db import (
+    db_dependency,
+    engine,
+    engine_stats,
+    read_engine,
+    read_engine_stats,
+    read_router,
+    pool_metrics
+)
+
+
+router = APIRouter(prefix="/admin")
+
+
+@router.get("/metrics/hashing", status_code=status.HTTP_200_OK)
+async def get_hashing_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Queue Depth and Latency of the Password Hashing Pool."""
+    return hashing_service.metrics()
+
+
+@router.get("/metrics/auth", status_code=status.HTTP_200_OK)
+async def get_auth_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Hit and Miss Counters of the Verified-Token Cache."""
+    return token_cache.stats()
+
+
+@router.get("/metrics/subscriptions", status_code=status.HTTP_200_OK)
+async def get_subscription_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Hit, Miss and Invalidation Counters of the Subscription Status Cache."""
+    return subscription_status_cache.stats()
+
+
+@router.get("/metrics/balances", status_code=status.HTTP_200_OK)
+async def get_balance_cache_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Hit Rate and Write Counters of the Balance Cache."""
+    return balance_cache.stats()
+
+
+@router.get("/metrics/streams", status_code=status.HTTP_200_OK)
+async def get_stream_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Open Account Event Streams, Deliveries and Slow-Consumer Evictions."""
+    metrics = event_hub.stats()
+    metrics["fanout"] = event_fanout.stats()
+    return metrics
+
+
+@router.get("/metrics/rate-limits", status_code=status.HTTP_200_OK)
+async def get_rate_limit_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Configured Policies and Allowed/Rejected Counts per Limited Route."""
+    return rate_limiter.stats()
+
+
+@router.get("/metrics/webhooks", status_code=status.HTTP_200_OK)
+async def get_webhook_metrics(db: db_dependency,
+                              current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Backlog and Lag of the Webhook Inbox."""
+    return await webhook_worker.metrics(db)
+
+
+@router.get("/metrics/partitions", status_code=status.HTTP_200_OK)
+async def get_partition_metrics(db: db_dependency,
+                                current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Online and Archived Transaction Partitions and Maintenance Runs."""
+    return await partition_maintainer.metrics(db)
+
+
+@router.get("/metrics/db", status_code=status.HTTP_200_OK)
+async def get_database_metrics(current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Connection Pool Occupancy, Wait Times, Slow Query Counts and Read Routing."""
+    metrics = pool_metrics(engine, engine_stats)
+    metrics["read_routing"] = read_router.metrics()
+    if read_router.enabled:
+        metrics["replica"] = pool_metrics(read_engine, read_engine_stats)
+    return metrics
@@ -1,5 +1,8 @@
-from fastapi import APIRouter, status, HTTPException, Query
-from utils.db import db_dependency
+from fastapi import APIRouter, status, HTTPException, Query, Depends
+from utils.db import db_dependency, read_db_dependency
+from utils.hashing import hash_password
+from utils.roles import role_registry
+from utils.rate_limit import rate_limit
 from validations.users import (
     Token,
     UserPublicResponse,
@@ -7,32 +10,29 @@ from validations.users import (
     UserRequest
 )
 from utils.auth import (
-    bcrypt_context,
     auth_form,
     authenticate_user,
     create_access_token,
     user_dependency,
 )
 from datetime import timedelta
-from schemas.roles import Role, ValidRoles
 from schemas.users import User
-from sqlalchemy.future import select
 
 
 router = APIRouter(prefix="/auth")
 
 
 @router.get("/me", response_model=UserPublicResponse, status_code=status.HTTP_200_OK)
-async def get_user(db: db_dependency, user: user_dependency):
+async def get_user(db: read_db_dependency, user: user_dependency):
     try:
         if user is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Could Not Validate User")
 
         return UserPublicResponse(
-            id=user["id"],
-            username=user["username"],
-            role=user["role"]
+            id=user.id,
+            username=user.username,
+            role=user.role
         )
 
     except HTTPException as e:
@@ -43,7 +43,8 @@ async def get_user(db: db_dependency, user: user_dependency):
                             detail=f"Error Fetching User: {str(e)}")
 
 
-@router.post("/login", response_model=Token, status_code=status.HTTP_202_ACCEPTED)
+@router.post("/login", response_model=Token, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(rate_limit("login"))])
 async def user_login(form_data: auth_form, db: db_dependency, mode: str = Query(...)):
     try:
         user = await authenticate_user(form_data.username, form_data.password, db)
@@ -51,13 +52,14 @@ async def user_login(form_data: auth_form, db: db_dependency, mode: str = Query(
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Could Not Validate User")
 
-        if user.role.position != mode:
+        position = role_registry.position_of(user.role_id)
+        if position is None or position != mode:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Invalid Credentials or Mode")
 
         token = create_access_token(username=user.username,
                                     user_id=user.id,
-                                    role=user.role.position,
+                                    role=position,
                                     expires_in=timedelta(minutes=30))
         return Token(access_token=token, token_type="bearer")
 
@@ -69,19 +71,21 @@ async def user_login(form_data: auth_form, db: db_dependency, mode: str = Query(
                             detail=f"Login Failed: {str(e)}")
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(rate_limit("register"))])
 async def create_user(user_data: UserRequest, db: db_dependency):
     """Add a New User with Access Level 1."""
     try:
-        stmt = select(Role).where(Role.level == 1)
-        result = await db.execute(stmt)
-        role = result.scalar_one_or_none()
+        role_id = role_registry.role_id_for_level(1)
+        if role_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Default User Role Not Found")
 
         new_user = User(
             username=user_data.username,
             email=user_data.email,
-            password=bcrypt_context.hash(user_data.password),
-            role_id=role.id)
+            password=await hash_password(user_data.password),
+            role_id=role_id)
 
         db.add(new_user)
         await db.commit()
@@ -5,9 +5,10 @@ from validations.roles import (
     RoleResponse,
     RoleUpdateRequest,
     RoleDeleteRequest)
-from utils.db import db_dependency
+from utils.db import db_dependency, read_db_dependency
 from schemas.roles import Role
-from utils.auth import require_role
+from utils.auth import require_role, Principal
+from utils.roles import role_registry
 from sqlalchemy.future import select
 
 
@@ -23,6 +24,7 @@ async def create_role(roles: List[RoleRequest],
         db.add_all(new_roles)
 
         await db.commit()
+        await role_registry.load(db)
         return [RoleResponse.model_validate(new_role) for new_role in new_roles]
     
     except HTTPException as e:
@@ -35,7 +37,7 @@ async def create_role(roles: List[RoleRequest],
 
 
 @router.get("/all", response_model=List[RoleResponse], status_code=status.HTTP_200_OK)
-async def get_roles(db: db_dependency):
+async def get_roles(db: read_db_dependency):
     """Get Roles Details along with their Associated IDs."""
     try:
         stmt = select(Role)
@@ -55,7 +57,7 @@ async def get_roles(db: db_dependency):
 @router.put("/mod/", response_model=List[RoleResponse], status_code=status.HTTP_202_ACCEPTED)
 async def update_role(updated_data: List[RoleUpdateRequest], 
                       db: db_dependency,
-                      current_user: Annotated[dict, Depends(require_role(2))]):
+                      current_user: Annotated[Principal, Depends(require_role(2))]):
     """Update Existing Roles."""
     try:
         roles_to_update = {role.id: role for role in updated_data}
@@ -76,6 +78,7 @@ async def update_role(updated_data: List[RoleUpdateRequest],
                 role.position = updated_role.position
 
         await db.commit()
+        await role_registry.load(db)
         response = []
         for role in roles:
             await db.refresh(role)
@@ -95,7 +98,7 @@ async def update_role(updated_data: List[RoleUpdateRequest],
 @router.delete("/del", status_code=status.HTTP_202_ACCEPTED)
 async def delete_role(roles_for_deletion: List[RoleDeleteRequest],
                       db: db_dependency,
-                      current_user: Annotated[dict, Depends(require_role(2))]):
+                      current_user: Annotated[Principal, Depends(require_role(2))]):
     """Delete Roles, Can be Done only by Admin Account."""
     try:
         role_ids_to_delete = [role.id for role in roles_for_deletion]
@@ -108,9 +111,13 @@ async def delete_role(roles_for_deletion: List[RoleDeleteRequest],
                                 detail="Roles Not Found")
             
         for role in roles_to_delete:
-            db.delete(role)
+            await db.delete(role)
             
         await db.commit()
+        await role_registry.load(db)
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
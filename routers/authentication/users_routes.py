@@ -1,12 +1,17 @@
-from fastapi import APIRouter, status, HTTPException, Depends, Query
-from utils.db import db_dependency
+from fastapi import APIRouter, status, HTTPException, Depends, Query, Request
+from utils.db import db_dependency, read_db_dependency
+from utils.hashing import hash_password
+from utils.roles import role_registry
+from utils.provisioning import provision_users
+from utils.serializers import model_columns, rows_response
 from validations.users import (
     UserRequest,
     UserRead,
-    UserPublicUpdateRequest
+    UserPublicUpdateRequest,
+    BulkUserResponse
 )
 from utils.auth import (
-    bcrypt_context,
+    Principal,
     require_role,
     user_dependency
 )
@@ -23,12 +28,13 @@ async def create_internal_user(user_data: UserRequest,
                                db: db_dependency):
     """Add a New User with Certain Access Levels (Internal Use Only)."""
     try:
-        if not user_data.role_id in [1, 2, 3]:
-            raise
+        if not role_registry.has_role_id(user_data.role_id):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail="Invalid Role ID")
 
         new_user = User(
             username=user_data.username,
-            password=bcrypt_context.hash(user_data.password),
+            password=await hash_password(user_data.password),
             email=user_data.email,
             role_id=user_data.role_id
         )
@@ -45,9 +51,28 @@ async def create_internal_user(user_data: UserRequest,
                             detail=f"Error Creating Internal User: {str(e)}")
 
 
+@router.post("/admin/bulk", response_model=BulkUserResponse, status_code=status.HTTP_200_OK,
+             openapi_extra={"requestBody": {"required": True, "content": {
+                 "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                 "application/x-ndjson": {"schema": {"type": "string"}}}}})
+async def bulk_create_users(request: Request,
+                            db: db_dependency,
+                            current_user: Annotated[Principal, Depends(require_role(2))]):
+    """Provision Many Users from a JSON Array or an NDJSON Stream (Admin Only)."""
+    try:
+        return await provision_users(db, request)
+
+    except HTTPException as e:
+        raise e
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Provisioning Users: {str(e)}")
+
+
 @router.get("/get/{identifier}", response_model=UserRead, status_code=status.HTTP_200_OK)
 async def get_user_from_identifier(identifier: str | UUID,
-                                   db: db_dependency,
+                                   db: read_db_dependency,
                                    current_user: user_dependency,
                                    from_username: bool = False,
                                    from_email: bool = False):
@@ -82,15 +107,14 @@ async def get_user_from_identifier(identifier: str | UUID,
 
 
 @router.get("/all", response_model=List[UserRead], status_code=status.HTTP_200_OK)
-async def get_all_users(db: db_dependency,
-                        current_user: Annotated[dict, Depends(require_role(2))],
+async def get_all_users(db: read_db_dependency,
+                        current_user: Annotated[Principal, Depends(require_role(2))],
                         limit: int = Query(50, ge=1, le=100),
                         offset: int = Query(0, ge=0),):
     try:
-        stmt = select(User).offset(offset).limit(limit)
+        stmt = select(*model_columns(User, UserRead)).offset(offset).limit(limit)
         result = await db.execute(stmt)
-        users = result.scalars().all()
-        return [UserRead.model_validate(user) for user in users]
+        return rows_response(result.all(), UserRead)
 
     except HTTPException as e:
         raise e
@@ -113,7 +137,7 @@ async def modify_user(updated_user: UserPublicUpdateRequest,
             )
 
         stmt = select(User).where(
-            User.id == current_user["id"], User.username == current_user["username"])
+            User.id == current_user.id, User.username == current_user.username)
         result = await db.execute(stmt)
         user = result.scalar_one_or_none()
 
@@ -126,7 +150,7 @@ async def modify_user(updated_user: UserPublicUpdateRequest,
         if updated_user.new_username is not None:
             user.username = updated_user.new_username
         if updated_user.new_password is not None:
-            user.password = bcrypt_context.hash(updated_user.new_password)
+            user.password = await hash_password(updated_user.new_password)
         if updated_user.new_email is not None:
             user.email = updated_user.new_email
 
@@ -1,42 +1,28 @@
-from fastapi import APIRouter, status, HTTPException
+from fastapi import APIRouter, status, HTTPException, Request, Response
 from typing import List
-from validations.payments import StripeProduct, StripePrice
-import stripe
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
-
+from validations.payments import StripeProduct
+from utils.catalog import product_catalog, CATALOG_TTL_SECONDS
+from utils.stripe_gateway import StripeUnavailableError
 
 router = APIRouter(prefix="/plan")
 
 
 @router.get("/products", response_model=List[StripeProduct], status_code=status.HTTP_200_OK)
-async def get_stripe_products():
+async def get_stripe_products(request: Request):
     """End-Point to Fetch Pricing Plans"""
     try:
-        products = stripe.Product.list(active=True)
-        product_list: List[StripeProduct] = []
+        body, etag = await product_catalog.get()
+        headers = {"ETag": etag,
+                   "Cache-Control": f"public, max-age={int(CATALOG_TTL_SECONDS)}"}
 
-        for product in products.auto_paging_iter():
-            prices = stripe.Price.list(product=product.id, active=True)
-            price_data = []
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-            for price in prices.auto_paging_iter():
-                price_model = StripePrice(id=price.id,
-                                          unit_amount=price.unit_amount,
-                                          currency=price.currency,
-                                          recurring=price.recurring)
-                price_data.append(price_model)
+        return Response(content=body, media_type="application/json", headers=headers)
 
-            product_model = StripeProduct(id=product.id,
-                                          name=product.name,
-                                          description=product.description,
-                                          prices=price_data)
-            product_list.append(product_model)
-        return product_list
+    except StripeUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Failed to Fetch Products: {str(e)}")
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
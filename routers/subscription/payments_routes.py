@@ -1,19 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, Request
+from fastapi import APIRouter, HTTPException, status, Request, Depends
 from utils.auth import user_dependency
-from utils.db import db_dependency
-from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from utils.db import db_dependency, insert_or_ignore
+from utils.webhooks import webhook_worker, INBOX_EVENT_TYPES
+from utils.catalog import product_catalog
+from utils.stripe_gateway import get_stripe_gateway, StripeUnavailableError
+from utils.subscription_status import has_active_subscription
+from utils.rate_limit import rate_limit
 from schemas.users import User
 from validations.payments import CheckoutRequest, CheckoutSessionResponse, WebhookResponse
 import stripe
 from dotenv import load_dotenv
 import os
-from datetime import datetime
-from schemas.accounts import Account, ValidAccountStatus
+from schemas.webhook_events import WebhookEvent
+import json
 from sqlalchemy.future import select
 
 load_dotenv()
-
-stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
 STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 APPLICATION_URL = os.getenv("APPLICATION_URL")
 
@@ -22,7 +24,8 @@ router = APIRouter(prefix="/payment")
 
 
 # ✅ Create Stripe Checkout Session (accepts price_id dynamically)
-@router.post("/create-checkout-session", status_code=status.HTTP_200_OK, response_model=CheckoutSessionResponse)
+@router.post("/create-checkout-session", status_code=status.HTTP_200_OK, response_model=CheckoutSessionResponse,
+             dependencies=[Depends(rate_limit("checkout"))])
 async def create_checkout_session(data: CheckoutRequest,
                                   current_user: user_dependency,
                                   db: db_dependency):
@@ -32,7 +35,7 @@ async def create_checkout_session(data: CheckoutRequest,
             detail="Unauthorized Access"
         )
 
-    stmt = select(User).where(User.id == current_user["id"])
+    stmt = select(User).where(User.id == current_user.id)
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
 
@@ -43,17 +46,11 @@ async def create_checkout_session(data: CheckoutRequest,
         )
 
     try:
-        stmt = select(Subscription).where(Subscription.user_id ==
-                                          user.id).order_by(Subscription.ended_at.desc())
-        results = await db.execute(stmt)
-        previous_subscriptions = results.scalars().all()
-
-        for prev_subs in previous_subscriptions:
-            if prev_subs.status == ValidSubscriptionStatus.ACTIVE:
-                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                                    detail="User Already has an Active Subscription")
+        if await has_active_subscription(db, user.id):
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail="User Already has an Active Subscription")
 
-        checkout_session = stripe.checkout.Session.create(
+        checkout_session = await get_stripe_gateway().create_checkout_session(
             customer_email=user.email,
             line_items=[{
                 "price": data.price_id,
@@ -66,6 +63,13 @@ async def create_checkout_session(data: CheckoutRequest,
         )
         return CheckoutSessionResponse(url=checkout_session.url)
 
+    except HTTPException as e:
+        raise e
+
+    except StripeUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Stripe Error: {str(e)}")
+
     except stripe.error.StripeError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=f"Stripe Error: {str(e)}")
@@ -80,7 +84,6 @@ async def create_checkout_session(data: CheckoutRequest,
 # ✅ Stripe Webhook Endpoint
 @router.post("/webhook", status_code=status.HTTP_200_OK, response_model=WebhookResponse)
 async def stripe_webhook(request: Request, db: db_dependency):
-    print("webhok trigered")
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
 
@@ -94,57 +97,22 @@ async def stripe_webhook(request: Request, db: db_dependency):
             detail="Invalid Webhook Signature"
         )
 
-    if event["type"] == "invoice.paid":
-        invoice = event["data"]["object"]
-        customer_email = invoice.get("customer_email")
-
-        if customer_email:
-            stmt = select(User).where(User.email == customer_email)
-            result = await db.execute(stmt)
-            user = result.scalar_one_or_none()
-
-            if user:
-                subscription = Subscription(
-                    user_id=user.id,
-                    source_id=invoice.get("subscription"),
-                    currency=invoice.get("currency"),
-                    amount=invoice.get("amount_paid") / 100,
-                    started_at=datetime.fromtimestamp(
-                        invoice["lines"]["data"][0]["period"]["start"]),
-                    ended_at=datetime.fromtimestamp(
-                        invoice["lines"]["data"][0]["period"]["end"]),
-                    status=ValidSubscriptionStatus.ACTIVE)
-
-                db.add(subscription)
-
-            stmt = select(Account).where(Account.user_id == user.id)
-            result = await db.execute(stmt)
-            account = result.scalar_one_or_none()
-            if not account:
-                account = Account(user_id=user.id,
-                                  currency=subscription.currency,
-                                  balance=500 if invoice.get(
-                                      "amount_paid") <= 5 else 2000,
-                                  status=ValidAccountStatus.ACTIVE)
-                db.add(account)
-
-            else:
-                account.balance += 500 if invoice.get(
-                    "amount_paid") <= 5 else 2000
-
+    # Catalog Changes Drop the Cached Pricing Plans
+    if event["type"].startswith(("product.", "price.")):
+        product_catalog.invalidate()
+
+    # Account Changing Events are Queued once per Stripe Event ID and Applied in the Background
+    elif event["type"] in INBOX_EVENT_TYPES:
+        try:
+            stmt = insert_or_ignore(WebhookEvent).values(id=event["id"],
+                                                         type=event["type"],
+                                                         payload=json.loads(payload))
+            await db.execute(stmt)
             await db.commit()
+            webhook_worker.notify()
 
-    elif event["type"] == "customer.subscription.deleted":
-        subscription_obj = event["data"]["object"]
-        stripe_sub_id = subscription_obj.get("id")
-
-        stmt = select(Subscription).where(
-            Subscription.source_id == stripe_sub_id)
-        result = await db.execute(stmt)
-        subscription = result.scalar_one_or_none()
-
-        if subscription:
-            subscription.status = ValidSubscriptionStatus.CANCELED
-            await db.commit()
+        except Exception as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                detail=f"Error Queueing Webhook Event: {str(e)}")
 
-    return WebhookResponse(status="success")
+    return WebhookResponse(status="success", event_type=event["type"])
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, status, HTTPException, Query, Depends
-from utils.db import db_dependency
+from fastapi import APIRouter, status, HTTPException, Query, Depends, Response
+from utils.db import db_dependency, read_db_dependency
 from utils.auth import user_dependency
 from schemas.subscriptions import Subscription, ValidSubscriptionStatus
 from validations.accounts import SubscriptionResponse, UpdateSubscriptionRequest
+from utils.serializers import model_columns, rows_response, JSONBytesResponse
+from utils.subscription_status import (
+    active_subscription, subscription_status_cache, wait_for_active_subscription,
+    SUBSCRIPTION_WAIT_MAX_SECONDS)
+from utils.pagination import encode_cursor, decode_cursor, keyset_after, count_rows, SEARCH_COUNT_CAP
 from sqlalchemy.future import select
-from utils.auth import user_dependency, require_role
+from sqlalchemy.exc import IntegrityError
+from utils.auth import user_dependency, require_role, Principal
 from uuid import UUID
 from datetime import datetime, timezone
 from typing import List, Optional, Annotated
@@ -14,13 +20,12 @@ router = APIRouter(prefix="/subscriptions")
 
 
 @router.get("/", response_model=List[SubscriptionResponse], status_code=status.HTTP_200_OK)
-async def get_all_my_subscriptions(db: db_dependency, current_user: user_dependency):
+async def get_all_my_subscriptions(db: read_db_dependency, current_user: user_dependency):
     try:
-        stmt = select(Subscription).where(
-            Subscription.user_id == current_user["id"])
+        stmt = select(*model_columns(Subscription, SubscriptionResponse)).where(
+            Subscription.user_id == current_user.id)
         result = await db.execute(stmt)
-        subscriptions = result.scalars().all()
-        return [SubscriptionResponse.model_validate(sub) for sub in subscriptions]
+        return rows_response(result.all(), SubscriptionResponse)
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -31,7 +36,7 @@ async def get_all_my_subscriptions(db: db_dependency, current_user: user_depende
 async def update_subscription(subscription_id: UUID,
                               updated_data: UpdateSubscriptionRequest,
                               db: db_dependency,
-                              current_user: Annotated[dict, Depends(require_role(2))]):
+                              current_user: Annotated[Principal, Depends(require_role(2))]):
     try:
         stmt = select(Subscription).where(Subscription.id == subscription_id)
         result = await db.execute(stmt)
@@ -52,45 +57,77 @@ async def update_subscription(subscription_id: UUID,
             subscription.ended_at = datetime.now(timezone.utc)
 
         await db.commit()
+        subscription_status_cache.invalidate([subscription.user_id])
         await db.refresh(subscription)
         return SubscriptionResponse.model_validate(subscription)
 
     except HTTPException as e:
         raise e
 
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT,
+                            detail="User Already has an Active Subscription")
+
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                             detail=f"Failed to Update Subscription: {str(e)}")
 
 
 @router.get("/filter", response_model=List[SubscriptionResponse], status_code=status.HTTP_200_OK)
-async def filter_subscriptions(db: db_dependency,
-                               current_user: Annotated[dict, Depends(require_role(2))],
+async def filter_subscriptions(db: read_db_dependency,
+                               current_user: Annotated[Principal, Depends(require_role(2))],
                                limit: int = Query(50, ge=1, le=100),
-                               offset: int = Query(0, ge=0),
+                               cursor: Optional[str] = Query(
+                                   None, description="Opaque Cursor from the X-Next-Cursor Header"),
                                status: Optional[ValidSubscriptionStatus] = Query(
                                    None),
+                               user_id: Optional[UUID] = Query(None),
+                               currency: Optional[str] = Query(None, min_length=3, max_length=3),
                                start_date: Optional[datetime] = Query(None),
-                               end_date: Optional[datetime] = Query(None)):
+                               end_date: Optional[datetime] = Query(None),
+                               include_total: bool = Query(
+                                   False, description="Return the Matching Row Count in X-Total-Count")):
     try:
-        stmt = select(Subscription)
+        filters = []
+        if status:
+            filters.append(Subscription.status == status)
 
-        if status or start_date or end_date:
-            filters = []
-            if status:
-                filters.append(Subscription.status == status)
+        if user_id:
+            filters.append(Subscription.user_id == user_id)
 
-            if start_date:
-                filters.append(Subscription.started_at >= start_date)
+        if currency:
+            filters.append(Subscription.currency == currency.lower())
 
-            if end_date:
-                filters.append(Subscription.ended_at <= end_date)
+        if start_date:
+            filters.append(Subscription.started_at >= start_date)
 
-            stmt = stmt.where(*filters).offset(offset).limit(limit)
+        if end_date:
+            filters.append(Subscription.ended_at <= end_date)
 
-        result = await db.execute(stmt)
-        subscriptions = result.scalars().all()
-        return [SubscriptionResponse.model_validate(sub) for sub in subscriptions]
+        # Newest First, Keyed on (started_at, id) so every Page is an Index Range Scan
+        stmt = select(*model_columns(Subscription, SubscriptionResponse)).where(*filters)
+        page = stmt.order_by(Subscription.started_at.desc().nulls_last(), Subscription.id.desc())
+        if cursor:
+            page = page.where(keyset_after(Subscription.started_at, Subscription.id,
+                                           decode_cursor(cursor), nulls_last=True))
+
+        result = await db.execute(page.limit(limit))
+        subscriptions = result.all()
+
+        headers = {}
+        if len(subscriptions) == limit:
+            last = subscriptions[-1]
+            headers["X-Next-Cursor"] = encode_cursor(last.started_at, last.id)
+
+        if include_total:
+            total, exact = await count_rows(db, stmt, SEARCH_COUNT_CAP)
+            headers["X-Total-Count"] = str(total)
+            headers["X-Total-Count-Exact"] = str(exact).lower()
+
+        return rows_response(subscriptions, SubscriptionResponse, headers=headers)
+
+    except HTTPException as e:
+        raise e
 
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -99,18 +136,14 @@ async def filter_subscriptions(db: db_dependency,
 
 # Get Current Account Active Subscription Status
 @router.get("/me", status_code=status.HTTP_200_OK)
-async def get_active_subscription(db: db_dependency, current_user: user_dependency):
+async def get_active_subscription(db: read_db_dependency, current_user: user_dependency):
     try:
-        stmt = select(Subscription).where(Subscription.user_id == current_user["id"],
-                                          Subscription.status == ValidSubscriptionStatus.ACTIVE)
-        result = await db.execute(stmt)
-        subscription = result.scalar_one_or_none()
-
+        subscription = await active_subscription(db, current_user.id)
         if not subscription:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                                 detail="Subscription Not Found")
 
-        return SubscriptionResponse.model_validate(subscription)
+        return subscription
 
     except HTTPException as e:
         raise e
@@ -118,3 +151,21 @@ async def get_active_subscription(db: db_dependency, current_user: user_dependen
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                             detail=f"Error Fetching Subscription Details: {str(e)}")
+
+
+# Wait for the Checkout to Complete (Long Poll), instead of Polling /me
+# Answers as soon as the Webhook Activates the Subscription, or 204 once the Timeout Passes.
+@router.get("/me/wait", response_model=SubscriptionResponse, status_code=status.HTTP_200_OK,
+            responses={204: {"description": "No Active Subscription Yet, Retry"}})
+async def wait_for_subscription(current_user: user_dependency,
+                                timeout: float = Query(25, gt=0, le=SUBSCRIPTION_WAIT_MAX_SECONDS)):
+    try:
+        subscription = await wait_for_active_subscription(current_user.id, timeout)
+        if subscription is None:
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+        return JSONBytesResponse(subscription)
+
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail=f"Error Waiting for Subscription: {str(e)}")
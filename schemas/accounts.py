@@ -1,4 +1,4 @@
-from sqlalchemy import String, Float, DateTime, ForeignKey, UUID, Enum as SQLAEnum, func
+from sqlalchemy import String, Float, Integer, DateTime, ForeignKey, UUID, Enum as SQLAEnum, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .base import Base
 from uuid import uuid4
@@ -26,6 +26,7 @@ class Account(Base):
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
         comment="Foreign key to the Users Table"
     )
     
@@ -58,6 +59,14 @@ class Account(Base):
         comment="Current Status of the Account"
     )
 
+    version: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Incremented on every Balance or Currency Change (Orders Cached Copies)"
+    )
+
     ################
     # Relationships
     ################
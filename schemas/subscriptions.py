@@ -1,5 +1,7 @@
-from sqlalchemy import String, Float, DateTime, ForeignKey, UUID, Enum as SQLEnum
+from sqlalchemy import String, Float, DateTime, ForeignKey, UUID, Index, text, Enum as SQLEnum
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.schema import CreateIndex
 from .base import Base
 from uuid import uuid4
 from .users import User
@@ -13,9 +15,21 @@ class ValidSubscriptionStatus(str, Enum):
     ENDED = "Ended"
 
 
+# Enum Columns Store Member Names, so the Partial Index Predicate Matches on the Name
+ACTIVE_PREDICATE = text(f"status = '{ValidSubscriptionStatus.ACTIVE.name}'")
+
+
 class Subscription(Base):
     __tablename__ = "subscriptions"
 
+    # Per-User Lookups Filter on Status (e.g. the Active Subscription Check)
+    __table_args__ = (
+        Index("ix_subscriptions_user_id_status", "user_id", "status"),
+        # At Most one Active Subscription per User
+        Index("uq_subscriptions_user_id_active", "user_id", unique=True,
+              postgresql_where=ACTIVE_PREDICATE, sqlite_where=ACTIVE_PREDICATE),
+    )
+
     id: Mapped[UUID] = mapped_column(
         UUID,
         primary_key=True,
@@ -32,6 +46,7 @@ class Subscription(Base):
     source_id: Mapped[str | None] = mapped_column(
         String(255),
         nullable=True,
+        index=True,
         comment="Stripe Source ID (if any)"
     )
 
@@ -77,3 +92,20 @@ class Subscription(Base):
     ###############
 
     user: Mapped["User"] = relationship()
+
+
+# Admin Search Pages by (started_at DESC NULLS LAST, id DESC), Optionally Narrowed by one
+# Equality Filter, so each Filter Leads its own Index Ending in the Sort Key.
+# ix_subscriptions_user_id_started_at also Serves Plain user_id Lookups and the Foreign Key.
+SEARCH_ORDER = (Subscription.started_at.desc().nulls_last(), Subscription.id.desc())
+
+Index("ix_subscriptions_started_at", *SEARCH_ORDER)
+Index("ix_subscriptions_status_started_at", Subscription.status, *SEARCH_ORDER)
+Index("ix_subscriptions_user_id_started_at", Subscription.user_id, *SEARCH_ORDER)
+Index("ix_subscriptions_currency_started_at", Subscription.currency, *SEARCH_ORDER)
+
+
+# SQLite Rejects NULLS LAST in an Index, but Already Sorts NULLs Last when Descending
+@compiles(CreateIndex, "sqlite")
+def _create_index_sqlite(element, compiler, **kwargs):
+    return compiler.visit_create_index(element, **kwargs).replace(" DESC NULLS LAST", " DESC")
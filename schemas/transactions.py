@@ -1,4 +1,4 @@
-from sqlalchemy import Float, DateTime, ForeignKey, UUID, String, Enum as SQLAEnum, func
+from sqlalchemy import Float, DateTime, ForeignKey, UUID, String, Index, Enum as SQLAEnum, func
 from sqlalchemy.orm import Mapped, mapped_column
 from .base import Base
 from uuid import uuid4
@@ -15,6 +15,17 @@ class ValidTransactionStatus(str, Enum):
 class Transaction(Base):
     __tablename__ = "transactions"
 
+    # History is Read per Account, Newest First, so each Side Gets its own Range Index
+    # On Postgres the Table is Range Partitioned by Month on made_at (see utils/partitions.py),
+    # which is why made_at is Part of the Primary Key.
+    __table_args__ = (
+        Index("ix_transactions_sender_made_at",
+              "sender_account_id", "made_at", "id"),
+        Index("ix_transactions_receiver_made_at",
+              "receiver_account_id", "made_at", "id"),
+        {"postgresql_partition_by": "RANGE (made_at)"},
+    )
+
     id: Mapped[UUID] = mapped_column(
         UUID,
         primary_key=True,
@@ -56,6 +67,7 @@ class Transaction(Base):
 
     made_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
+        primary_key=True,
         server_default=func.now(),
         nullable=False,
         comment="Time when the Transaction was made"
@@ -64,6 +64,7 @@ class User(Base):
         comment="Foreign Key to the Roles table indicating User Role."
     )
 
+    # Role Names are Resolved from the In-Memory Role Registry, not Joined per Load
     role: Mapped["Role"] = relationship(
-        lazy="joined"
+        lazy="raise"
     )
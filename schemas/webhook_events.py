@@ -0,0 +1,60 @@
+from sqlalchemy import String, DateTime, Integer, Text, JSON, Index, text
+from sqlalchemy.orm import Mapped, mapped_column
+from datetime import datetime, timezone
+from .base import Base
+
+
+# Inbox of Received Stripe Events, Drained by the Background Webhook Worker
+class WebhookEvent(Base):
+    __tablename__ = "webhook_events"
+
+    # The Worker only Scans Events that are Still Pending
+    __table_args__ = (
+        Index("ix_webhook_events_pending", "received_at",
+              postgresql_where=text("processed_at IS NULL"),
+              sqlite_where=text("processed_at IS NULL")),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(255),
+        primary_key=True,
+        comment="Stripe Event ID, Used to Deduplicate Deliveries"
+    )
+
+    type: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Stripe Event Type"
+    )
+
+    payload: Mapped[dict] = mapped_column(
+        JSON,
+        nullable=False,
+        comment="Raw Stripe Event Body"
+    )
+
+    received_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        comment="Time the Event was Received"
+    )
+
+    processed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Time the Event was Applied (Null while Pending)"
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        comment="Number of Failed Processing Attempts"
+    )
+
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Error from the Last Failed Attempt"
+    )
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings Read at Import Time; Tests that Touch the Database Get a Throwaway SQLite File
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("HASHING_ALGORITHM", "HS256")
+os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "whsec_test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Util Function to Run a Scenario in a Fresh Event Loop
+# Pooled Connections Belong to the Loop that Opened them, so the Pool is Emptied before it Closes.
+def run(coro):
+    from utils.db import engine
+
+    async def scenario():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(scenario())
+
+
+@pytest.fixture(scope="session")
+def migrated():
+    from utils.migrations import migrate_database
+    run(migrate_database())
+
+
+# Migrated Database, Emptied before each Test
+@pytest.fixture
+def database(migrated):
+    from schemas.base import Base
+    from utils.db import engine
+
+    async def empty():
+        async with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                if table.name != "schema_version":
+                    await conn.execute(table.delete())
+
+    run(empty())
+    return run
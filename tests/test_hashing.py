@@ -0,0 +1,53 @@
+from utils.hashing import HashingService
+import asyncio
+import os
+import pytest
+import threading
+
+
+def test_thread_pool_queue_depth_counts_real_threads():
+    service = HashingService(workers=0, queue_limit=100)
+    started, release = threading.Semaphore(0), threading.Event()
+
+    def block():
+        started.release()
+        release.wait()
+
+    async def scenario():
+        calls = [asyncio.ensure_future(service.run(block)) for _ in range(service.pool_size + 3)]
+        for _ in range(service.pool_size):
+            await asyncio.to_thread(started.acquire)
+        metrics = service.metrics()
+        release.set()
+        await asyncio.gather(*calls)
+        return metrics
+
+    try:
+        metrics = asyncio.run(scenario())
+    finally:
+        release.set()
+        service.shutdown()
+
+    assert service.pool_size == min(32, (os.cpu_count() or 1) + 4)
+    assert metrics["in_flight"] == service.pool_size + 3
+    assert metrics["queue_depth"] == 3
+
+
+def test_failed_calls_are_not_counted_as_completed():
+    service = HashingService(workers=0, queue_limit=10)
+
+    def fail():
+        raise ValueError("Malformed Hash")
+
+    async def scenario():
+        await service.run(len, "password")
+        with pytest.raises(ValueError):
+            await service.run(fail)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        service.shutdown()
+
+    metrics = service.metrics()
+    assert (metrics["completed"], metrics["failed"], metrics["in_flight"]) == (1, 1, 0)
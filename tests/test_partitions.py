@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from sqlalchemy import select, delete, func
+from schemas.accounts import Account
+from schemas.transactions import Transaction, ValidTransactionStatus
+from schemas.users import User
+from utils.db import AsyncSessionLocal, engine
+from utils.partitions import archive_table, maintain_partitions
+
+NOW = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+async def seed() -> tuple:
+    async with AsyncSessionLocal() as db:
+        users = [User(username=name, email=f"{name}@example.com", password="x") for name in ("alice", "bob")]
+        db.add_all(users)
+        await db.flush()
+        alice, bob = Account(user_id=users[0].id, balance=100.0), Account(user_id=users[1].id, balance=5.0)
+        db.add_all([alice, bob])
+        await db.flush()
+        for made_at in (datetime(2020, 3, 5, tzinfo=timezone.utc), NOW):
+            db.add(Transaction(sender_account_id=alice.id, receiver_account_id=bob.id,
+                               sender_username="alice", receiver_username="bob", transfer_amount=1.0,
+                               status=ValidTransactionStatus.COMPLETED, made_at=made_at))
+        await db.commit()
+        return alice.id, bob.id
+
+
+async def count(table) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(table))).scalar_one()
+
+
+def test_deleting_an_account_cascades_to_archived_rows(database):
+    async def scenario():
+        alice, _ = await seed()
+        async with engine.begin() as conn:
+            report = await conn.run_sync(maintain_partitions, NOW)
+        archive = archive_table(report.archived[0])
+        archived = await count(archive), await count(Transaction.__table__)
+
+        async with engine.begin() as conn:
+            await conn.execute(delete(Account).where(Account.id == alice))
+        return report.archived, archived, (await count(archive), await count(Transaction.__table__))
+
+    archived_names, before, after = database(scenario())
+
+    assert archived_names == ["transactions_archive_2020_03"]
+    assert before == (1, 1)
+    assert after == (0, 0)
@@ -0,0 +1,115 @@
+from utils.rate_limit import (RATE_LIMIT_POLICIES, MemoryRateLimitBackend, RateLimiter, RatePolicy,
+                              parse_policies, retry_after)
+import asyncio
+
+POLICY = RatePolicy("user", 5, 60)
+
+
+def test_parse_policies():
+    assert parse_policies("ip=30/60, username=10/300") == (RatePolicy("ip", 30, 60.0),
+                                                           RatePolicy("username", 10, 300.0))
+
+
+def test_retry_after_allows_exactly_limit():
+    assert retry_after(POLICY, current=5, previous=0, now=0) is None
+    assert retry_after(POLICY, current=6, previous=0, now=0) is not None
+
+
+def test_retry_after_weights_previous_window():
+    # Half Way Through the Window Half of the Previous Count Still Applies
+    assert retry_after(POLICY, current=2, previous=6, now=30) is None
+    assert retry_after(POLICY, current=3, previous=6, now=30) is not None
+
+
+def test_retry_after_full_window_waits_into_next():
+    # 6 in Window 0: at 80 s the Previous Weight is 6 * 2/3, so a Retry Makes 4 + 1
+    assert retry_after(POLICY, current=6, previous=0, now=0) == 80
+    assert retry_after(POLICY, current=1, previous=6, now=80) is None
+    assert retry_after(POLICY, current=1, previous=6, now=79) is not None
+
+
+def test_retry_after_previous_decays_within_window():
+    # 6 * (1 - 1/2) + 3 > 5; at 50 s the Retry Makes 6 * 1/6 + 4
+    assert retry_after(POLICY, current=3, previous=6, now=30) == 20
+    assert retry_after(POLICY, current=4, previous=6, now=50) is None
+    assert retry_after(POLICY, current=4, previous=6, now=49) is not None
+
+
+def test_retry_after_rounds_partial_seconds_up():
+    # 1 * (1 - 599/600) + 5 > 5; the Full Window Decays Through the Next, Admitting a Retry at 72 s
+    assert retry_after(POLICY, current=5, previous=1, now=59.9) == 13
+    assert retry_after(POLICY, current=1, previous=5, now=72) is None
+    assert retry_after(POLICY, current=1, previous=5, now=71.9) is not None
+
+
+def test_memory_backend_retry_is_admitted():
+    backend = MemoryRateLimitBackend(max_keys=100)
+    now = 10.0
+    hits = [asyncio.run(backend.hit("key", POLICY, now)) for _ in range(6)]
+    assert [retry_after(POLICY, *hit, now) for hit in hits[:5]] == [None] * 5
+
+    wait = retry_after(POLICY, *hits[5], now)
+    assert wait == 70
+    assert retry_after(POLICY, *asyncio.run(backend.hit("key", POLICY, now + wait)), now + wait) is None
+
+
+def test_memory_backend_rolls_windows():
+    backend = MemoryRateLimitBackend(max_keys=100)
+    for _ in range(3):
+        asyncio.run(backend.hit("key", POLICY, 10))
+    assert asyncio.run(backend.hit("key", POLICY, 70)) == (1, 3)
+    assert asyncio.run(backend.hit("key", POLICY, 190)) == (1, 0)
+
+
+def test_memory_backend_sweeps_expired_entries():
+    backend = MemoryRateLimitBackend(max_keys=100)
+    asyncio.run(backend.hit("old", POLICY, 0))
+    asyncio.run(backend.hit("new", POLICY, 100))
+    assert backend.size() == 2
+
+    # "old" Expires at the End of Window 1 (120 s)
+    asyncio.run(backend.hit("new", POLICY, 120))
+    assert list(backend.entries) == ["new"]
+
+
+def test_memory_backend_caps_keys_lru():
+    backend = MemoryRateLimitBackend(max_keys=2)
+    for key in ("a", "b", "a", "c"):
+        asyncio.run(backend.hit(key, POLICY, 0))
+    assert list(backend.entries) == ["a", "c"]
+
+
+class FailingBackend:
+    name = "failing"
+
+    async def hit(self, key, policy, now):
+        raise OSError("Connection Refused")
+
+    def size(self):
+        return None
+
+
+def test_limiter_counts_allowed_and_rejected():
+    limiter = RateLimiter(MemoryRateLimitBackend(max_keys=100))
+    keys = [(RatePolicy("user", 2, 3600), "user-1")]
+    results = [asyncio.run(limiter.check("checkout", keys)) for _ in range(3)]
+
+    assert results[:2] == [None, None]
+    assert results[2] >= 1
+    assert (limiter.allowed["checkout"], limiter.rejected["checkout"]) == (2, 1)
+    assert limiter.stats()["routes"]["checkout"]["rejected"] == 1
+    assert set(limiter.stats()["routes"]) == set(RATE_LIMIT_POLICIES)
+
+
+def test_limiter_uses_longest_wait():
+    limiter = RateLimiter(MemoryRateLimitBackend(max_keys=100))
+    keys = [(RatePolicy("ip", 1, 60), "10.0.0.1"), (RatePolicy("username", 1, 600), "alice")]
+    asyncio.run(limiter.check("login", keys))
+    assert asyncio.run(limiter.check("login", keys)) > 60
+
+
+def test_limiter_lets_requests_through_on_backend_errors():
+    limiter = RateLimiter(FailingBackend())
+    assert asyncio.run(limiter.check("login", [(RatePolicy("ip", 1, 60), "10.0.0.1")])) is None
+    assert limiter.errors == 1
+    assert limiter.allowed["login"] == 1
@@ -0,0 +1,68 @@
+from utils.stripe_gateway import CircuitBreaker, StripeGateway, StripeUnavailableError
+import asyncio
+import pytest
+import stripe
+import threading
+
+
+def outage():
+    raise stripe.error.APIConnectionError("Connection Refused")
+
+
+def test_breaker_opens_then_admits_a_single_trial():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.0)
+    assert breaker.allow() == (True, False)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == "half-open"
+    assert breaker.allow() == (True, True)
+    assert breaker.allow() == (False, False)
+
+    breaker.record_success(trial=True)
+    assert breaker.state == "closed" and not breaker.trial_in_flight
+
+
+def test_late_call_does_not_release_the_trial():
+    gateway = StripeGateway(4, 5.0, CircuitBreaker(threshold=2, cooldown=0.0))
+    late_started, release_late, trial_started, release_trial = (threading.Event() for _ in range(4))
+
+    def late():
+        late_started.set()
+        release_late.wait()
+        raise stripe.error.APIConnectionError("Connection Reset")
+
+    def trial():
+        trial_started.set()
+        release_trial.wait()
+        return "ok"
+
+    async def scenario():
+        # Admitted while Closed, Settles after the Breaker has Opened and Admitted a Trial
+        late_call = asyncio.ensure_future(gateway.call(late))
+        await asyncio.to_thread(late_started.wait)
+        for _ in range(2):
+            with pytest.raises(stripe.error.APIConnectionError):
+                await gateway.call(outage)
+
+        trial_call = asyncio.ensure_future(gateway.call(trial))
+        await asyncio.to_thread(trial_started.wait)
+        release_late.set()
+        with pytest.raises(stripe.error.APIConnectionError):
+            await late_call
+
+        in_flight = gateway.breaker.trial_in_flight
+        with pytest.raises(StripeUnavailableError):
+            await gateway.call(trial)
+        release_trial.set()
+        return in_flight, await trial_call
+
+    try:
+        in_flight, result = asyncio.run(scenario())
+    finally:
+        release_late.set()
+        release_trial.set()
+        gateway.shutdown()
+
+    assert in_flight and result == "ok"
+    assert gateway.breaker.state == "closed" and not gateway.breaker.trial_in_flight
@@ -0,0 +1,258 @@
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.exc import DBAPIError
+from schemas.accounts import Account
+from schemas.transactions import Transaction, ValidTransactionStatus
+from schemas.users import User
+from utils.db import AsyncSessionLocal
+from utils import transfers
+from utils.transfers import (apply_balance_deltas, execute_transfer, execute_transfer_batch,
+                             is_retryable_error, run_with_retry)
+from validations.accounts import TransactionBatchRequest, TransactionRequest
+from uuid import uuid4
+import asyncio
+import pytest
+
+
+# Two Users with one Account each; Returns {username: (user_id, account_id)}
+async def seed(balances: dict[str, float]) -> dict:
+    accounts = {}
+    async with AsyncSessionLocal() as db:
+        for username, balance in balances.items():
+            user = User(username=username, email=f"{username}@example.com", password="x")
+            db.add(user)
+            await db.flush()
+            account = Account(user_id=user.id, balance=balance)
+            db.add(account)
+            await db.flush()
+            accounts[username] = (user.id, account.id)
+        await db.commit()
+    return accounts
+
+
+async def ledger() -> tuple[dict, int]:
+    async with AsyncSessionLocal() as db:
+        balances = dict((await db.execute(select(Account.id, Account.balance))).all())
+        count = (await db.execute(select(func.count()).select_from(Transaction))).scalar_one()
+    return balances, count
+
+
+def request(account_id, amount: float) -> TransactionRequest:
+    return TransactionRequest(receiver_account_id=account_id, receiver_username="bob",
+                              transfer_amount=amount)
+
+
+async def transfer(sender: tuple, receiver_account_id, amount: float):
+    async with AsyncSessionLocal() as db:
+        return await execute_transfer(db, sender[0], "alice", request(receiver_account_id, amount))
+
+
+def test_transfer_moves_money_and_records_it(database):
+    async def scenario():
+        accounts = await seed({"alice": 100.0, "bob": 5.0})
+        transaction = await transfer(accounts["alice"], accounts["bob"][1], 40.0)
+        return accounts, transaction, await ledger()
+
+    accounts, transaction, (balances, count) = database(scenario())
+
+    assert transaction.status == ValidTransactionStatus.COMPLETED
+    assert balances == {accounts["alice"][1]: 60.0, accounts["bob"][1]: 45.0}
+    assert count == 1
+
+
+@pytest.mark.parametrize("amount, receiver, code", [
+    (100.01, "bob", 400),     # Insufficient Balance
+    (10.0, "alice", 400),     # Sender == Receiver
+    (10.0, None, 404),        # Unknown Receiver
+    (0.0, "bob", 400),        # Non-Positive Amount
+])
+def test_rejected_transfer_changes_nothing(database, amount, receiver, code):
+    async def scenario():
+        accounts = await seed({"alice": 100.0, "bob": 5.0})
+        before = await ledger()
+        receiver_id = accounts[receiver][1] if receiver else uuid4()
+        with pytest.raises(HTTPException) as error:
+            await transfer(accounts["alice"], receiver_id, amount)
+        return error.value.status_code, before, await ledger()
+
+    status_code, before, after = database(scenario())
+
+    assert status_code == code
+    assert after == before
+
+
+def test_guarded_update_rejects_overdraft(database):
+    # The Guard Holds even if the Balance Read under the Lock is Stale
+    async def scenario():
+        accounts = await seed({"alice": 30.0, "bob": 5.0})
+        sender, receiver = accounts["alice"][1], accounts["bob"][1]
+        async with AsyncSessionLocal() as db:
+            rejected = await apply_balance_deltas(db, sender, {sender: -30.01, receiver: 30.01})
+            await db.rollback()
+        async with AsyncSessionLocal() as db:
+            exact = await apply_balance_deltas(db, sender, {sender: -30.0, receiver: 30.0})
+            await db.commit()
+        return accounts, rejected, exact, await ledger()
+
+    accounts, rejected, exact, (balances, _) = database(scenario())
+
+    assert rejected is None
+    assert len(exact) == 2 and all(row.version == 1 for row in exact)
+    assert balances == {accounts["alice"][1]: 0.0, accounts["bob"][1]: 35.0}
+
+
+def test_guarded_update_requires_every_row(database):
+    # A Missing Receiver Returns Fewer Rows than Deltas, which Rejects the Whole Update
+    async def scenario():
+        accounts = await seed({"alice": 30.0})
+        sender = accounts["alice"][1]
+        async with AsyncSessionLocal() as db:
+            return await apply_balance_deltas(db, sender, {sender: -10.0, uuid4(): 10.0})
+
+    assert database(scenario()) is None
+
+
+def test_batch_atomic_rolls_back_on_any_rejection(database):
+    async def scenario():
+        accounts = await seed({"alice": 100.0, "bob": 5.0})
+        bob = accounts["bob"][1]
+        batch = TransactionBatchRequest(transfers=[request(bob, 30.0), request(bob, 500.0)], atomic=True)
+        async with AsyncSessionLocal() as db:
+            response = await execute_transfer_batch(db, accounts["alice"][0], "alice", batch)
+        return response, await ledger()
+
+    response, (balances, count) = database(scenario())
+
+    assert (response.committed, response.completed, response.rejected) == (False, 0, 2)
+    assert [result.status for result in response.results] == [ValidTransactionStatus.CANCELED,
+                                                               ValidTransactionStatus.REJECTED]
+    assert sorted(balances.values()) == [5.0, 100.0]
+    assert count == 0
+
+
+def test_batch_partial_commits_valid_transfers(database):
+    async def scenario():
+        accounts = await seed({"alice": 100.0, "bob": 5.0})
+        alice, bob = accounts["alice"][1], accounts["bob"][1]
+        batch = TransactionBatchRequest(transfers=[
+            request(bob, 60.0),
+            request(bob, 50.0),        # Exceeds what the First Transfer Left
+            request(alice, 1.0),       # Sender == Receiver
+            request(uuid4(), 1.0),     # Unknown Receiver
+            request(bob, -1.0),        # Non-Positive Amount
+            request(bob, 40.0),
+        ], atomic=False)
+        async with AsyncSessionLocal() as db:
+            response = await execute_transfer_batch(db, accounts["alice"][0], "alice", batch)
+        return accounts, response, await ledger()
+
+    accounts, response, (balances, count) = database(scenario())
+
+    assert (response.committed, response.completed, response.rejected) == (True, 2, 4)
+    assert [result.status for result in response.results] == [
+        ValidTransactionStatus.COMPLETED, ValidTransactionStatus.REJECTED,
+        ValidTransactionStatus.REJECTED, ValidTransactionStatus.REJECTED,
+        ValidTransactionStatus.REJECTED, ValidTransactionStatus.COMPLETED]
+    assert balances == {accounts["alice"][1]: 0.0, accounts["bob"][1]: 105.0}
+    assert count == 2
+
+
+def test_batch_partial_with_nothing_valid_commits_nothing(database):
+    async def scenario():
+        accounts = await seed({"alice": 10.0, "bob": 5.0})
+        batch = TransactionBatchRequest(transfers=[request(accounts["bob"][1], 50.0)], atomic=False)
+        async with AsyncSessionLocal() as db:
+            response = await execute_transfer_batch(db, accounts["alice"][0], "alice", batch)
+        return response, await ledger()
+
+    response, (balances, count) = database(scenario())
+
+    assert (response.committed, response.completed, response.rejected) == (False, 0, 1)
+    assert sorted(balances.values()) == [5.0, 10.0] and count == 0
+
+
+# --- Retries ---
+
+class DriverError(Exception):
+    def __init__(self, message: str, sqlstate=None):
+        super().__init__(message)
+        self.sqlstate = sqlstate
+
+
+def db_error(message: str, sqlstate=None) -> DBAPIError:
+    return DBAPIError("UPDATE accounts", {}, DriverError(message, sqlstate))
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(transfers, "TRANSFER_BACKOFF_BASE", 0.0)
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (db_error("could not serialize access", "40001"), True),
+    (db_error("deadlock detected", "40P01"), True),
+    (db_error("database is locked"), True),
+    (db_error("duplicate key value", "23505"), False),
+    (db_error("connection refused"), False),
+])
+def test_retryable_errors(error, retryable):
+    assert is_retryable_error(error) is retryable
+
+
+@pytest.mark.parametrize("sqlstate, message", [("40001", "serialization"), ("40P01", "deadlock"),
+                                               (None, "database is locked")])
+def test_run_with_retry_retries_contention(no_backoff, sqlstate, message):
+    session, calls = FakeSession(), []
+
+    async def unit_of_work(db, value):
+        calls.append(value)
+        if len(calls) < 3:
+            raise db_error(message, sqlstate)
+        return value * 2
+
+    assert asyncio.run(run_with_retry(session, unit_of_work, 21)) == 42
+    assert len(calls) == 3 and session.rollbacks == 2
+
+
+def test_run_with_retry_does_not_retry_other_errors(no_backoff):
+    session, calls = FakeSession(), []
+
+    async def unit_of_work(db):
+        calls.append(1)
+        raise db_error("duplicate key value", "23505")
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(run_with_retry(session, unit_of_work))
+    assert len(calls) == 1 and session.rollbacks == 1
+
+
+def test_run_with_retry_gives_up_after_max_attempts(no_backoff):
+    session, calls = FakeSession(), []
+
+    async def unit_of_work(db):
+        calls.append(1)
+        raise db_error("deadlock detected", "40P01")
+
+    with pytest.raises(DBAPIError):
+        asyncio.run(run_with_retry(session, unit_of_work))
+    assert len(calls) == transfers.TRANSFER_MAX_ATTEMPTS
+
+
+def test_run_with_retry_passes_http_errors_through(no_backoff):
+    session, calls = FakeSession(), []
+
+    async def unit_of_work(db):
+        calls.append(1)
+        raise HTTPException(status_code=400, detail="Insufficient Balance")
+
+    with pytest.raises(HTTPException):
+        asyncio.run(run_with_retry(session, unit_of_work))
+    assert len(calls) == 1 and session.rollbacks == 0
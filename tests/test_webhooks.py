@@ -0,0 +1,96 @@
+from sqlalchemy import select, insert, func
+from schemas.accounts import Account
+from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from schemas.users import User
+from schemas.webhook_events import WebhookEvent
+from utils.db import AsyncSessionLocal
+from utils.webhooks import WebhookInboxWorker
+import asyncio
+
+EMAIL = "alice@example.com"
+
+
+def invoice_paid(event_id: str, subscription: str, amount_paid: int = 2000, period: bool = True) -> dict:
+    invoice = {"object": "invoice", "customer_email": EMAIL, "subscription": subscription,
+               "currency": "usd", "amount_paid": amount_paid}
+    if period:
+        invoice["lines"] = {"data": [{"period": {"start": 1700000000, "end": 1702600000}}]}
+    return {"id": event_id, "type": "invoice.paid", "data": {"object": invoice}}
+
+
+async def seed(events: list[dict]):
+    async with AsyncSessionLocal() as db:
+        user = User(username="alice", email=EMAIL, password="x")
+        db.add(user)
+        await db.flush()
+        db.add(Account(user_id=user.id, balance=1000.0))
+        await db.execute(insert(WebhookEvent), [{"id": event["id"], "type": event["type"], "payload": event}
+                                                for event in events])
+        await db.commit()
+
+
+async def state() -> dict:
+    async with AsyncSessionLocal() as db:
+        balance = (await db.execute(select(Account.balance))).scalar_one()
+        subscriptions = (await db.execute(select(func.count()).select_from(Subscription))).scalar_one()
+        active = (await db.execute(select(func.count()).select_from(Subscription).where(
+            Subscription.status == ValidSubscriptionStatus.ACTIVE))).scalar_one()
+        events = {event.id: event for event in (await db.execute(select(WebhookEvent))).scalars()}
+    return {"balance": balance, "subscriptions": subscriptions, "active": active, "events": events}
+
+
+def test_concurrent_workers_apply_each_event_once(database):
+    async def scenario():
+        await seed([invoice_paid(f"evt_{index}", f"sub_{index}") for index in range(20)])
+        first, second = WebhookInboxWorker(200, 5, 5), WebhookInboxWorker(200, 5, 5)
+        drained = await asyncio.gather(first.drain_once(), second.drain_once())
+        return drained, first.processed + second.processed, await state()
+
+    drained, processed, after = database(scenario())
+
+    # Both Workers Read the Same Batch; Only one Claims it
+    assert sorted(drained) == [0, 20]
+    assert processed == 20
+    assert after["balance"] == 1000.0 + 20 * 2000
+    assert (after["subscriptions"], after["active"]) == (20, 1)
+    assert all(event.processed_at is not None for event in after["events"].values())
+
+
+def test_failing_batch_falls_back_to_individual_events(database):
+    async def scenario():
+        events = [invoice_paid(f"evt_{index}", f"sub_{index}") for index in range(5)]
+        events.append(invoice_paid("evt_bad", "sub_bad", period=False))
+        await seed(events)
+
+        worker = WebhookInboxWorker(200, 5, 5)
+        await worker.drain_once()
+        return worker, await state()
+
+    worker, after = database(scenario())
+
+    assert (worker.processed, worker.failed) == (5, 1)
+    assert after["balance"] == 1000.0 + 5 * 2000
+    assert after["subscriptions"] == 5
+
+    # The Failed Batch's Claim was Rolled Back: the Bad Event is Still Pending, with its Error
+    bad = after["events"].pop("evt_bad")
+    assert bad.processed_at is None
+    assert bad.attempts == 1 and bad.last_error
+    assert all(event.processed_at is not None for event in after["events"].values())
+
+
+def test_concurrent_fallbacks_apply_each_event_once(database):
+    async def scenario():
+        events = [invoice_paid(f"evt_{index}", f"sub_{index}") for index in range(10)]
+        events.append(invoice_paid("evt_bad", "sub_bad", period=False))
+        await seed(events)
+
+        first, second = WebhookInboxWorker(200, 5, 5), WebhookInboxWorker(200, 5, 5)
+        await asyncio.gather(first.drain_once(), second.drain_once())
+        return first.processed + second.processed, await state()
+
+    processed, after = database(scenario())
+
+    assert processed == 10
+    assert after["balance"] == 1000.0 + 10 * 2000
+    assert after["events"]["evt_bad"].processed_at is None
@@ -1,5 +1,4 @@
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from typing import Annotated, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
@@ -7,8 +6,15 @@ from dotenv import load_dotenv
 import os
 import re
 from schemas.users import User
+from utils.hashing import verify_password
+from utils.roles import role_registry
+from utils.db import current_user_id
 from uuid import UUID
 from datetime import timedelta, datetime, timezone
+from dataclasses import dataclass
+from collections import OrderedDict
+import hashlib
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -18,15 +24,8 @@ load_dotenv()
 
 SECRET_KEY = os.environ.get("SECRET_KEY")
 ALGORITHM = os.environ.get("HASHING_ALGORITHM")
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
 
-ROLE_LEVELS = {
-    "User": 0,
-    "Developer": 1,
-    "Admin": 2
-}
-
-
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
@@ -55,11 +54,14 @@ async def authenticate_user(identifier: str, password: str, db: AsyncSession) ->
         if not user:
             return None
 
-        if not bcrypt_context.verify(password, user.password):
+        if not await verify_password(password, user.password):
             return None
 
         return user
 
+    except HTTPException as e:
+        raise e
+
     except Exception as e:
         return None
 
@@ -76,38 +78,104 @@ def create_access_token(username: str, user_id: UUID, role: str, expires_in: tim
     return jwt.encode(encode, SECRET_KEY, ALGORITHM)
 
 
-# Util Function to Decode the Token, for Current User Information
-def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> dict:
+# Decoded Identity of the Caller, Shared Read-Only Across Requests
+@dataclass(frozen=True, slots=True)
+class Principal:
+    username: str
+    id: UUID
+    role: Optional[str]
+
+
+# Bounded LRU of Verified Token Claims, Keyed by the Token's SHA-256 Digest
+class TokenCache:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries: OrderedDict[bytes, tuple[Principal, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> Optional[Principal]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        principal, expires_at = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return principal
+
+    def put(self, key: bytes, principal: Principal, expires_at: float):
+        self.entries[key] = (principal, expires_at)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
+
+# Util Function to Verify a Token, Reusing Claims Already Verified for the Same Token
+def decode_token(token: str) -> Principal:
+    key = hashlib.sha256(token.encode()).digest()
+    principal = token_cache.get(key)
+    if principal is not None:
+        return principal
+
     try:
         payload = jwt.decode(token, SECRET_KEY, ALGORITHM)
         username: str = payload.get("sub")
-        user_id: int = payload.get("id")
+        user_id: str = payload.get("id")
         role: str = payload.get("pos")
+        expires_at = payload.get("exp")
 
         if username is None or user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                                 detail="Could Not Validate User")
 
-        return {
-            "username": username,
-            "id": UUID(user_id),
-            "role": role,
-        }
+        principal = Principal(username=username, id=UUID(user_id), role=role)
+        if expires_at is not None:
+            token_cache.put(key, principal, float(expires_at))
+
+        return principal
 
-    except JWTError:
+    except (JWTError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
                             detail="Could Not Validate User")
 
 
+# Util Function to Decode the Token, for Current User Information
+async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]) -> Principal:
+    principal = decode_token(token)
+    current_user_id.set(principal.id)
+    return principal
+
+
 # Util Function to Set Minimum Level Access Dependencies
 def require_role(min_level: int):
-    def role_dependency(user: Annotated[dict, Depends(get_current_user)]):
-        if user["role"] is None:
+    async def role_dependency(user: Annotated[Principal, Depends(get_current_user)]):
+        if user.role is None:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="User Role Information is Missing"
             )
-        user_level = ROLE_LEVELS.get(user["role"])
+        user_level = role_registry.level_of(user.role)
 
         if user_level is None:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
@@ -124,4 +192,4 @@ def require_role(min_level: int):
 
 
 # Validated User Dependency Injection for Routes
-user_dependency = Annotated[dict, Depends(get_current_user)]
+user_dependency = Annotated[Principal, Depends(get_current_user)]
@@ -0,0 +1,185 @@
+from utils.resp import RespClient, RespError
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from dotenv import load_dotenv
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+import asyncio
+import json
+import time
+import os
+
+load_dotenv()
+
+# Shared RESP Server (e.g. redis://127.0.0.1:6390), Unset Keeps the Cache In-Process
+BALANCE_CACHE_URL = os.environ.get("BALANCE_CACHE_URL")
+BALANCE_CACHE_SIZE = int(os.environ.get("BALANCE_CACHE_SIZE", 100000))
+
+# Upper Bound on how Long a Missed Write (e.g. from Another Service) can be Served Stale
+BALANCE_CACHE_TTL_SECONDS = float(os.environ.get("BALANCE_CACHE_TTL_SECONDS", 30))
+
+# Backend Failures Degrade to Cache Misses
+BACKEND_ERRORS = (OSError, EOFError, RespError, asyncio.TimeoutError, ValueError)
+
+
+# Cached Balance of one User's Account, Stamped with the Row Version it was Read At
+@dataclass(frozen=True, slots=True)
+class BalanceEntry:
+    currency: str
+    balance: float
+    last_updated: datetime
+    version: int
+
+    def dumps(self) -> str:
+        data = asdict(self)
+        data["last_updated"] = self.last_updated.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "BalanceEntry":
+        data = json.loads(raw)
+        data["last_updated"] = datetime.fromisoformat(data["last_updated"])
+        return cls(**data)
+
+
+# Bounded In-Process LRU, the Default Backend
+class MemoryBalanceBackend:
+    name = "memory"
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[UUID, tuple[BalanceEntry, float]] = OrderedDict()
+
+    async def get(self, user_id: UUID) -> Optional[BalanceEntry]:
+        item = self.entries.get(user_id)
+        if item is None:
+            return None
+
+        entry, expires_at = item
+        if expires_at <= time.monotonic():
+            del self.entries[user_id]
+            return None
+
+        self.entries.move_to_end(user_id)
+        return entry
+
+    async def put(self, user_id: UUID, entry: BalanceEntry) -> bool:
+        current = await self.get(user_id)
+        if current is not None and current.version >= entry.version:
+            return False
+
+        self.entries[user_id] = (entry, time.monotonic() + self.ttl_seconds)
+        self.entries.move_to_end(user_id)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return True
+
+    def size(self) -> int:
+        return len(self.entries)
+
+
+# Shared Backend on a RESP Server; Writes are Version-Checked under WATCH/MULTI/EXEC
+class RespBalanceBackend:
+    name = "resp"
+
+    def __init__(self, client: RespClient, ttl_seconds: float):
+        self.client = client
+        self.ttl_ms = int(ttl_seconds * 1000)
+
+    @staticmethod
+    def key(user_id: UUID) -> str:
+        return f"balance:{user_id}"
+
+    async def get(self, user_id: UUID) -> Optional[BalanceEntry]:
+        raw = await self.client.execute("GET", self.key(user_id))
+        return BalanceEntry.loads(raw) if raw else None
+
+    async def put(self, user_id: UUID, entry: BalanceEntry) -> bool:
+        return await asyncio.wait_for(self._compare_and_set(self.key(user_id), entry),
+                                      self.client.timeout)
+
+    # An Aborted EXEC Means Another Writer Got in First, so Re-Check Until Stored or Outdated
+    async def _compare_and_set(self, key: str, entry: BalanceEntry) -> bool:
+        async with self.client.connection() as conn:
+            while True:
+                await conn.execute("WATCH", key)
+                raw = await conn.execute("GET", key)
+                if raw and BalanceEntry.loads(raw).version >= entry.version:
+                    await conn.execute("UNWATCH")
+                    return False
+
+                await conn.execute("MULTI")
+                await conn.execute("SET", key, entry.dumps(), "PX", self.ttl_ms)
+                if await conn.execute("EXEC") is not None:
+                    return True
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+# Per-User Balance Cache, Filled on Read and Updated Write-Through after each Commit
+# Entries only Move Forward in Version, so a Late or Stale Write Cannot Replace a Newer One.
+# Backend Errors Count as Misses: the Database Stays the Source of Truth.
+class BalanceCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.stale_writes = 0
+        self.errors = 0
+
+    async def get(self, user_id: UUID) -> Optional[BalanceEntry]:
+        try:
+            entry = await self.backend.get(user_id)
+        except BACKEND_ERRORS as e:
+            self.errors += 1
+            print(f"Balance Cache Read Failed: {str(e)}")
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def put(self, user_id: UUID, entry: BalanceEntry):
+        try:
+            if await self.backend.put(user_id, entry):
+                self.writes += 1
+            else:
+                self.stale_writes += 1
+        except BACKEND_ERRORS as e:
+            self.errors += 1
+            print(f"Balance Cache Write Failed: {str(e)}")
+
+    # Rows Need user_id, currency, balance, last_updated and version (e.g. UPDATE ... RETURNING)
+    async def put_rows(self, rows: Iterable):
+        for row in rows:
+            await self.put(row.user_id, BalanceEntry(currency=row.currency,
+                                                     balance=row.balance,
+                                                     last_updated=row.last_updated,
+                                                     version=row.version))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "stale_writes": self.stale_writes,
+            "errors": self.errors,
+            "ttl_seconds": BALANCE_CACHE_TTL_SECONDS,
+        }
+
+
+balance_cache = BalanceCache(
+    RespBalanceBackend(RespClient(BALANCE_CACHE_URL), BALANCE_CACHE_TTL_SECONDS)
+    if BALANCE_CACHE_URL else
+    MemoryBalanceBackend(BALANCE_CACHE_SIZE, BALANCE_CACHE_TTL_SECONDS)
+)
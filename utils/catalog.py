@@ -0,0 +1,99 @@
+from pydantic import TypeAdapter
+from validations.payments import StripeProduct, StripePrice
+from utils.stripe_gateway import get_stripe_gateway
+from dotenv import load_dotenv
+from typing import List, Optional
+from time import monotonic
+import asyncio
+import hashlib
+import os
+
+load_dotenv()
+
+# Age After which the Catalog is Refreshed in the Background
+CATALOG_TTL_SECONDS = float(os.environ.get("CATALOG_TTL_SECONDS", 300))
+
+# Extra Age for which a Stale Catalog may Still be Served While Refreshing
+CATALOG_STALE_SECONDS = float(os.environ.get("CATALOG_STALE_SECONDS", 3600))
+
+
+products_adapter = TypeAdapter(List[StripeProduct])
+
+
+# Util Function to Fetch Products and Prices with Two Concurrent Paged Listings
+# (Replaces one Price Listing per Product)
+async def fetch_products() -> List[StripeProduct]:
+    gateway = get_stripe_gateway()
+    products, prices = await asyncio.gather(gateway.list_products(),
+                                            gateway.list_prices())
+
+    prices_by_product: dict[str, list[StripePrice]] = {}
+    for price in prices:
+        product_id = price.product if isinstance(price.product, str) else price.product.id
+        prices_by_product.setdefault(product_id, []).append(
+            StripePrice(id=price.id,
+                        unit_amount=price.unit_amount,
+                        currency=price.currency,
+                        recurring=price.recurring))
+
+    return [StripeProduct(id=product.id,
+                          name=product.name,
+                          description=product.description,
+                          prices=prices_by_product.get(product.id, []))
+            for product in products]
+
+
+# In-Process Product Catalog with TTL and Stale-While-Revalidate
+class ProductCatalog:
+    def __init__(self, ttl: float, stale: float):
+        self.ttl = ttl
+        self.stale = stale
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+        self.fetched_at = 0.0
+        self.generation = 0
+        self.refresh_task: Optional[asyncio.Task] = None
+        self.refresh_error: Optional[Exception] = None
+
+    async def _refresh(self):
+        generation = self.generation
+        try:
+            products = await fetch_products()
+            body = products_adapter.dump_json(products)
+
+            self.body = body
+            self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+            self.refresh_error = None
+
+            # An Invalidation that Arrived Mid-Fetch Leaves the Result Due for Refresh
+            self.fetched_at = monotonic() if generation == self.generation else 0.0
+
+        except Exception as e:
+            self.refresh_error = e
+            print(f"Product Catalog Refresh Failed: {str(e)}")
+
+    def refresh_in_background(self) -> asyncio.Task:
+        if self.refresh_task is None or self.refresh_task.done():
+            self.refresh_task = asyncio.create_task(self._refresh())
+        return self.refresh_task
+
+    async def get(self) -> tuple[bytes, str]:
+        age = monotonic() - self.fetched_at
+
+        if self.body is None or age > self.ttl + self.stale:
+            await asyncio.shield(self.refresh_in_background())
+            if self.body is None:
+                raise self.refresh_error or RuntimeError("Product Catalog Unavailable")
+
+        elif age > self.ttl:
+            self.refresh_in_background()
+
+        return self.body, self.etag
+
+    def invalidate(self):
+        self.generation += 1
+        self.fetched_at = 0.0
+        self.refresh_in_background()
+
+
+product_catalog = ProductCatalog(CATALOG_TTL_SECONDS, CATALOG_STALE_SECONDS)
@@ -1,19 +1,320 @@
 from schemas import *
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from typing import Annotated, AsyncGenerator
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
+from typing import Annotated, AsyncGenerator, Optional
 from fastapi import Depends
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from utils.metrics import record_statement
 from dotenv import load_dotenv
+from time import perf_counter, monotonic
+from collections import OrderedDict
+from contextvars import ContextVar
+from uuid import UUID
+import logging
+import random
 import os
 
 load_dotenv()
 DATABASE_URL = os.environ.get("DATABASE_URL")
-engine = create_async_engine(DATABASE_URL, echo=True)
 
-# Async Session Factory
+# Optional Read Replica (Reads Use the Primary when Unset)
+READ_DATABASE_URL = os.environ.get("READ_DATABASE_URL")
+
+# Reads of a User who Committed within this Window go to the Primary (Read-Your-Writes)
+READ_STICKY_SECONDS = float(os.environ.get("READ_STICKY_SECONDS", 5))
+
+# How Long an Unhealthy Replica is Bypassed before it is Tried Again
+READ_REPLICA_RETRY_SECONDS = float(os.environ.get("READ_REPLICA_RETRY_SECONDS", 30))
+READ_STICKY_MAX_USERS = int(os.environ.get("READ_STICKY_MAX_USERS", 100000))
+
+# Engine Profile (Defaults are Tuned for Production)
+DB_ECHO = os.environ.get("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 20))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", 0))
+DB_PREPARED_STATEMENT_CACHE_SIZE = os.environ.get("DB_PREPARED_STATEMENT_CACHE_SIZE")
+
+# Statements Slower than the Threshold are Logged, for the Sampled Fraction of them
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", 250))
+DB_SLOW_QUERY_SAMPLE_RATE = float(os.environ.get("DB_SLOW_QUERY_SAMPLE_RATE", 1.0))
+
+slow_query_logger = logging.getLogger("db.slow_query")
+
+
+# Connection Pool Counters, Fed by Pool Events
+class PoolStats:
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.overflow_checkouts = 0
+        self.waits = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.slow_queries = 0
+
+    def record_wait(self, elapsed: float):
+        self.waits += 1
+        self.total_wait += elapsed
+        self.max_wait = max(self.max_wait, elapsed)
+
+
+# Queue Pool that Measures how Long Callers Wait for a Connection
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait(perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+# Util Function to Build Engine Options for the Configured Database
+def engine_options(url: str) -> dict:
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    parsed = make_url(url)
+
+    if parsed.get_backend_name() != "sqlite":
+        options.update(poolclass=InstrumentedQueuePool,
+                       pool_size=DB_POOL_SIZE,
+                       max_overflow=DB_MAX_OVERFLOW,
+                       pool_timeout=DB_POOL_TIMEOUT,
+                       pool_recycle=DB_POOL_RECYCLE)
+
+    if parsed.get_driver_name() == "asyncpg":
+        connect_args = {}
+        if DB_STATEMENT_TIMEOUT_MS:
+            connect_args["server_settings"] = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+        if DB_PREPARED_STATEMENT_CACHE_SIZE is not None:
+            connect_args["prepared_statement_cache_size"] = int(DB_PREPARED_STATEMENT_CACHE_SIZE)
+        options["connect_args"] = connect_args
+
+    return options
+
+
+# Util Function to Attach Pool Counters and Slow Query Logging to an Engine
+def instrument_engine(async_engine: AsyncEngine) -> PoolStats:
+    stats = PoolStats()
+    sync_engine = async_engine.sync_engine
+    pool = sync_engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        pool.stats = stats
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+        current = sync_engine.pool
+        if hasattr(current, "size") and current.checkedout() > current.size():
+            stats.overflow_checkouts += 1
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.checkins += 1
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidations += 1
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the Execution Context, so a Failing Statement Leaves Nothing Behind
+        context._query_started = perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - context._query_started
+        record_statement(elapsed)
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= DB_SLOW_QUERY_MS:
+            stats.slow_queries += 1
+            if random.random() < DB_SLOW_QUERY_SAMPLE_RATE:
+                slow_query_logger.warning("Slow Query (%.1f ms): %s", elapsed_ms, statement)
+
+    return stats
+
+
+# Util Function to Make SQLite Enforce Foreign Keys and their ON DELETE Actions
+# SQLite Leaves them Off unless each Connection Turns them On.
+def enforce_foreign_keys(async_engine: AsyncEngine):
+    if async_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# Util Function to Snapshot Pool Occupancy and Counters of an Engine
+def pool_metrics(async_engine: AsyncEngine, stats: PoolStats) -> dict:
+    pool = async_engine.sync_engine.pool
+    metrics = {
+        "pool_class": type(pool).__name__,
+        "connects": stats.connects,
+        "checkouts": stats.checkouts,
+        "checkins": stats.checkins,
+        "invalidations": stats.invalidations,
+        "overflow_checkouts": stats.overflow_checkouts,
+        "waits": stats.waits,
+        "avg_wait_ms": (stats.total_wait / stats.waits * 1000) if stats.waits else 0.0,
+        "max_wait_ms": stats.max_wait * 1000,
+        "slow_queries": stats.slow_queries,
+    }
+    if hasattr(pool, "size"):
+        metrics.update(size=pool.size(),
+                       checked_out=pool.checkedout(),
+                       checked_in=pool.checkedin(),
+                       overflow=pool.overflow())
+    return metrics
+
+
+# Caller Identity, Set during Authentication so Sessions can Route that Caller's Reads
+current_user_id: ContextVar[Optional[UUID]] = ContextVar("current_user_id", default=None)
+
+
+# Picks the Engine for Read Sessions: Replica by Default, Primary for Recent Writers
+# and while the Replica is Unhealthy
+class ReadRouter:
+    def __init__(self, primary: AsyncEngine, replica: AsyncEngine,
+                 sticky_seconds: float, retry_seconds: float, max_users: int):
+        self.primary = primary
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.max_users = max_users
+        self.recent_writers: OrderedDict[UUID, float] = OrderedDict()
+        self.down_until = 0.0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+        self.failovers = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica is not self.primary
+
+    @property
+    def healthy(self) -> bool:
+        return monotonic() >= self.down_until
+
+    def mark_write(self, user_id: UUID):
+        now = monotonic()
+        self.recent_writers[user_id] = now + self.sticky_seconds
+        self.recent_writers.move_to_end(user_id)
+
+        # Entries are Ordered by Deadline, so Expired Ones are Always at the Front
+        while self.recent_writers and (len(self.recent_writers) > self.max_users
+                                       or next(iter(self.recent_writers.values())) <= now):
+            self.recent_writers.popitem(last=False)
+
+    def mark_unhealthy(self):
+        if self.healthy:
+            self.failovers += 1
+        self.down_until = monotonic() + self.retry_seconds
+
+    def choose(self) -> AsyncEngine:
+        if not self.enabled:
+            return self.primary
+
+        user_id = current_user_id.get()
+        deadline = self.recent_writers.get(user_id) if user_id is not None else None
+        if deadline is not None and deadline > monotonic():
+            self.sticky_reads += 1
+            return self.primary
+
+        if not self.healthy:
+            self.primary_reads += 1
+            return self.primary
+
+        self.replica_reads += 1
+        return self.replica
+
+    def metrics(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.healthy,
+            "replica_reads": self.replica_reads,
+            "sticky_reads": self.sticky_reads,
+            "fallback_reads": self.primary_reads,
+            "failovers": self.failovers,
+            "sticky_users": len(self.recent_writers),
+        }
+
+
+engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+engine_stats = instrument_engine(engine)
+enforce_foreign_keys(engine)
+
+if READ_DATABASE_URL:
+    read_engine = create_async_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL))
+    read_engine_stats = instrument_engine(read_engine)
+    enforce_foreign_keys(read_engine)
+
+    # Connection Failures on the Replica Send Reads to the Primary for a While
+    @event.listens_for(read_engine.sync_engine, "handle_error")
+    def on_read_error(context):
+        if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+            read_router.mark_unhealthy()
+else:
+    read_engine, read_engine_stats = engine, engine_stats
+
+read_router = ReadRouter(engine, read_engine, READ_STICKY_SECONDS,
+                         READ_REPLICA_RETRY_SECONDS, READ_STICKY_MAX_USERS)
+
+
+# Primary Sessions Record their Committing User, Making that User's Reads Sticky
+class PrimarySession(Session):
+    pass
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def on_primary_commit(session):
+    user_id = current_user_id.get()
+    if user_id is not None and read_router.enabled:
+        read_router.mark_write(user_id)
+
+
+# Read Sessions Pick their Engine at the First Statement, after Authentication has Run
+class ReadSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        bind = self.info.get("read_bind")
+        if bind is None:
+            bind = self.info["read_bind"] = read_router.choose().sync_engine
+        return bind
+
+
+# Async Session Factories
 AsyncSessionLocal = async_sessionmaker(bind=engine,
                                        expire_on_commit=False,
-                                       class_=AsyncSession)
+                                       class_=AsyncSession,
+                                       sync_session_class=PrimarySession)
+
+ReadSessionLocal = async_sessionmaker(expire_on_commit=False,
+                                      class_=AsyncSession,
+                                      sync_session_class=ReadSession)
 
 
 # Dependency to get DB session
@@ -21,21 +322,40 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            
+
         except SQLAlchemyError:
             await session.rollback()
             raise
-        
+
         finally:
             await session.close()
 
 
-# Database Table Creation Util
-async def create_database():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    print("Database Created Successfully.")
+# Dependency to get a Read-Only DB Session (Replica, with Read-Your-Writes Stickiness)
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+
+        except SQLAlchemyError:
+            await session.rollback()
+            raise
+
+        finally:
+            await session.close()
+
+
+# Util Function to Build an INSERT that Skips Rows Conflicting on the Primary Key
+def insert_or_ignore(model):
+    if engine.dialect.name == "postgresql":
+        return postgresql_insert(model).on_conflict_do_nothing()
+    if engine.dialect.name == "sqlite":
+        return sqlite_insert(model).on_conflict_do_nothing()
+    return insert(model).prefix_with("IGNORE")
 
 
 # Database Dependency Injection for Routes
-db_dependency = Annotated[AsyncSession, Depends(get_db)]
\ No newline at end of file
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+
+# Read-Only Database Dependency, for GET Routes that Tolerate Replica Lag
+read_db_dependency = Annotated[AsyncSession, Depends(get_read_db)]
@@ -0,0 +1,287 @@
+from fastapi import WebSocket, WebSocketDisconnect, status
+from utils.resp import RespClient, RespConnection, RespError
+from validations.accounts import AccountBalanceResponse, TransactionResponse, SubscriptionResponse
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from typing import AsyncIterator, Callable, Iterable, Optional
+from uuid import UUID
+import asyncio
+import json
+import os
+
+load_dotenv()
+
+# Events Buffered per Connection; a Client that Falls this Far Behind is Disconnected
+STREAM_QUEUE_SIZE = int(os.environ.get("STREAM_QUEUE_SIZE", 64))
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("STREAM_HEARTBEAT_SECONDS", 15))
+
+# Shared RESP Server Fanning Events out to every Worker, Unset Delivers In-Process Only
+EVENTS_FANOUT_URL = os.environ.get("EVENTS_FANOUT_URL")
+EVENTS_CHANNEL = "account-events"
+EVENTS_RECONNECT_SECONDS = 1.0
+
+
+# One Event for a User's Streams, with the Payload Serialized once for every Connection
+@dataclass(frozen=True, slots=True)
+class StreamEvent:
+    kind: str
+    data: str
+
+
+# One Open Stream: a Bounded Queue, Closed by Putting None
+class Subscriber:
+    __slots__ = ("user_id", "queue", "evicted")
+
+    def __init__(self, user_id: UUID, queue_size: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[Optional[StreamEvent]] = asyncio.Queue(queue_size)
+        self.evicted = False
+
+    # Util Function to Wait for the Next Event; None on Close, Heartbeat Timeout Raises
+    async def next_event(self, timeout: float) -> Optional[StreamEvent]:
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+# In-Process Registry of Open Streams per User
+# Delivery Never Blocks the Publisher: a Full Queue Evicts its Subscriber instead.
+# Listeners See every Event Reaching this Worker, Whether or not the User has a Stream Open.
+class EventHub:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.subscribers: dict[UUID, set[Subscriber]] = {}
+        self.listeners: list[Callable[[UUID, StreamEvent], None]] = []
+        self.delivered = 0
+        self.evicted = 0
+        self.opened = 0
+
+    def subscribe(self, user_id: UUID) -> Subscriber:
+        subscriber = Subscriber(user_id, self.queue_size)
+        self.subscribers.setdefault(user_id, set()).add(subscriber)
+        self.opened += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self.subscribers.get(subscriber.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self.subscribers[subscriber.user_id]
+
+    def _close(self, subscriber: Subscriber):
+        self.unsubscribe(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def add_listener(self, listener: Callable[[UUID, StreamEvent], None]):
+        self.listeners.append(listener)
+
+    def deliver(self, user_id: UUID, event: StreamEvent):
+        for listener in self.listeners:
+            listener(user_id, event)
+
+        for subscriber in list(self.subscribers.get(user_id, ())):
+            try:
+                subscriber.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                subscriber.evicted = True
+                self.evicted += 1
+                self._close(subscriber)
+
+    def close_all(self):
+        for subscribers in list(self.subscribers.values()):
+            for subscriber in list(subscribers):
+                self._close(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "connections": sum(len(subscribers) for subscribers in self.subscribers.values()),
+            "users": len(self.subscribers),
+            "opened": self.opened,
+            "delivered": self.delivered,
+            "evicted": self.evicted,
+            "queue_size": self.queue_size,
+        }
+
+
+event_hub = EventHub(STREAM_QUEUE_SIZE)
+
+
+# Default Fan-Out: Events Reach Streams Held by this Worker Only
+class LocalFanout:
+    name = "local"
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+        self.errors = 0
+
+    async def publish(self, messages: list[tuple[UUID, StreamEvent]]):
+        for user_id, event in messages:
+            self.hub.deliver(user_id, event)
+
+    def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "errors": self.errors}
+
+
+# Cross-Worker Fan-Out over RESP PUBLISH/SUBSCRIBE
+# Every Worker (the Publisher Included) Delivers what Arrives on the Channel, so
+# Messages are Delivered Locally Only when Publishing Fails.
+class RespFanout:
+    name = "resp"
+
+    def __init__(self, hub: EventHub, client: RespClient, channel: str):
+        self.hub = hub
+        self.client = client
+        self.channel = channel
+        self.task: Optional[asyncio.Task] = None
+        self.errors = 0
+
+    async def publish(self, messages: list[tuple[UUID, StreamEvent]]):
+        payload = json.dumps([[str(user_id), event.kind, event.data] for user_id, event in messages])
+        try:
+            await self.client.execute("PUBLISH", self.channel, payload)
+        except (OSError, EOFError, RespError, asyncio.TimeoutError) as e:
+            self.errors += 1
+            print(f"Event Fan-Out Publish Failed: {str(e)}")
+            for user_id, event in messages:
+                self.hub.deliver(user_id, event)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await self.client.close()
+
+    async def _listen(self):
+        while True:
+            conn = None
+            try:
+                conn = await RespConnection.open(self.client.host, self.client.port)
+                await conn.send("SUBSCRIBE", self.channel)
+                while True:
+                    reply = await conn.read()
+                    if isinstance(reply, list) and reply[0] == b"message":
+                        for user_id, kind, data in json.loads(reply[2]):
+                            self.hub.deliver(UUID(user_id), StreamEvent(kind, data))
+
+            except (OSError, EOFError, RespError, ValueError) as e:
+                self.errors += 1
+                print(f"Event Fan-Out Subscription Lost: {str(e)}")
+                await asyncio.sleep(EVENTS_RECONNECT_SECONDS)
+
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def stats(self) -> dict:
+        return {"backend": self.name, "errors": self.errors}
+
+
+event_fanout = (RespFanout(event_hub, RespClient(EVENTS_FANOUT_URL), EVENTS_CHANNEL)
+                if EVENTS_FANOUT_URL else LocalFanout(event_hub))
+
+
+# Util Function to Push Committed Balance Changes and New Transactions to the Owners' Streams
+# Balance Rows Need id, user_id, currency, balance and last_updated (e.g. UPDATE ... RETURNING).
+async def publish_account_updates(balances: Iterable, transactions: Iterable[TransactionResponse] = ()):
+    owners = {}
+    messages = []
+    for row in balances:
+        owners[row.id] = row.user_id
+        balance = AccountBalanceResponse(currency=row.currency,
+                                         balance=row.balance,
+                                         last_updated=row.last_updated)
+        messages.append((row.user_id, StreamEvent("balance", balance.model_dump_json())))
+
+    for transaction in transactions:
+        event = StreamEvent("transaction", transaction.model_dump_json())
+        for account_id in (transaction.sender_account_id, transaction.receiver_account_id):
+            if account_id in owners:
+                messages.append((owners[account_id], event))
+
+    if messages:
+        await event_fanout.publish(messages)
+
+
+# Util Function to Push Newly Active Subscriptions to their Owners' Streams and Waiters
+async def publish_subscription_updates(subscriptions: Iterable[SubscriptionResponse]):
+    messages = [(subscription.user_id, StreamEvent("subscription", subscription.model_dump_json()))
+                for subscription in subscriptions]
+    if messages:
+        await event_fanout.publish(messages)
+
+
+# Util Function to Stream a User's Events as Server-Sent Events
+# The Subscription Lives Inside the Generator, so it Ends with the Response.
+async def sse_frames(user_id: UUID) -> AsyncIterator[bytes]:
+    subscriber = event_hub.subscribe(user_id)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await subscriber.next_event(STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+
+            if event is None:
+                if subscriber.evicted:
+                    yield b"event: evicted\ndata: {}\n\n"
+                return
+            yield f"event: {event.kind}\ndata: {event.data}\n\n".encode()
+
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+
+async def _wait_for_disconnect(websocket: WebSocket):
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+# Util Function to Forward a Subscriber's Events to an Accepted WebSocket
+# A Reader Task Notices Disconnects, so Idle Sockets are Released without Waiting for an Event.
+async def serve_websocket(websocket: WebSocket, subscriber: Subscriber):
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            getter = asyncio.create_task(subscriber.queue.get())
+            done, _ = await asyncio.wait({getter, disconnected}, timeout=STREAM_HEARTBEAT_SECONDS,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if disconnected in done:
+                getter.cancel()
+                return
+
+            if getter not in done:
+                getter.cancel()
+                await websocket.send_text('{"event": "heartbeat"}')
+                continue
+
+            event = getter.result()
+            if event is None:
+                code = status.WS_1013_TRY_AGAIN_LATER if subscriber.evicted else status.WS_1001_GOING_AWAY
+                await websocket.close(code=code)
+                return
+            await websocket.send_text(f'{{"event": "{event.kind}", "data": {event.data}}}')
+
+    except WebSocketDisconnect:
+        pass
+
+    finally:
+        disconnected.cancel()
+        event_hub.unsubscribe(subscriber)
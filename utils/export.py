@@ -0,0 +1,63 @@
+from utils.db import ReadSessionLocal
+from utils.history import HISTORY_COLUMNS, account_history_query
+from dotenv import load_dotenv
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator, Optional
+from uuid import UUID
+import csv
+import io
+import json
+import os
+
+load_dotenv()
+
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 1000))
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+# Util Function to Convert a Column Value into its Plain Text Form
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(HISTORY_COLUMNS, map(_plain, row)))) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([list(map(_plain, row)) for row in rows])
+    return buffer.getvalue()
+
+
+# Util Function to Stream an Account's History from a Server-Side Cursor
+# The Request's own Session is Closed before Streaming Starts, so this Opens its own.
+async def stream_account_history(account_id: UUID,
+                                 export_format: str,
+                                 date_from: Optional[datetime] = None,
+                                 date_till: Optional[datetime] = None) -> AsyncIterator[str]:
+    serialize = _csv_chunk if export_format == "csv" else _ndjson_chunk
+    if export_format == "csv":
+        yield ",".join(HISTORY_COLUMNS) + "\r\n"
+
+    stmt = account_history_query(account_id, date_from, date_till)
+    async with ReadSessionLocal() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+
+        async for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            yield serialize(rows)
@@ -0,0 +1,143 @@
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dotenv import load_dotenv
+from time import perf_counter
+from typing import Optional
+import multiprocessing
+import asyncio
+import os
+
+load_dotenv()
+
+# Number of Hashing Processes (0 Runs Hashing on a Thread Pool Instead)
+HASH_POOL_WORKERS = int(os.environ.get("HASH_POOL_WORKERS", os.cpu_count() or 2))
+
+# Maximum Hash/Verify Calls Admitted at Once (Running + Queued) Before Returning 429
+HASH_QUEUE_LIMIT = int(os.environ.get("HASH_QUEUE_LIMIT", 64))
+
+# Passwords per Pool Task when Hashing in Bulk (Small, so a Task Holds a Worker Briefly)
+HASH_BATCH_CHUNK = int(os.environ.get("HASH_BATCH_CHUNK", 4))
+
+# Workers Bulk Hashing may Occupy at Once; the Rest Stay Free for Logins
+HASH_BULK_WORKERS = int(os.environ.get("HASH_BULK_WORKERS", max(HASH_POOL_WORKERS - 1, 1)))
+
+
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Worker Side Functions (Must be Importable for the Process Pool)
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [bcrypt_context.hash(password) for password in passwords]
+
+
+# Bounded Pool that Keeps bcrypt Work off the Event Loop
+class HashingService:
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        # Calls Running at Once; the Thread Pool Fallback Sizes Itself like ThreadPoolExecutor
+        self.pool_size = workers if workers > 0 else min(32, (os.cpu_count() or 1) + 4)
+        self.queue_limit = queue_limit
+        self.executor: Optional[Executor] = None
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self.executor is None:
+            if self.workers > 0:
+                # Spawned Workers do not Inherit the Event Loop or Open Connections
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                   thread_name_prefix="hashing")
+        return self.executor
+
+    async def run(self, func, *args):
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                detail="Authentication Service is Busy, Try Again Later",
+                                headers={"Retry-After": "1"})
+
+        self.pending += 1
+        started = perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+
+        except Exception:
+            self.failed += 1
+            raise
+
+        finally:
+            self.pending -= 1
+
+        # Latency is Averaged over Successful Calls only; Cancelled Calls are not Counted
+        elapsed = perf_counter() - started
+        self.completed += 1
+        self.total_latency += elapsed
+        self.max_latency = max(self.max_latency, elapsed)
+        return result
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pool_size": self.pool_size,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.pending,
+            "queue_depth": max(0, self.pending - self.pool_size),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_latency_ms": (self.total_latency / self.completed * 1000) if self.completed else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+hashing_service = HashingService(HASH_POOL_WORKERS, HASH_QUEUE_LIMIT)
+
+
+# Util Function to Hash a Password on the Hashing Pool
+async def hash_password(password: str) -> str:
+    return await hashing_service.run(_hash, password)
+
+
+# Util Function to Verify a Password against its Hash on the Hashing Pool
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await hashing_service.run(_verify, password, hashed_password)
+
+
+# Util Function to Hash Many Passwords in Parallel across the Hashing Pool
+# At Most HASH_BULK_WORKERS Small Chunks are Queued at a Time, which Leaves at Least one
+# Worker (on Pools of Two or More) to Logins, and Lets them Interleave between Chunks.
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    chunks = [passwords[i:i + HASH_BATCH_CHUNK]
+              for i in range(0, len(passwords), HASH_BATCH_CHUNK)]
+    hashed: list = [None] * len(chunks)
+    semaphore = asyncio.Semaphore(HASH_BULK_WORKERS)
+
+    async def hash_chunk(index: int, chunk: list[str]):
+        async with semaphore:
+            hashed[index] = await hashing_service.run(_hash_many, chunk)
+
+    await asyncio.gather(*(hash_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+    return [value for chunk in hashed for value in chunk]
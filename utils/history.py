@@ -0,0 +1,71 @@
+from sqlalchemy import select, union_all
+from sqlalchemy.orm import aliased
+from schemas.transactions import Transaction
+from utils.pagination import keyset_after
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+
+HISTORY_COLUMNS = (
+    "id",
+    "sender_account_id",
+    "receiver_account_id",
+    "sender_username",
+    "receiver_username",
+    "transfer_amount",
+    "made_at",
+    "status",
+)
+
+
+# The OR over Both Foreign Keys is Split into a UNION ALL of Two Index Range Scans,
+# each Bounded by the Page Window, so Deep Pages do not Sort the Whole History.
+def _account_history(account_id: UUID,
+                     date_from: Optional[datetime],
+                     date_till: Optional[datetime],
+                     cursor: Optional[tuple],
+                     limit: Optional[int],
+                     offset: int):
+    branches = []
+    for column, other_column in ((Transaction.sender_account_id, None),
+                                 (Transaction.receiver_account_id, Transaction.sender_account_id)):
+        stmt = select(Transaction).where(column == account_id)
+
+        # Self-Transfers are Returned Once, from the Sender Side
+        if other_column is not None:
+            stmt = stmt.where(other_column != account_id)
+
+        if date_from:
+            stmt = stmt.where(Transaction.made_at >= date_from)
+        if date_till:
+            stmt = stmt.where(Transaction.made_at <= date_till)
+        if cursor:
+            # The Plain Upper Bound Lets Postgres Prune Partitions Newer than the Cursor
+            stmt = stmt.where(Transaction.made_at <= cursor[0],
+                              keyset_after(Transaction.made_at, Transaction.id, cursor))
+
+        if limit is not None:
+            stmt = stmt.order_by(Transaction.made_at.desc(),
+                                 Transaction.id.desc()).limit(offset + limit)
+
+        branches.append(select(stmt.subquery()))
+
+    return aliased(Transaction, union_all(*branches).subquery())
+
+
+# Util Function to Build an Account's Transaction History Query (Plain Columns, No ORM Objects)
+def account_history_query(account_id: UUID,
+                          date_from: Optional[datetime] = None,
+                          date_till: Optional[datetime] = None,
+                          cursor: Optional[tuple] = None,
+                          limit: Optional[int] = None,
+                          offset: int = 0):
+    history = _account_history(account_id, date_from, date_till, cursor, limit, offset)
+    columns = [getattr(history, name) for name in HISTORY_COLUMNS]
+    stmt = select(*columns).order_by(history.made_at.desc(), history.id.desc())
+
+    if limit is not None:
+        stmt = stmt.offset(offset).limit(limit)
+
+    return stmt
@@ -0,0 +1,169 @@
+from contextvars import ContextVar
+from bisect import bisect_left
+from time import perf_counter
+from typing import Optional
+
+# Upper Bounds of the Latency Histogram Buckets (Seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper Bounds of the Response Size Histogram Buckets (Bytes)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Label for Requests that Matched no Route (Keeps Label Cardinality Bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# Per-Request Accumulator for SQL Work, Reachable from Engine Events
+class RequestContext:
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+current_request: ContextVar[Optional[RequestContext]] = ContextVar("current_request", default=None)
+
+
+# Util Function to Attribute one Executed Statement to the Current Request
+def record_statement(elapsed: float):
+    context = current_request.get()
+    if context is not None:
+        context.statements += 1
+        context.db_time += elapsed
+
+
+# Fixed Bucket Histogram (Buckets are Stored Non-Cumulative and Summed on Render)
+# Metrics are only Touched from the Event Loop Thread, so no Locks are Needed.
+class Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list[str]:
+        lines, cumulative = [], 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+# Aggregates for one (Method, Route Template) Pair
+class RouteMetrics:
+    __slots__ = ("latency", "response_size", "statuses", "statements", "db_time")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.statuses: dict[int, int] = {}
+        self.statements = 0
+        self.db_time = 0.0
+
+
+# Registry of Request Metrics, Rendered in Prometheus Text Format
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+
+    def record(self, method: str, route: str, status_code: int,
+               elapsed: float, size: int, context: RequestContext):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+
+        metrics.latency.observe(elapsed)
+        metrics.response_size.observe(size)
+        metrics.statuses[status_code] = metrics.statuses.get(status_code, 0) + 1
+        metrics.statements += context.statements
+        metrics.db_time += context.db_time
+
+    def render(self) -> str:
+        routes = sorted(self.routes.items())
+        labels = {key: f'method="{key[0]}",route="{key[1]}"' for key, _ in routes}
+
+        lines = ["# HELP http_requests_in_flight Requests Currently being Served.",
+                 "# TYPE http_requests_in_flight gauge",
+                 f"http_requests_in_flight {self.in_flight}",
+                 "# HELP http_requests_total Requests Served, by Route Template and Status.",
+                 "# TYPE http_requests_total counter"]
+        for key, metrics in routes:
+            for status_code, count in sorted(metrics.statuses.items()):
+                lines.append(f'http_requests_total{{{labels[key]},status="{status_code}"}} {count}')
+
+        lines += ["# HELP http_request_duration_seconds Request Latency, by Route Template.",
+                  "# TYPE http_request_duration_seconds histogram"]
+        for key, metrics in routes:
+            lines += metrics.latency.render("http_request_duration_seconds", labels[key])
+
+        lines += ["# HELP http_response_size_bytes Response Body Size, by Route Template.",
+                  "# TYPE http_response_size_bytes histogram"]
+        for key, metrics in routes:
+            lines += metrics.response_size.render("http_response_size_bytes", labels[key])
+
+        lines += ["# HELP http_request_db_statements_total SQL Statements Executed while Serving Requests.",
+                  "# TYPE http_request_db_statements_total counter"]
+        for key, metrics in routes:
+            lines.append(f"http_request_db_statements_total{{{labels[key]}}} {metrics.statements}")
+
+        lines += ["# HELP http_request_db_seconds_total Time Spent in SQL Statements while Serving Requests.",
+                  "# TYPE http_request_db_seconds_total counter"]
+        for key, metrics in routes:
+            lines.append(f"http_request_db_seconds_total{{{labels[key]}}} {metrics.db_time}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+# Pure ASGI Middleware Recording Latency, Response Size and SQL Work per Route Template
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext()
+        token = current_request.set(context)
+        status_code, size = 500, 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        self.registry.in_flight += 1
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+
+        finally:
+            elapsed = perf_counter() - started
+            self.registry.in_flight -= 1
+            current_request.reset(token)
+
+            # The Router Stores the Matched Route in the Scope, so Labels Use the Template
+            route = scope.get("route")
+            self.registry.record(scope["method"],
+                                 getattr(route, "path", UNMATCHED_ROUTE),
+                                 status_code, elapsed, size, context)
@@ -0,0 +1,158 @@
+from sqlalchemy import select, insert, update, func, text, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from schemas.base import Base
+from schemas.schema_version import SchemaVersion
+from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from schemas import roles, users, accounts, transactions, subscriptions, webhook_events  # noqa: F401
+from utils.db import engine
+from utils.partitions import partition_transactions
+from dataclasses import dataclass
+from typing import Callable
+
+# Key of the Postgres Advisory Lock Serializing Migrations across Workers
+MIGRATION_LOCK_KEY = 720_451_016
+
+
+# A Schema Change, Applied once and Recorded in the schema_version Table
+# Upgrades Run Inside the Migration Transaction and must be Safe on a Fresh Baseline.
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _baseline(conn: Connection):
+    Base.metadata.create_all(conn)
+
+
+# Util Function to Build an Upgrade Creating Declared Indexes that are Missing
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection):
+        indexes = {index.name: index
+                   for table in Base.metadata.sorted_tables
+                   for index in table.indexes}
+        for name in names:
+            indexes[name].create(conn, checkfirst=True)
+    return upgrade
+
+
+# Util Function to Build an Upgrade Adding Declared Columns that are Missing
+# A Fresh Baseline Already Creates them, so Existing Columns are Skipped.
+def _add_columns(table_name: str, *names: str) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection):
+        table = Base.metadata.tables[table_name]
+        existing = {column["name"] for column in inspect(conn).get_columns(table_name)}
+        compiler = conn.dialect.ddl_compiler(conn.dialect, None)
+        for name in names:
+            if name not in existing:
+                spec = compiler.get_column_specification(table.c[name])
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {spec}"))
+    return upgrade
+
+
+# Util Function to Build an Upgrade Dropping Indexes that are no Longer Declared
+def _drop_indexes(*names: str) -> Callable[[Connection], None]:
+    def upgrade(conn: Connection):
+        for name in names:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    return upgrade
+
+
+# Ends all but the Latest Active Subscription of each User, then Enforces one Active per User
+def _unique_active_subscription(conn: Connection):
+    duplicated = select(Subscription.user_id).where(
+        Subscription.status == ValidSubscriptionStatus.ACTIVE
+    ).group_by(Subscription.user_id).having(func.count() > 1)
+
+    rows = conn.execute(select(Subscription.id, Subscription.user_id).where(
+        Subscription.status == ValidSubscriptionStatus.ACTIVE,
+        Subscription.user_id.in_(duplicated)
+    ).order_by(Subscription.user_id,
+               Subscription.started_at.desc().nulls_last(),
+               Subscription.id.desc())).all()
+
+    latest, superseded = set(), []
+    for row in rows:
+        if row.user_id in latest:
+            superseded.append(row.id)
+        latest.add(row.user_id)
+
+    if superseded:
+        conn.execute(update(Subscription).where(Subscription.id.in_(superseded)).values(
+            status=ValidSubscriptionStatus.ENDED))
+        print(f"Ended {len(superseded)} Superseded Active Subscriptions")
+
+    _create_indexes("uq_subscriptions_user_id_active")(conn)
+
+
+MIGRATIONS = [
+    Migration(1, "baseline", _baseline),
+    Migration(2, "hot_path_indexes", _create_indexes(
+        "ix_accounts_user_id",
+        "ix_subscriptions_source_id",
+        "ix_subscriptions_user_id_status",
+        # Transaction Foreign Keys are Covered by these Composites (Leading Column)
+        "ix_transactions_sender_made_at",
+        "ix_transactions_receiver_made_at",
+    )),
+    Migration(3, "subscription_search_indexes", _create_indexes(
+        "ix_subscriptions_started_at",
+        "ix_subscriptions_status_started_at",
+        "ix_subscriptions_user_id_started_at",
+        "ix_subscriptions_currency_started_at",
+    )),
+    Migration(4, "unique_active_subscription", _unique_active_subscription),
+    Migration(5, "account_version", _add_columns("accounts", "version")),
+    Migration(6, "partition_transactions", partition_transactions),
+    # Covered by ix_subscriptions_user_id_status and ix_subscriptions_user_id_started_at
+    Migration(7, "drop_subscriptions_user_id_index", _drop_indexes("ix_subscriptions_user_id")),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# Util Function to Read the Applied Schema Version (0 if Never Migrated)
+async def schema_version(async_engine: AsyncEngine = engine) -> int:
+    try:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(select(func.max(SchemaVersion.version)))
+            return result.scalar() or 0
+    except DBAPIError:
+        return 0
+
+
+# Util Function to Bring the Schema to the Latest Version
+# A Current Schema Costs a Single Query; Otherwise Pending Migrations Run in one
+# Transaction, under an Advisory Lock on Postgres so Concurrent Workers Queue Up.
+async def migrate_database(async_engine: AsyncEngine = engine):
+    current = await schema_version(async_engine)
+    if current >= LATEST_VERSION:
+        print(f"Database Schema is Current (Version {current}).")
+        return
+
+    try:
+        async with async_engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"),
+                                   {"key": MIGRATION_LOCK_KEY})
+
+            await conn.run_sync(SchemaVersion.__table__.create, checkfirst=True)
+            current = (await conn.execute(select(func.max(SchemaVersion.version)))).scalar() or 0
+
+            for migration in MIGRATIONS:
+                if migration.version <= current:
+                    continue
+                await conn.run_sync(migration.upgrade)
+                await conn.execute(insert(SchemaVersion).values(version=migration.version,
+                                                                name=migration.name))
+                print(f"Applied Migration {migration.version}: {migration.name}")
+
+    except IntegrityError:
+        # Without Advisory Locks (SQLite), a Concurrent Worker may have Recorded the Versions First
+        if await schema_version(async_engine) < LATEST_VERSION:
+            raise
+
+    print(f"Database Schema Migrated to Version {LATEST_VERSION}.")
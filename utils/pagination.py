@@ -0,0 +1,77 @@
+from fastapi import HTTPException, status
+from sqlalchemy import or_, and_, select, func, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Executable, ClauseElement
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from dotenv import load_dotenv
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+import json
+import os
+
+load_dotenv()
+
+# Rows Counted Exactly for a Search Total, Larger Totals are Estimated
+SEARCH_COUNT_CAP = int(os.environ.get("SEARCH_COUNT_CAP", 10000))
+
+
+# Util Function to Encode a Keyset Position as an Opaque Cursor
+def encode_cursor(position: Optional[datetime], row_id: UUID) -> str:
+    raw = json.dumps([position.isoformat() if position else None, str(row_id)])
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# Util Function to Decode an Opaque Cursor back into its Keyset Position
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, row_id = json.loads(urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(position) if position else None), UUID(row_id)
+
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid Pagination Cursor")
+
+
+# Util Function to Filter Rows Strictly After a Cursor in (position DESC, id DESC) Order
+# With nulls_last, Rows without a Position Follow all Others (position DESC NULLS LAST).
+def keyset_after(position_column, id_column, cursor: tuple[Optional[datetime], UUID],
+                 nulls_last: bool = False):
+    position, row_id = cursor
+    if nulls_last and position is None:
+        return and_(position_column.is_(None), id_column < row_id)
+
+    after = or_(position_column < position,
+                and_(position_column == position, id_column < row_id))
+    return or_(after, position_column.is_(None)) if nulls_last else after
+
+
+# EXPLAIN Wrapper, so the Planner's Row Estimate can be Read for a Statement
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _explain_postgresql(element, compiler, **kwargs):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+# Util Function to Count the Rows of a Query, Exactly up to a Cap
+# Beyond the Cap, Postgres Reports the Planner's Estimate and Other Backends a Lower Bound.
+async def count_rows(db: AsyncSession, stmt: Select, cap: int) -> tuple[int, bool]:
+    window = stmt.order_by(None).limit(cap + 1).subquery()
+    exact = (await db.execute(select(func.count()).select_from(window))).scalar_one()
+    if exact <= cap:
+        return exact, True
+
+    if db.get_bind().dialect.name == "postgresql":
+        plan = (await db.execute(Explain(stmt.order_by(None)))).scalar_one()
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return max(int(plan[0]["Plan"]["Plan Rows"]), exact), False
+
+    return exact, False
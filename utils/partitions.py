@@ -0,0 +1,344 @@
+from sqlalchemy import Table, Column, ForeignKey, Index, MetaData, select, insert, delete, func, text, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.transactions import Transaction
+from schemas import accounts  # noqa: F401  (Target of the Archive Tables' Foreign Keys)
+from utils.db import engine
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from functools import lru_cache
+from typing import Optional
+import asyncio
+import re
+import os
+
+load_dotenv()
+
+# Months of Partitions Kept Ready beyond the Current one
+TRANSACTION_PARTITIONS_AHEAD = int(os.environ.get("TRANSACTION_PARTITIONS_AHEAD", 3))
+
+# Months Kept Online; Older Partitions Move to the Archive Tier (0 Keeps Everything Online)
+TRANSACTION_RETENTION_MONTHS = int(os.environ.get("TRANSACTION_RETENTION_MONTHS", 24))
+TRANSACTION_ARCHIVE_SCHEMA = os.environ.get("TRANSACTION_ARCHIVE_SCHEMA", "archive")
+TRANSACTION_ARCHIVE_TABLESPACE = os.environ.get("TRANSACTION_ARCHIVE_TABLESPACE")
+
+PARTITION_MAINTENANCE_SECONDS = float(os.environ.get("PARTITION_MAINTENANCE_SECONDS", 3600))
+
+# Key of the Postgres Advisory Lock, so one Worker Maintains Partitions at a Time
+PARTITION_LOCK_KEY = 720_451_017
+
+TRANSACTIONS = Transaction.__table__
+DEFAULT_PARTITION = "transactions_default"
+PARTITION_NAME = re.compile(r"^transactions_(\d{4})_(\d{2})$")
+LEGACY_NAME = re.compile(r"^transactions_before_(\d{4})_(\d{2})$")
+ARCHIVE_PREFIX = "transactions_archive_"
+COLUMNS = ", ".join(column.name for column in TRANSACTIONS.columns)
+
+PG_PARTITIONS = text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                     "WHERE i.inhparent = 'transactions'::regclass")
+PG_ARCHIVED = text("SELECT tablename FROM pg_tables WHERE schemaname = :schema "
+                   "AND tablename LIKE 'transactions%'")
+SQLITE_TABLES = text("SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB :pattern")
+
+
+# Util Function to Find the (UTC) Month a Time Falls In
+def month_start(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"transactions_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    match = PARTITION_NAME.match(name)
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc) if match else None
+
+
+# Util Function to Find where a Partition's Range Ends (Exclusive)
+# A Monthly Partition Ends with its Month; a Legacy Partition Holds Everything before the Month it Names.
+def partition_end(name: str) -> Optional[datetime]:
+    month = partition_month(name)
+    if month is not None:
+        return add_months(month, 1)
+    match = LEGACY_NAME.match(name)
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc) if match else None
+
+
+# Archived Month of the Transactions Table, for SQLite
+# Keeps the Columns, Indexes and Foreign Keys (with their ON DELETE) of transactions; SQLite
+# Enforces those only because utils/db.py Turns foreign_keys On for every Connection.
+@lru_cache(maxsize=None)
+def archive_table(name: str) -> Table:
+    table = Table(name, MetaData(), *(Column(column.name, column.type,
+                                             *(ForeignKey(foreign_key.column, ondelete=foreign_key.ondelete)
+                                               for foreign_key in column.foreign_keys),
+                                             primary_key=column.primary_key,
+                                             nullable=column.nullable)
+                                      for column in TRANSACTIONS.columns))
+    for index in TRANSACTIONS.indexes:
+        Index(index.name.replace("transactions", name, 1),
+              *(table.c[column.name] for column in index.columns))
+    return table
+
+
+# Result of one Maintenance Run
+@dataclass
+class PartitionReport:
+    created: list[str] = field(default_factory=list)
+    archived: list[str] = field(default_factory=list)
+
+
+# --- Postgres: Declarative Range Partitions on made_at ---
+
+def _pg_is_partitioned(conn: Connection) -> bool:
+    return conn.execute(text(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass('transactions')")).scalar() == "p"
+
+
+def _pg_partitions(conn: Connection) -> list[str]:
+    return list(conn.execute(PG_PARTITIONS).scalars())
+
+
+def _pg_months(conn: Connection, table: str) -> list[datetime]:
+    rows = conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', made_at AT TIME ZONE 'UTC') FROM {table}")).scalars()
+    return [month.replace(tzinfo=timezone.utc) for month in rows]
+
+
+def _pg_archived(conn: Connection, name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name)"),
+                        {"name": f"{TRANSACTION_ARCHIVE_SCHEMA}.{name}"}).scalar() is not None
+
+
+# Util Function to Move a Month's Rows from one Table into Another
+def _pg_move_rows(conn: Connection, source: str, target: str, month: datetime):
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {source} WHERE made_at >= :lower AND made_at < :upper "
+        f"RETURNING {COLUMNS}) INSERT INTO {target} ({COLUMNS}) SELECT {COLUMNS} FROM moved"),
+        {"lower": month, "upper": add_months(month, 1)})
+
+
+# Rows that Landed in the Default Partition for the Month Move with it, so Attaching cannot Fail
+def _pg_create_partition(conn: Connection, month: datetime):
+    name, upper = partition_name(month), add_months(month, 1)
+    conn.execute(text(f"CREATE TABLE {name} (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    _pg_move_rows(conn, DEFAULT_PARTITION, name, month)
+    conn.execute(text(
+        f"ALTER TABLE transactions ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"))
+
+
+# A Month Archived Before (e.g. then Back-Dated Rows Recreated it) Merges into the Archived Table
+def _pg_archive_partition(conn: Connection, name: str):
+    conn.execute(text(f"ALTER TABLE transactions DETACH PARTITION {name}"))
+    if _pg_archived(conn, name):
+        conn.execute(text(f"INSERT INTO {TRANSACTION_ARCHIVE_SCHEMA}.{name} ({COLUMNS}) "
+                          f"SELECT {COLUMNS} FROM {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        return
+
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TRANSACTION_ARCHIVE_SCHEMA}"))
+    conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {TRANSACTION_ARCHIVE_SCHEMA}"))
+    if TRANSACTION_ARCHIVE_TABLESPACE:
+        conn.execute(text(f"ALTER TABLE {TRANSACTION_ARCHIVE_SCHEMA}.{name} "
+                          f"SET TABLESPACE {TRANSACTION_ARCHIVE_TABLESPACE}"))
+
+
+def _pg_maintain(conn: Connection, current: datetime, horizon: Optional[datetime]) -> PartitionReport:
+    report = PartitionReport()
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF transactions DEFAULT"))
+
+    online = set(_pg_partitions(conn))
+
+    # Months below a Legacy Partition's Bound are Already Covered by it
+    floor = max((partition_end(name) for name in online if LEGACY_NAME.match(name)), default=None)
+    wanted = {add_months(current, ahead) for ahead in range(TRANSACTION_PARTITIONS_AHEAD + 1)}
+    wanted.update(_pg_months(conn, DEFAULT_PARTITION))
+    for month in sorted(wanted):
+        name = partition_name(month)
+        if name in online or (floor is not None and month < floor):
+            continue
+
+        # Back-Dated Rows for a Month Already Archived Go Straight to its Archived Table
+        if horizon is not None and add_months(month, 1) <= horizon and _pg_archived(conn, name):
+            _pg_move_rows(conn, DEFAULT_PARTITION, f"{TRANSACTION_ARCHIVE_SCHEMA}.{name}", month)
+            report.archived.append(name)
+            continue
+
+        _pg_create_partition(conn, month)
+        report.created.append(name)
+        online.add(name)
+
+    if horizon is not None:
+        for name in sorted(online):
+            end = partition_end(name)
+            if end is not None and end <= horizon:
+                _pg_archive_partition(conn, name)
+                report.archived.append(name)
+    return report
+
+
+# Turns an Unpartitioned Table (Created before Migration 6) into a Partitioned one.
+# The Old Table is Attached Whole as transactions_before_YYYY_MM, Covering Everything up to the
+# Month after its Newest Row, so no Rows are Copied: Attaching Validates the Range and Builds the
+# (id, made_at) Key, and the Existing History Indexes are Reused. Maintenance Archives the
+# Legacy Partition once its Newest Month Passes the Retention Horizon.
+def _pg_convert(conn: Connection):
+    newest = conn.execute(text("SELECT max(made_at) FROM transactions")).scalar()
+    if newest is None:
+        conn.execute(text("DROP TABLE transactions"))
+        TRANSACTIONS.create(conn)
+        return
+
+    upper = add_months(month_start(newest), 1)
+    legacy = f"transactions_before_{upper:%Y_%m}"
+    conn.execute(text(f"ALTER TABLE transactions RENAME TO {legacy}"))
+
+    inspector = inspect(conn)
+    primary_key = inspector.get_pk_constraint(legacy).get("name")
+    if primary_key:
+        conn.execute(text(f"ALTER TABLE {legacy} DROP CONSTRAINT {primary_key}"))
+    # Its Index and Key Names Move Aside for the Parent's, which Take them Over on Attach
+    for index in inspector.get_indexes(legacy):
+        conn.execute(text(f"ALTER INDEX {index['name']} "
+                          f"RENAME TO {index['name'].replace('transactions', legacy, 1)}"))
+    for foreign_key in inspector.get_foreign_keys(legacy):
+        conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {foreign_key['name']} "
+                          f"TO {foreign_key['name'].replace('transactions', legacy, 1)}"))
+
+    TRANSACTIONS.create(conn)
+    conn.execute(text(f"ALTER TABLE transactions ATTACH PARTITION {legacy} "
+                      f"FOR VALUES FROM (MINVALUE) TO ('{upper.isoformat()}')"))
+
+
+# --- SQLite: Months Past Retention Move out of the Transactions Table into Archive Tables ---
+
+def _sqlite_maintain(conn: Connection, horizon: Optional[datetime]) -> PartitionReport:
+    report = PartitionReport()
+    if horizon is None:
+        return report
+
+    while True:
+        oldest = conn.execute(select(func.min(TRANSACTIONS.c.made_at)).where(
+            TRANSACTIONS.c.made_at < horizon)).scalar()
+        if oldest is None:
+            break
+
+        # Appends, so Back-Dated Rows for a Month Archived Before Join its Table
+        month = month_start(oldest if oldest.tzinfo else oldest.replace(tzinfo=timezone.utc))
+        archive = archive_table(f"{ARCHIVE_PREFIX}{month:%Y_%m}")
+        archive.create(conn, checkfirst=True)
+        in_month = (TRANSACTIONS.c.made_at >= month, TRANSACTIONS.c.made_at < add_months(month, 1))
+        conn.execute(insert(archive).from_select([column.name for column in TRANSACTIONS.columns],
+                                                 select(TRANSACTIONS).where(*in_month)))
+        conn.execute(delete(TRANSACTIONS).where(*in_month))
+        report.archived.append(archive.name)
+    return report
+
+
+# Util Function to Create Upcoming Partitions and Archive those Past the Retention Horizon
+# Postgres Keeps Monthly Range Partitions of transactions Ready TRANSACTION_PARTITIONS_AHEAD
+# Months Ahead and Detaches Old ones into the Archive Schema. SQLite has no Partitioning, so
+# Months Past Retention are Moved into transactions_archive_YYYY_MM Tables; Everything Newer
+# Stays in transactions, where the Account Relationships and History Reads See it.
+def maintain_partitions(conn: Connection, now: Optional[datetime] = None) -> PartitionReport:
+    current = month_start(now or datetime.now(timezone.utc))
+    horizon = add_months(current, -TRANSACTION_RETENTION_MONTHS) if TRANSACTION_RETENTION_MONTHS > 0 else None
+
+    if conn.dialect.name == "postgresql":
+        return _pg_maintain(conn, current, horizon)
+    if conn.dialect.name == "sqlite":
+        return _sqlite_maintain(conn, horizon)
+    return PartitionReport()
+
+
+# Migration Step: Partition an Existing Postgres Table, then Run the First Maintenance
+def partition_transactions(conn: Connection):
+    if conn.dialect.name == "postgresql" and not _pg_is_partitioned(conn):
+        _pg_convert(conn)
+    maintain_partitions(conn)
+
+
+# Background Task Running the Partition Maintenance on an Interval
+class PartitionMaintainer:
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.created: list[str] = []
+        self.archived: list[str] = []
+        self.last_run_at: Optional[datetime] = None
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failures += 1
+                print(f"Partition Maintenance Failed: {str(e)}")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def run_once(self) -> Optional[PartitionReport]:
+        async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                locked = await conn.execute(text("SELECT pg_try_advisory_xact_lock(:key)"),
+                                            {"key": PARTITION_LOCK_KEY})
+                if not locked.scalar():
+                    return None
+            report = await conn.run_sync(maintain_partitions)
+
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.created.extend(report.created)
+        self.archived.extend(report.archived)
+        for name in report.created:
+            print(f"Created Transaction Partition {name}")
+        for name in report.archived:
+            print(f"Archived Transaction Partition {name}")
+        return report
+
+    async def metrics(self, db: AsyncSession) -> dict:
+        if engine.dialect.name == "postgresql":
+            online = (await db.execute(PG_PARTITIONS)).scalars().all()
+            archived = (await db.execute(PG_ARCHIVED, {"schema": TRANSACTION_ARCHIVE_SCHEMA})).scalars().all()
+        else:
+            online = [TRANSACTIONS.name]
+            archived = (await db.execute(SQLITE_TABLES, {"pattern": ARCHIVE_PREFIX + "*"})).scalars().all()
+
+        return {
+            "online": sorted(online),
+            "archived": sorted(archived),
+            "partitions_ahead": TRANSACTION_PARTITIONS_AHEAD,
+            "retention_months": TRANSACTION_RETENTION_MONTHS,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at,
+            "created": self.created,
+            "archived_by_worker": self.archived,
+        }
+
+
+partition_maintainer = PartitionMaintainer(PARTITION_MAINTENANCE_SECONDS)
@@ -0,0 +1,180 @@
+from fastapi import Request, HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import select, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.users import User
+from validations.users import UserRequest, BulkUserError, BulkUserResponse
+from utils.hashing import hash_passwords
+from utils.roles import role_registry
+from dotenv import load_dotenv
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import AsyncIterator
+from uuid import uuid4
+import json
+import os
+
+load_dotenv()
+
+# Maximum Rows Accepted in one Bulk Provisioning Request
+# Every Row Costs a bcrypt Hash, so this Bounds how Long one Request Holds the Hashing Pool.
+BULK_USER_MAX_ROWS = int(os.environ.get("BULK_USER_MAX_ROWS", 1000))
+
+# Rows per Uniqueness Lookup and per Multi-Row INSERT (Keeps Bind Parameters under Driver Limits)
+BULK_USER_CHUNK_SIZE = int(os.environ.get("BULK_USER_CHUNK_SIZE", 1000))
+
+
+def _validation_detail(error: ValidationError) -> str:
+    details = []
+    for item in error.errors():
+        location = ".".join(str(part) for part in item["loc"])
+        details.append(f"{location}: {item['msg']}" if location else item["msg"])
+    return "; ".join(details)
+
+
+# Util Function to Read Raw Rows from a JSON Array or an NDJSON Stream
+async def read_user_rows(request: Request) -> AsyncIterator[tuple[int, object]]:
+    content_type = request.headers.get("content-type", "")
+
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        index, buffer = 0, b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, line
+                    index += 1
+        if buffer.strip():
+            yield index, buffer
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Request Body is not Valid JSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Request Body must be a JSON Array of Users")
+    for index, row in enumerate(rows):
+        yield index, row
+
+
+# Util Function to Validate Rows, Dropping those Invalid or Duplicated within the Batch
+async def parse_user_rows(request: Request,
+                          errors: list[BulkUserError]) -> list[tuple[int, UserRequest]]:
+    accepted: list[tuple[int, UserRequest]] = []
+    usernames, emails = set(), set()
+
+    async for index, row in read_user_rows(request):
+        if index >= BULK_USER_MAX_ROWS:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                detail=f"Batch Exceeds {BULK_USER_MAX_ROWS} Users")
+        try:
+            user = (UserRequest.model_validate_json(row) if isinstance(row, bytes)
+                    else UserRequest.model_validate(row))
+        except ValidationError as e:
+            errors.append(BulkUserError(index=index, detail=_validation_detail(e)))
+            continue
+
+        if not role_registry.has_role_id(user.role_id):
+            detail = "Invalid Role ID"
+        elif user.username in usernames:
+            detail = "Duplicate Username in Batch"
+        elif user.email in emails:
+            detail = "Duplicate Email in Batch"
+        else:
+            usernames.add(user.username)
+            emails.add(user.email)
+            accepted.append((index, user))
+            continue
+        errors.append(BulkUserError(index=index, username=user.username, detail=detail))
+
+    return accepted
+
+
+# Util Function to Drop Rows whose Username or Email Already Exists (one Query per Chunk)
+async def filter_existing_users(db: AsyncSession,
+                                rows: list[tuple[int, UserRequest]],
+                                errors: list[BulkUserError]) -> list[tuple[int, UserRequest]]:
+    taken_usernames, taken_emails = set(), set()
+    for start in range(0, len(rows), BULK_USER_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_USER_CHUNK_SIZE]
+        stmt = select(User.username, User.email).where(or_(
+            User.username.in_([user.username for _, user in chunk]),
+            User.email.in_([user.email for _, user in chunk])))
+        for username, email in (await db.execute(stmt)).all():
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+    fresh = []
+    for index, user in rows:
+        if user.username in taken_usernames:
+            errors.append(BulkUserError(index=index, username=user.username,
+                                        detail="Username Already Exists"))
+        elif user.email in taken_emails:
+            errors.append(BulkUserError(index=index, username=user.username,
+                                        detail="Email Already Exists"))
+        else:
+            fresh.append((index, user))
+    return fresh
+
+
+# Util Function to Insert Users with one Multi-Row INSERT per Chunk
+# A Chunk that Hits a Constraint (a Concurrent Insert) is Retried Row by Row.
+async def insert_users(db: AsyncSession,
+                       rows: list[tuple[int, dict]],
+                       errors: list[BulkUserError]) -> int:
+    created = 0
+    for start in range(0, len(rows), BULK_USER_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_USER_CHUNK_SIZE]
+        try:
+            await db.execute(insert(User), [values for _, values in chunk])
+            await db.commit()
+            created += len(chunk)
+            continue
+        except IntegrityError:
+            await db.rollback()
+
+        for index, values in chunk:
+            try:
+                await db.execute(insert(User), [values])
+                await db.commit()
+                created += 1
+            except IntegrityError:
+                await db.rollback()
+                errors.append(BulkUserError(index=index, username=values["username"],
+                                            detail="Username or Email Already Exists"))
+    return created
+
+
+# Util Function to Provision a Batch of Users and Report Throughput
+async def provision_users(db: AsyncSession, request: Request) -> BulkUserResponse:
+    started = perf_counter()
+    errors: list[BulkUserError] = []
+
+    rows = await parse_user_rows(request, errors)
+    rows = await filter_existing_users(db, rows, errors)
+
+    hashed = await hash_passwords([user.password for _, user in rows])
+    now = datetime.now(timezone.utc)
+    values = [(index, {"id": uuid4(),
+                       "username": user.username,
+                       "email": user.email,
+                       "password": password,
+                       "role_id": user.role_id,
+                       "created_at": now,
+                       "updated_at": now})
+              for (index, user), password in zip(rows, hashed)]
+
+    created = await insert_users(db, values, errors)
+    elapsed = perf_counter() - started
+
+    errors.sort(key=lambda error: error.index)
+    return BulkUserResponse(created=created,
+                            failed=len(errors),
+                            elapsed_seconds=elapsed,
+                            users_per_second=created / elapsed if elapsed else 0.0,
+                            errors=errors)
@@ -0,0 +1,247 @@
+from fastapi import HTTPException, Request, status
+from fastapi.security.utils import get_authorization_scheme_param
+from utils.auth import decode_token
+from utils.resp import RespClient, RespError
+from collections import OrderedDict
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from typing import Optional
+import asyncio
+import math
+import time
+import os
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# Shared RESP Server (e.g. redis://127.0.0.1:6390), Unset Counts per Worker Process
+RATE_LIMIT_URL = os.environ.get("RATE_LIMIT_URL")
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", 100000))
+
+# Key Clients by the First X-Forwarded-For Address; Enable Only Behind a Trusted Proxy
+RATE_LIMIT_TRUST_PROXY = os.environ.get("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+
+# Backend Failures Let the Request Through: the Limiter Must not Take the API Down
+BACKEND_ERRORS = (OSError, EOFError, RespError, asyncio.TimeoutError, ValueError)
+
+
+# At Most `limit` Requests per `window_seconds` for each Value of `key`
+# Keys: "ip" (Client Address), "user" (Token Subject, the Address when Unauthenticated)
+# and "username" (the Login Form Field).
+@dataclass(frozen=True, slots=True)
+class RatePolicy:
+    key: str
+    limit: int
+    window_seconds: float
+
+
+# Util Function to Parse a Policy Override, e.g. "ip=30/60,username=10/300"
+def parse_policies(value: str) -> tuple[RatePolicy, ...]:
+    policies = []
+    for item in value.split(","):
+        key, rule = item.strip().split("=")
+        limit, window = rule.split("/")
+        policies.append(RatePolicy(key=key.strip(), limit=int(limit), window_seconds=float(window)))
+    return tuple(policies)
+
+
+# Every Limited Route and its Policies; a Request has to Pass them All.
+# Each Entry can be Overridden with RATE_LIMIT_<ROUTE>, e.g. RATE_LIMIT_LOGIN="ip=30/60".
+RATE_LIMIT_POLICIES: dict[str, tuple[RatePolicy, ...]] = {
+    "login": (RatePolicy("ip", 30, 60), RatePolicy("username", 10, 300)),
+    "register": (RatePolicy("ip", 10, 3600),),
+    "transfer": (RatePolicy("user", 60, 60),),
+    "transfer_batch": (RatePolicy("user", 10, 60),),
+    "checkout": (RatePolicy("user", 5, 60),),
+}
+for _route in RATE_LIMIT_POLICIES:
+    _override = os.environ.get(f"RATE_LIMIT_{_route.upper()}")
+    if _override:
+        RATE_LIMIT_POLICIES[_route] = parse_policies(_override)
+
+
+# Util Function to Estimate a Sliding Window from the Current and Previous Fixed Windows
+# Returns the Seconds to Wait, or None when the Request is Within the Limit.
+def retry_after(policy: RatePolicy, current: int, previous: int, now: float) -> Optional[int]:
+    window = policy.window_seconds
+    elapsed = (now % window) / window
+    if previous * (1 - elapsed) + current <= policy.limit:
+        return None
+
+    # Wait until the Retry Itself Fits: the Previous Window's Weight Decays Through this One,
+    # and once this Window is Full the Current Count Decays Through the Next
+    if current < policy.limit:
+        wait = (1 - (policy.limit - current - 1) / previous - elapsed) * window
+    else:
+        wait = (1 - elapsed + 1 - (policy.limit - 1) / current) * window
+
+    # Rounded First, so Float Error Cannot Add a Whole Second to an Exact Wait
+    return max(1, math.ceil(round(wait, 6)))
+
+
+# Per-Process Counters, the Default Backend
+# Entries are (Window Index, Count, Previous Count) in an LRU; an Entry Two Windows Old
+# Counts Nothing, so Expired Entries are Swept from the Cold End on each Check.
+class MemoryRateLimitBackend:
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.entries: OrderedDict[str, tuple[int, int, int, float]] = OrderedDict()
+
+    async def hit(self, key: str, policy: RatePolicy, now: float) -> tuple[int, int]:
+        window = int(now // policy.window_seconds)
+        index, current, previous, _ = self.entries.get(key, (window, 0, 0, 0.0))
+        if index != window:
+            previous = current if index == window - 1 else 0
+            current = 0
+
+        current += 1
+        self.entries[key] = (window, current, previous, (window + 2) * policy.window_seconds)
+        self.entries.move_to_end(key)
+        self._sweep(now)
+        return current, previous
+
+    def _sweep(self, now: float):
+        while self.entries:
+            key, (_, _, _, expires_at) = next(iter(self.entries.items()))
+            if expires_at > now and len(self.entries) <= self.max_keys:
+                return
+            del self.entries[key]
+
+    def size(self) -> int:
+        return len(self.entries)
+
+
+# Shared Counters on a RESP Server: one Pipelined MULTI/EXEC per Policy
+# INCR is Atomic, so Concurrent Workers Never Retry; Keys Expire after Two Windows.
+class RespRateLimitBackend:
+    name = "resp"
+
+    def __init__(self, client: RespClient):
+        self.client = client
+
+    async def hit(self, key: str, policy: RatePolicy, now: float) -> tuple[int, int]:
+        window = int(now // policy.window_seconds)
+        replies = await self.client.pipeline(
+            ("MULTI",),
+            ("INCR", f"ratelimit:{key}:{window}"),
+            ("PEXPIRE", f"ratelimit:{key}:{window}", int(policy.window_seconds * 2000)),
+            ("GET", f"ratelimit:{key}:{window - 1}"),
+            ("EXEC",))
+
+        results = replies[-1]
+        if not isinstance(results, list) or any(isinstance(result, RespError) for result in results):
+            raise RespError(f"Rate Limit Update Failed: {results!r}")
+        current, _, previous = results
+        return current, int(previous or 0)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+# Applies the Configured Policies, Counting Allowed and Rejected Requests per Route
+# Rejected Attempts Count too, so a Client that Keeps Hammering Stays Limited until it Backs Off.
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+        self.allowed: dict[str, int] = {route: 0 for route in RATE_LIMIT_POLICIES}
+        self.rejected: dict[str, int] = {route: 0 for route in RATE_LIMIT_POLICIES}
+        self.errors = 0
+
+    async def check(self, route: str, keys: list[tuple[RatePolicy, str]]) -> Optional[int]:
+        now = time.time()
+        wait = None
+        for policy, value in keys:
+            try:
+                current, previous = await self.backend.hit(f"{route}:{policy.key}:{value}", policy, now)
+            except BACKEND_ERRORS as e:
+                self.errors += 1
+                print(f"Rate Limit Check Failed: {str(e)}")
+                continue
+
+            policy_wait = retry_after(policy, current, previous, now)
+            if policy_wait is not None:
+                wait = max(wait or 0, policy_wait)
+
+        if wait is None:
+            self.allowed[route] += 1
+        else:
+            self.rejected[route] += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "backend": self.backend.name,
+            "size": self.backend.size(),
+            "errors": self.errors,
+            "routes": {
+                route: {
+                    "policies": [f"{policy.key}={policy.limit}/{policy.window_seconds:g}s"
+                                 for policy in policies],
+                    "allowed": self.allowed[route],
+                    "rejected": self.rejected[route],
+                }
+                for route, policies in RATE_LIMIT_POLICIES.items()
+            },
+        }
+
+
+rate_limiter = RateLimiter(RespRateLimitBackend(RespClient(RATE_LIMIT_URL))
+                           if RATE_LIMIT_URL else MemoryRateLimitBackend(RATE_LIMIT_MAX_KEYS))
+
+
+# Util Function to Find the Client Address a Request is Counted Against
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def _key_value(request: Request, key: str) -> Optional[str]:
+    if key == "ip":
+        return client_ip(request)
+
+    if key == "user":
+        scheme, token = get_authorization_scheme_param(request.headers.get("authorization"))
+        if scheme.lower() == "bearer" and token:
+            try:
+                return str(decode_token(token).id)
+            except HTTPException:
+                pass
+        return f"ip:{client_ip(request)}"
+
+    if key == "username":
+        username = (await request.form()).get("username")
+        return username.strip().lower() if isinstance(username, str) and username.strip() else None
+
+    raise ValueError(f"Unknown Rate Limit Key '{key}'")
+
+
+# Util Function to Build a Route's Rate Limit Dependency
+# List it in the Route Decorator's `dependencies`, which FastAPI Resolves before the
+# Endpoint's Parameters, so a Rejected Request never Opens a Session or Hashes a Password.
+def rate_limit(route: str):
+    policies = RATE_LIMIT_POLICIES[route]
+
+    async def rate_limit_dependency(request: Request):
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        keys = []
+        for policy in policies:
+            value = await _key_value(request, policy.key)
+            if value is not None:
+                keys.append((policy, value))
+
+        wait = await rate_limiter.check(route, keys)
+        if wait is not None:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                detail="Too Many Requests, Try Again Later",
+                                headers={"Retry-After": str(wait)})
+
+    return rate_limit_dependency
@@ -0,0 +1,130 @@
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from urllib.parse import urlparse
+from typing import Any
+import asyncio
+import os
+
+load_dotenv()
+
+# Per-Command Timeout, so a Slow or Missing Server Degrades to a Cache Miss
+RESP_TIMEOUT_SECONDS = float(os.environ.get("RESP_TIMEOUT_SECONDS", 0.5))
+RESP_MAX_CONNECTIONS = int(os.environ.get("RESP_MAX_CONNECTIONS", 32))
+
+
+class RespError(Exception):
+    pass
+
+
+# Util Function to Encode a Command as a RESP Array of Bulk Strings
+def encode_command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+# Util Function to Read one Reply (Errors are Returned, not Raised, so EXEC Results Keep their Place)
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("RESP Server Closed the Connection")
+
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+
+    raise RespError(f"Unexpected RESP Reply: {line!r}")
+
+
+# One Connection to a RESP Server
+class RespConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "RespConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def send(self, *args):
+        self.writer.write(encode_command(*args))
+        await self.writer.drain()
+
+    async def read(self) -> Any:
+        return await read_reply(self.reader)
+
+    async def execute(self, *args) -> Any:
+        await self.send(*args)
+        reply = await self.read()
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    # Util Function to Send Several Commands in one Write and Read their Replies in Order
+    async def pipeline(self, *commands) -> list:
+        self.writer.write(b"".join(encode_command(*command) for command in commands))
+        await self.writer.drain()
+        replies = [await self.read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    def close(self):
+        self.writer.close()
+
+
+# Pooled Client for a RESP (Redis Protocol) Server, e.g. redis://127.0.0.1:6390
+class RespClient:
+    def __init__(self, url: str, max_connections: int = RESP_MAX_CONNECTIONS,
+                 timeout: float = RESP_TIMEOUT_SECONDS):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle: list[RespConnection] = []
+
+    # Borrow a Connection for Several Commands (e.g. WATCH ... EXEC); Broken Ones are Dropped
+    @asynccontextmanager
+    async def connection(self):
+        async with self.slots:
+            conn = self.idle.pop() if self.idle else await asyncio.wait_for(
+                RespConnection.open(self.host, self.port), self.timeout)
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self.idle.append(conn)
+
+    async def execute(self, *args) -> Any:
+        async with self.connection() as conn:
+            return await asyncio.wait_for(conn.execute(*args), self.timeout)
+
+    async def pipeline(self, *commands) -> list:
+        async with self.connection() as conn:
+            return await asyncio.wait_for(conn.pipeline(*commands), self.timeout)
+
+    async def close(self):
+        while self.idle:
+            self.idle.pop().close()
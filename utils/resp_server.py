@@ -0,0 +1,260 @@
+"""Local RESP (Redis Protocol) Stand-In: python -m utils.resp_server --port 6390
+
+Holds Keys in Memory and Serves the Commands the Shared Caches Use, so Several
+Workers can Share State without a Redis Install. Not Durable, not for Production.
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.resp import RespError, read_reply
+from time import monotonic
+from typing import Any, Optional
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-%s\r\n" % str(value).encode()
+    if isinstance(value, bool):
+        return b":%d\r\n" % int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, SimpleString):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    if isinstance(value, str):
+        value = value.encode()
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class SimpleString(str):
+    pass
+
+
+OK = SimpleString("OK")
+QUEUED = SimpleString("QUEUED")
+
+# Commands Allowed Inside MULTI (Connection State Commands are not)
+TRANSACTION_COMMANDS = {"GET", "SET", "DEL", "EXISTS", "INCR", "PEXPIRE", "PTTL"}
+
+
+# Commands Allowed on a Connection in Subscribe Mode
+SUBSCRIBER_COMMANDS = {"SUBSCRIBE", "UNSUBSCRIBE", "PING"}
+
+
+# Several Top-Level Replies to one Command (e.g. SUBSCRIBE to Many Channels)
+class Replies(list):
+    pass
+
+
+# Per-Connection Transaction and Subscription State
+class Session:
+    def __init__(self, writer: Optional[asyncio.StreamWriter] = None):
+        self.writer = writer
+        self.watched: dict[bytes, int] = {}
+        self.queued: Optional[list[list[bytes]]] = None
+        self.channels: set[bytes] = set()
+
+
+# In-Memory Keyspace with Lazy Expiry and Per-Key Revisions for WATCH
+class RespServer:
+    def __init__(self):
+        self.values: dict[bytes, bytes] = {}
+        self.expires: dict[bytes, float] = {}
+        self.revisions: dict[bytes, int] = {}
+        self.revision = 0
+        self.subscribers: dict[bytes, set[Session]] = {}
+
+    def _alive(self, key: bytes) -> bool:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= monotonic():
+            self._delete(key)
+        return key in self.values
+
+    def _touch(self, key: bytes):
+        self.revision += 1
+        self.revisions[key] = self.revision
+
+    def _delete(self, key: bytes) -> bool:
+        self.expires.pop(key, None)
+        if self.values.pop(key, None) is None:
+            return False
+        self._touch(key)
+        return True
+
+    def cmd_ping(self, session: Session, *args):
+        return args[0] if args else SimpleString("PONG")
+
+    def cmd_get(self, session: Session, key: bytes):
+        return self.values[key] if self._alive(key) else None
+
+    def cmd_set(self, session: Session, key: bytes, value: bytes, *options: bytes):
+        options = [option.upper() for option in options]
+        if b"NX" in options and self._alive(key):
+            return None
+
+        self.values[key] = value
+        self.expires.pop(key, None)
+        for flag, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if flag in options:
+                self.expires[key] = monotonic() + float(options[options.index(flag) + 1]) * scale
+        self._touch(key)
+        return OK
+
+    def cmd_del(self, session: Session, *keys: bytes):
+        return sum(self._alive(key) and self._delete(key) for key in keys)
+
+    def cmd_exists(self, session: Session, *keys: bytes):
+        return sum(self._alive(key) for key in keys)
+
+    def cmd_incr(self, session: Session, key: bytes):
+        value = int(self.values[key]) + 1 if self._alive(key) else 1
+        self.values[key] = b"%d" % value
+        self._touch(key)
+        return value
+
+    def cmd_pexpire(self, session: Session, key: bytes, milliseconds: bytes):
+        if not self._alive(key):
+            return 0
+        self.expires[key] = monotonic() + int(milliseconds) / 1000
+        return 1
+
+    def cmd_pttl(self, session: Session, key: bytes):
+        if not self._alive(key):
+            return -2
+        expires_at = self.expires.get(key)
+        return -1 if expires_at is None else int((expires_at - monotonic()) * 1000)
+
+    def cmd_flushall(self, session: Session):
+        for key in list(self.values):
+            self._delete(key)
+        return OK
+
+    def cmd_dbsize(self, session: Session):
+        return sum(self._alive(key) for key in list(self.values))
+
+    def cmd_watch(self, session: Session, *keys: bytes):
+        for key in keys:
+            self._alive(key)
+            session.watched[key] = self.revisions.get(key, 0)
+        return OK
+
+    def cmd_unwatch(self, session: Session):
+        session.watched.clear()
+        return OK
+
+    def cmd_multi(self, session: Session):
+        if session.queued is not None:
+            return RespError("ERR MULTI Calls can not be Nested")
+        session.queued = []
+        return OK
+
+    def cmd_discard(self, session: Session):
+        if session.queued is None:
+            return RespError("ERR DISCARD without MULTI")
+        session.queued = None
+        session.watched.clear()
+        return OK
+
+    # Queued Commands Run Back to Back on the Event Loop, so EXEC is Atomic
+    def cmd_exec(self, session: Session):
+        if session.queued is None:
+            return RespError("ERR EXEC without MULTI")
+
+        queued, session.queued = session.queued, None
+        conflicted = any(self.revisions.get(key, 0) != revision
+                         for key, revision in session.watched.items())
+        session.watched.clear()
+        if conflicted:
+            return None
+        return [self.dispatch(session, command) for command in queued]
+
+    # Messages are Written Straight to each Subscriber's Buffer, Publishers Never Wait
+    def cmd_publish(self, session: Session, channel: bytes, message: bytes):
+        receivers = self.subscribers.get(channel, ())
+        frame = encode_reply([b"message", channel, message])
+        for receiver in receivers:
+            receiver.writer.write(frame)
+        return len(receivers)
+
+    def cmd_subscribe(self, session: Session, *channels: bytes):
+        if not channels:
+            raise ValueError
+        replies = Replies()
+        for channel in channels:
+            self.subscribers.setdefault(channel, set()).add(session)
+            session.channels.add(channel)
+            replies.append([b"subscribe", channel, len(session.channels)])
+        return replies
+
+    def cmd_unsubscribe(self, session: Session, *channels: bytes):
+        replies = Replies()
+        for channel in channels or list(session.channels):
+            self.subscribers.get(channel, set()).discard(session)
+            session.channels.discard(channel)
+            replies.append([b"unsubscribe", channel, len(session.channels)])
+        return replies
+
+    def dispatch(self, session: Session, command: list[bytes]) -> Any:
+        name = command[0].decode().upper()
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return RespError(f"ERR Unknown Command '{name}'")
+
+        if session.channels and name not in SUBSCRIBER_COMMANDS:
+            return RespError(f"ERR Command '{name}' not Allowed in Subscribe Mode")
+
+        if session.queued is not None and name not in ("EXEC", "DISCARD", "MULTI"):
+            if name not in TRANSACTION_COMMANDS:
+                return RespError(f"ERR Command '{name}' not Allowed in MULTI")
+            session.queued.append(command)
+            return QUEUED
+
+        try:
+            return handler(session, *command[1:])
+        except (TypeError, ValueError, IndexError):
+            return RespError(f"ERR Wrong Arguments for '{name}'")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = Session(writer)
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    writer.write(encode_reply(RespError("ERR Protocol Error")))
+                    break
+
+                reply = self.dispatch(session, command)
+                for item in reply if isinstance(reply, Replies) else [reply]:
+                    writer.write(encode_reply(item))
+                await writer.drain()
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.cmd_unsubscribe(session)
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+
+async def main(args: argparse.Namespace):
+    server = await RespServer().serve(args.host, args.port)
+    print(f"RESP Stand-In Listening on {args.host}:{args.port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m utils.resp_server",
+                                     description="In-Memory RESP Server for Local Multi-Worker Setups")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    asyncio.run(main(parser.parse_args()))
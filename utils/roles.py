@@ -0,0 +1,51 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.roles import Role
+from utils.db import AsyncSessionLocal
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+
+# Immutable Snapshot of the Roles Table
+@dataclass(frozen=True, slots=True)
+class RoleSnapshot:
+    levels: Mapping[str, int] = field(default_factory=lambda: MappingProxyType({}))
+    positions: Mapping[int, str] = field(default_factory=lambda: MappingProxyType({}))
+    ids_by_level: Mapping[int, int] = field(default_factory=lambda: MappingProxyType({}))
+
+
+# In-Memory Role Registry, so Access Checks Need no Database Round Trip
+# Reloads Build a Fresh Snapshot and Swap it in with a Single Assignment.
+class RoleRegistry:
+    def __init__(self):
+        self.snapshot = RoleSnapshot()
+
+    async def load(self, db: Optional[AsyncSession] = None):
+        if db is None:
+            async with AsyncSessionLocal() as session:
+                return await self.load(session)
+
+        result = await db.execute(select(Role.id, Role.level, Role.position))
+        rows = result.all()
+
+        self.snapshot = RoleSnapshot(
+            levels=MappingProxyType({row.position.value: row.level for row in rows}),
+            positions=MappingProxyType({row.id: row.position.value for row in rows}),
+            ids_by_level=MappingProxyType({row.level: row.id for row in rows}),
+        )
+
+    def level_of(self, position: Optional[str]) -> Optional[int]:
+        return self.snapshot.levels.get(position)
+
+    def position_of(self, role_id: Optional[int]) -> Optional[str]:
+        return self.snapshot.positions.get(role_id)
+
+    def role_id_for_level(self, level: int) -> Optional[int]:
+        return self.snapshot.ids_by_level.get(level)
+
+    def has_role_id(self, role_id: int) -> bool:
+        return role_id in self.snapshot.positions
+
+
+role_registry = RoleRegistry()
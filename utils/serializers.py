@@ -0,0 +1,29 @@
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+# Response that Sends Already Serialized JSON Bytes Untouched
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+
+# Util Function to Get the Cached Adapter Validating and Dumping a List of a Model
+@lru_cache(maxsize=None)
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[model])
+
+
+# Util Function to Select Exactly the Columns a Response Model Reads
+def model_columns(entity, model: type[BaseModel]) -> list:
+    return [getattr(entity, name) for name in model.model_fields]
+
+
+# Util Function to Validate Result Rows in one Batch and Return them as JSON Bytes
+# Rows are Read by Attribute, so Core Rows Need no Intermediate Dicts or ORM Objects.
+def rows_response(rows: Iterable, model: type[BaseModel],
+                  headers: Optional[dict] = None) -> JSONBytesResponse:
+    adapter = list_adapter(model)
+    items = adapter.validate_python(rows, from_attributes=True)
+    return JSONBytesResponse(adapter.dump_json(items), headers=headers)
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from functools import partial
+from time import monotonic
+from typing import Optional
+import asyncio
+import stripe
+import os
+
+load_dotenv()
+
+STRIPE_MAX_CONCURRENCY = int(os.environ.get("STRIPE_MAX_CONCURRENCY", 16))
+STRIPE_TIMEOUT_SECONDS = float(os.environ.get("STRIPE_TIMEOUT_SECONDS", 10))
+STRIPE_BREAKER_THRESHOLD = int(os.environ.get("STRIPE_BREAKER_THRESHOLD", 5))
+STRIPE_BREAKER_COOLDOWN = float(os.environ.get("STRIPE_BREAKER_COOLDOWN", 30))
+
+stripe.api_key = os.getenv("STRIPE_SECRET_KEY")
+
+# Point the Stripe Client at a Local Stub (e.g. stripe-mock) when Set
+if os.getenv("STRIPE_API_BASE"):
+    stripe.api_base = os.getenv("STRIPE_API_BASE")
+
+# Thread-Local Keep-Alive Sessions, with a Socket Timeout Matching the Call Timeout
+try:
+    import requests  # noqa: F401
+    stripe.default_http_client = stripe.RequestsClient(timeout=STRIPE_TIMEOUT_SECONDS)
+except ImportError:
+    pass
+
+# Errors that Indicate Stripe (or the Network to it) is Unhealthy, not a Bad Request
+OUTAGE_ERRORS = (stripe.error.APIConnectionError,
+                 stripe.error.APIError,
+                 stripe.error.RateLimitError)
+
+
+class StripeUnavailableError(Exception):
+    pass
+
+
+# Opens after Consecutive Failures, then Lets a Single Trial Call Through after the Cooldown
+class CircuitBreaker:
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    # Returns whether the Call may Proceed, and whether it is the Half-Open Trial
+    def allow(self) -> tuple[bool, bool]:
+        state = self.state
+        if state == "closed":
+            return True, False
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True, True
+        return False, False
+
+    # Only the Trial Releases the Trial Slot; a Call Admitted while Closed may Settle Later
+    def record_success(self, trial: bool = False):
+        self.failures = 0
+        self.opened_at = None
+        if trial:
+            self.trial_in_flight = False
+
+    def record_failure(self, trial: bool = False):
+        self.failures += 1
+        if trial:
+            self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            self.opened_at = monotonic()
+
+
+# Async Facade over the Blocking Stripe SDK
+class StripeGateway:
+    def __init__(self, max_concurrency: int, timeout: float, breaker: CircuitBreaker):
+        self.timeout = timeout
+        self.breaker = breaker
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                           thread_name_prefix="stripe")
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def call(self, func, *args, **kwargs):
+        allowed, trial = self.breaker.allow()
+        if not allowed:
+            raise StripeUnavailableError("Stripe is Temporarily Unavailable")
+
+        try:
+            async with self.semaphore:
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(self.executor, partial(func, *args, **kwargs)),
+                        timeout=self.timeout)
+
+                except asyncio.TimeoutError:
+                    self.breaker.record_failure(trial)
+                    raise StripeUnavailableError("Stripe Request Timed Out")
+
+                except OUTAGE_ERRORS:
+                    self.breaker.record_failure(trial)
+                    raise
+
+                except Exception:
+                    # Rejected Requests still Prove Stripe is Reachable
+                    self.breaker.record_success(trial)
+                    raise
+
+            self.breaker.record_success(trial)
+            return result
+
+        finally:
+            # A Trial Cancelled before it Settled Proves Nothing, so the Next Call may Try
+            if trial:
+                self.breaker.trial_in_flight = False
+
+    async def list_products(self) -> list:
+        return await self.call(
+            lambda: list(stripe.Product.list(active=True, limit=100).auto_paging_iter()))
+
+    async def list_prices(self) -> list:
+        return await self.call(
+            lambda: list(stripe.Price.list(active=True, limit=100).auto_paging_iter()))
+
+    async def create_checkout_session(self, **params):
+        return await self.call(stripe.checkout.Session.create, **params)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+stripe_gateway = StripeGateway(STRIPE_MAX_CONCURRENCY,
+                               STRIPE_TIMEOUT_SECONDS,
+                               CircuitBreaker(STRIPE_BREAKER_THRESHOLD, STRIPE_BREAKER_COOLDOWN))
+
+
+# Util Function to Get the Active Stripe Gateway
+def get_stripe_gateway() -> StripeGateway:
+    return stripe_gateway
+
+
+# Util Function to Swap the Stripe Gateway (e.g. for a Local Fake in Tests)
+def set_stripe_gateway(gateway: StripeGateway):
+    global stripe_gateway
+    stripe_gateway = gateway
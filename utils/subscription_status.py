@@ -0,0 +1,156 @@
+from sqlalchemy import select, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from validations.accounts import SubscriptionResponse
+from utils.db import AsyncSessionLocal, engine
+from utils.events import StreamEvent, event_hub
+from collections import OrderedDict
+from dotenv import load_dotenv
+from typing import Iterable, Optional
+from uuid import UUID
+import asyncio
+import time
+import os
+
+load_dotenv()
+
+SUBSCRIPTION_STATUS_CACHE_SIZE = int(os.environ.get("SUBSCRIPTION_STATUS_CACHE_SIZE", 100000))
+
+# Bound on how Long a Status Changed by Another Worker Process can be Served Stale
+SUBSCRIPTION_STATUS_TTL_SECONDS = float(os.environ.get("SUBSCRIPTION_STATUS_TTL_SECONDS", 60))
+
+# Longest a Checkout Completion Wait may Hold a Request Open
+SUBSCRIPTION_WAIT_MAX_SECONDS = float(os.environ.get("SUBSCRIPTION_WAIT_MAX_SECONDS", 60))
+
+
+# Bounded LRU of "Has an Active Subscription" Answers, Keyed by User ID
+# Each Invalidation Bumps a Generation, so a Lookup that Raced with a Change
+# is not Stored and Cannot Reinstate the Old Answer.
+class SubscriptionStatusCache:
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries: OrderedDict[UUID, tuple[bool, float]] = OrderedDict()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: UUID) -> Optional[bool]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        active, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self.entries[user_id]
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(user_id)
+        self.hits += 1
+        return active
+
+    def put(self, user_id: UUID, active: bool, generation: int):
+        if generation != self.generation:
+            return
+
+        self.entries[user_id] = (active, time.monotonic() + self.ttl_seconds)
+        self.entries.move_to_end(user_id)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[UUID]):
+        self.generation += 1
+        for user_id in user_ids:
+            self.entries.pop(user_id, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+subscription_status_cache = SubscriptionStatusCache(SUBSCRIPTION_STATUS_CACHE_SIZE,
+                                                    SUBSCRIPTION_STATUS_TTL_SECONDS)
+
+
+# Util Function to Drop a User's Cached Status when their Subscription Changes
+# With the RESP Fan-Out every Worker Receives the Event, not Only the One that Committed it.
+def _invalidate_on_event(user_id: UUID, event: StreamEvent):
+    if event.kind == "subscription":
+        subscription_status_cache.invalidate([user_id])
+
+
+event_hub.add_listener(_invalidate_on_event)
+
+
+# Util Function to Check for an Active Subscription with a Single EXISTS Query
+# Served by the Partial Unique Index on Active Subscriptions.
+# Only Answers Read on the Primary are Cached: a Lagging Replica can Answer from before the
+# Webhook's Commit (and its Invalidation), and that Answer would then Outlive the Lag.
+async def has_active_subscription(db: AsyncSession, user_id: UUID) -> bool:
+    active = subscription_status_cache.get(user_id)
+    if active is not None:
+        return active
+
+    generation = subscription_status_cache.generation
+    stmt = select(exists().where(Subscription.user_id == user_id,
+                                 Subscription.status == ValidSubscriptionStatus.ACTIVE))
+    active = bool((await db.execute(stmt)).scalar())
+    if db.get_bind() is engine.sync_engine:
+        subscription_status_cache.put(user_id, active, generation)
+    return active
+
+
+# Util Function to Fetch the Active Subscription of a User
+# Users Known to have no Active Subscription are Answered from the Status Cache,
+# unless `cached` is False.
+async def active_subscription(db: AsyncSession, user_id: UUID,
+                              cached: bool = True) -> Optional[SubscriptionResponse]:
+    if cached and not await has_active_subscription(db, user_id):
+        return None
+
+    stmt = select(Subscription).where(Subscription.user_id == user_id,
+                                      Subscription.status == ValidSubscriptionStatus.ACTIVE)
+    subscription = (await db.execute(stmt.limit(1))).scalars().first()
+    return SubscriptionResponse.model_validate(subscription) if subscription else None
+
+
+# Util Function to Wait until a User's Subscription Becomes Active, or the Timeout Passes
+# The User's Event Stream is Joined before the First Check, so an Activation Cannot Slip
+# Between them; the Wait Itself Holds no Session and Issues no Queries. The Check Skips the
+# Status Cache, which Checkout has Just Filled with "Not Active" for this User, and Reads the
+# Primary: an Activation Committed before the Join Might not have Reached a Replica yet.
+# Returns the Subscription as JSON, or None on Timeout.
+async def wait_for_active_subscription(user_id: UUID, timeout: float) -> Optional[str]:
+    subscriber = event_hub.subscribe(user_id)
+    try:
+        async with AsyncSessionLocal() as db:
+            current = await active_subscription(db, user_id, cached=False)
+        if current is not None:
+            return current.model_dump_json()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                event = await subscriber.next_event(remaining)
+            except asyncio.TimeoutError:
+                return None
+
+            if event is None:
+                return None
+            if event.kind == "subscription":
+                return event.data
+
+    finally:
+        event_hub.unsubscribe(subscriber)
@@ -0,0 +1,255 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, insert, or_, case
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.accounts import Account
+from schemas.transactions import Transaction, ValidTransactionStatus
+from validations.accounts import (
+    TransactionRequest,
+    TransactionResponse,
+    TransactionBatchRequest,
+    TransactionBatchItemResult,
+    TransactionBatchResponse)
+from utils.balance_cache import balance_cache
+from utils.events import publish_account_updates
+from dotenv import load_dotenv
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+import asyncio
+import random
+import os
+
+load_dotenv()
+
+TRANSFER_MAX_ATTEMPTS = int(os.environ.get("TRANSFER_MAX_ATTEMPTS", 5))
+TRANSFER_BACKOFF_BASE = float(os.environ.get("TRANSFER_BACKOFF_BASE", 0.005))
+TRANSFER_BACKOFF_CAP = float(os.environ.get("TRANSFER_BACKOFF_CAP", 0.2))
+
+# Columns Returned by Balance Updates, Enough to Refresh the Balance Cache and Streams
+BALANCE_COLUMNS = (Account.id, Account.user_id, Account.currency, Account.balance,
+                   Account.last_updated, Account.version)
+
+# Serialization Failure and Deadlock Detected (PostgreSQL SQLSTATE Codes)
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
+
+# Util Function to Check Whether a Database Error is Safe to Retry
+def is_retryable_error(error: DBAPIError) -> bool:
+    orig = error.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    if code in RETRYABLE_SQLSTATES:
+        return True
+
+    # SQLite Reports Write Contention as a Locked Database
+    return "database is locked" in str(orig)
+
+
+# Util Function to Run a Unit of Work with Bounded, Jittered Retries
+async def run_with_retry(db: AsyncSession, unit_of_work, *args):
+    for attempt in range(1, TRANSFER_MAX_ATTEMPTS + 1):
+        try:
+            return await unit_of_work(db, *args)
+
+        except DBAPIError as e:
+            await db.rollback()
+            if not is_retryable_error(e) or attempt == TRANSFER_MAX_ATTEMPTS:
+                raise
+
+            backoff = min(TRANSFER_BACKOFF_CAP,
+                          TRANSFER_BACKOFF_BASE * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, backoff))
+
+
+# Util Function to Lock the Involved Accounts in a Fixed (Account ID) Order
+async def lock_accounts(db: AsyncSession, sender_user_id: UUID, account_ids: list[UUID]) -> list:
+    stmt = select(Account.id, Account.user_id, Account.balance).where(
+        or_(Account.user_id == sender_user_id,
+            Account.id.in_(account_ids))
+    ).order_by(Account.id).with_for_update()
+
+    result = await db.execute(stmt)
+    return result.all()
+
+
+# Util Function to Apply Net Balance Deltas with a Single Set-Based UPDATE
+# Returns the Updated Balances (for the Balance Cache), or None if the Guard Rejected a Row.
+async def apply_balance_deltas(db: AsyncSession, sender_id: UUID,
+                               deltas: dict[UUID, float]) -> Optional[list]:
+    debit = -deltas.get(sender_id, 0.0)
+
+    # The Sender Row is Guarded so its Balance can Never go Negative
+    stmt = update(Account).where(
+        Account.id.in_(deltas),
+        or_(Account.id != sender_id, Account.balance >= debit)
+    ).values(
+        balance=Account.balance + case(deltas, value=Account.id),
+        version=Account.version + 1
+    ).returning(*BALANCE_COLUMNS).execution_options(synchronize_session=False)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+    return rows if len(rows) == len(deltas) else None
+
+
+async def _apply_transfer(db: AsyncSession,
+                          sender_user_id: UUID,
+                          sender_username: str,
+                          transfer_data: TransactionRequest) -> TransactionResponse:
+    amount = transfer_data.transfer_amount
+    receiver_id = transfer_data.receiver_account_id
+
+    rows = await lock_accounts(db, sender_user_id, [receiver_id])
+    sender = next((row for row in rows if row.user_id == sender_user_id), None)
+    receiver = next((row for row in rows if row.id == receiver_id), None)
+
+    if not sender or sender.balance < amount:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Insufficient Balance or Invalid Sender Account")
+
+    if not receiver:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Receiver Account Not Found")
+
+    if sender.id == receiver.id:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Sender and Receiver Accounts must be Different")
+
+    balances = await apply_balance_deltas(db, sender.id, {sender.id: -amount, receiver.id: amount})
+    if balances is None:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Insufficient Balance or Invalid Sender Account")
+
+    transaction = TransactionResponse(
+        id=uuid4(),
+        sender_account_id=sender.id,
+        receiver_account_id=receiver.id,
+        sender_username=sender_username,
+        receiver_username=transfer_data.receiver_username,
+        transfer_amount=amount,
+        made_at=datetime.now(timezone.utc),
+        status=ValidTransactionStatus.COMPLETED
+    )
+    await db.execute(insert(Transaction).values(**transaction.model_dump()))
+    await db.commit()
+    await balance_cache.put_rows(balances)
+    await publish_account_updates(balances, [transaction])
+
+    return transaction
+
+
+# Util Function to Move Money Between Two Accounts Atomically
+async def execute_transfer(db: AsyncSession,
+                           sender_user_id: UUID,
+                           sender_username: str,
+                           transfer_data: TransactionRequest) -> TransactionResponse:
+    if transfer_data.transfer_amount <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Transfer Amount must be Greater than Zero")
+
+    return await run_with_retry(db, _apply_transfer,
+                                sender_user_id, sender_username, transfer_data)
+
+
+async def _apply_transfer_batch(db: AsyncSession,
+                                sender_user_id: UUID,
+                                sender_username: str,
+                                batch: TransactionBatchRequest) -> TransactionBatchResponse:
+    receiver_ids = list({transfer.receiver_account_id for transfer in batch.transfers})
+    rows = await lock_accounts(db, sender_user_id, receiver_ids)
+    accounts = {row.id: row for row in rows}
+    sender = next((row for row in rows if row.user_id == sender_user_id), None)
+
+    if not sender:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Invalid Sender Account")
+
+    available = sender.balance
+    deltas = {sender.id: 0.0}
+    made_at = datetime.now(timezone.utc)
+    results: list[TransactionBatchItemResult] = []
+
+    for index, transfer in enumerate(batch.transfers):
+        amount = transfer.transfer_amount
+        receiver_id = transfer.receiver_account_id
+        detail = None
+
+        if amount <= 0:
+            detail = "Transfer Amount must be Greater than Zero"
+        elif receiver_id not in accounts:
+            detail = "Receiver Account Not Found"
+        elif receiver_id == sender.id:
+            detail = "Sender and Receiver Accounts must be Different"
+        elif amount > available:
+            detail = "Insufficient Balance"
+
+        if detail:
+            results.append(TransactionBatchItemResult(index=index,
+                                                      status=ValidTransactionStatus.REJECTED,
+                                                      detail=detail))
+            continue
+
+        available -= amount
+        deltas[sender.id] -= amount
+        deltas[receiver_id] = deltas.get(receiver_id, 0.0) + amount
+
+        transaction = TransactionResponse(
+            id=uuid4(),
+            sender_account_id=sender.id,
+            receiver_account_id=receiver_id,
+            sender_username=sender_username,
+            receiver_username=transfer.receiver_username,
+            transfer_amount=amount,
+            made_at=made_at,
+            status=ValidTransactionStatus.COMPLETED
+        )
+        results.append(TransactionBatchItemResult(index=index,
+                                                  status=ValidTransactionStatus.COMPLETED,
+                                                  transaction=transaction))
+
+    completed = [result for result in results if result.transaction is not None]
+    rejected = len(results) - len(completed)
+
+    if not completed or (batch.atomic and rejected):
+        await db.rollback()
+        for result in completed:
+            result.status = ValidTransactionStatus.CANCELED
+            result.transaction = None
+            result.detail = "Batch Rolled Back"
+
+        return TransactionBatchResponse(committed=False,
+                                        completed=0,
+                                        rejected=len(results),
+                                        results=results)
+
+    balances = await apply_balance_deltas(db, sender.id, deltas)
+    if balances is None:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail="Insufficient Balance or Invalid Sender Account")
+
+    # Multi-Row INSERT for every Completed Transfer
+    await db.execute(insert(Transaction),
+                     [result.transaction.model_dump() for result in completed])
+    await db.commit()
+    await balance_cache.put_rows(balances)
+    await publish_account_updates(balances, [result.transaction for result in completed])
+
+    return TransactionBatchResponse(committed=True,
+                                    completed=len(completed),
+                                    rejected=rejected,
+                                    results=results)
+
+
+# Util Function to Settle a Batch of Transfers in One Database Transaction
+async def execute_transfer_batch(db: AsyncSession,
+                                 sender_user_id: UUID,
+                                 sender_username: str,
+                                 batch: TransactionBatchRequest) -> TransactionBatchResponse:
+    return await run_with_retry(db, _apply_transfer_batch,
+                                sender_user_id, sender_username, batch)
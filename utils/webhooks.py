@@ -0,0 +1,276 @@
+from sqlalchemy import select, update, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.webhook_events import WebhookEvent
+from schemas.subscriptions import Subscription, ValidSubscriptionStatus
+from schemas.accounts import Account, ValidAccountStatus
+from schemas.users import User
+from utils.db import AsyncSessionLocal
+from utils.subscription_status import subscription_status_cache
+from utils.balance_cache import balance_cache
+from utils.events import publish_account_updates, publish_subscription_updates
+from validations.accounts import SubscriptionResponse
+from utils.transfers import BALANCE_COLUMNS
+from dotenv import load_dotenv
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Optional
+import asyncio
+import os
+
+load_dotenv()
+
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 200))
+WEBHOOK_POLL_SECONDS = float(os.environ.get("WEBHOOK_POLL_SECONDS", 5))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", 5))
+
+# Event Types Persisted to the Inbox and Applied by the Worker
+INBOX_EVENT_TYPES = {"invoice.paid", "customer.subscription.deleted"}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Util Function to Compute the Account Credit Granted for a Paid Invoice
+def invoice_credit(invoice: dict) -> float:
+    return 500 if invoice.get("amount_paid") <= 5 else 2000
+
+
+# What an Applied Batch Changed: Users whose Subscription Status may Differ, New Balances
+# and the Subscriptions that Became Active
+@dataclass(slots=True)
+class AppliedEvents:
+    subscription_users: set
+    balances: list
+    activated: list
+
+
+# Util Function to Apply a Batch of Inbox Events in the Given Session
+# Lookups are Grouped per Batch (Users by Email, Accounts by User) and Credits
+# are Summed per User, so the Batch Costs a Fixed Number of Statements.
+async def apply_events(db: AsyncSession, events: list[WebhookEvent]) -> AppliedEvents:
+    invoices = [event.payload["data"]["object"] for event in events
+                if event.type == "invoice.paid"]
+    canceled_source_ids = [event.payload["data"]["object"].get("id") for event in events
+                           if event.type == "customer.subscription.deleted"]
+
+    emails = {invoice.get("customer_email") for invoice in invoices} - {None}
+    users = {}
+    if emails:
+        result = await db.execute(select(User.id, User.email).where(User.email.in_(emails)))
+        users = {row.email: row.id for row in result}
+
+    credits: dict = {}
+    currencies: dict = {}
+    subscriptions: dict = {}
+    balances: list = []
+    for invoice in invoices:
+        user_id = users.get(invoice.get("customer_email"))
+        if user_id is None:
+            continue
+
+        period = invoice["lines"]["data"][0]["period"]
+        subscriptions.setdefault(user_id, []).append(Subscription(
+            user_id=user_id,
+            source_id=invoice.get("subscription"),
+            currency=invoice.get("currency"),
+            amount=invoice.get("amount_paid") / 100,
+            started_at=datetime.fromtimestamp(period["start"]),
+            ended_at=datetime.fromtimestamp(period["end"]),
+            status=ValidSubscriptionStatus.ENDED))
+
+        credits[user_id] = credits.get(user_id, 0.0) + invoice_credit(invoice)
+        currencies.setdefault(user_id, invoice.get("currency"))
+
+    if subscriptions:
+        # A Paid Invoice Renews the Subscription: the Latest Period Becomes the Active One
+        # and Earlier Periods End, which Keeps one Active Row per User (Partial Unique Index)
+        stmt = update(Subscription).where(
+            Subscription.user_id.in_(subscriptions),
+            Subscription.status == ValidSubscriptionStatus.ACTIVE
+        ).values(status=ValidSubscriptionStatus.ENDED).execution_options(synchronize_session=False)
+        await db.execute(stmt)
+
+        for periods in subscriptions.values():
+            periods[-1].status = ValidSubscriptionStatus.ACTIVE
+            db.add_all(periods)
+
+    if credits:
+        result = await db.execute(select(Account.user_id).where(Account.user_id.in_(credits)))
+        existing = set(result.scalars().all())
+
+        if existing:
+            stmt = update(Account).where(Account.user_id.in_(existing)).values(
+                balance=Account.balance + case({user_id: credits[user_id] for user_id in existing},
+                                               value=Account.user_id),
+                version=Account.version + 1
+            ).returning(*BALANCE_COLUMNS).execution_options(synchronize_session=False)
+            balances = (await db.execute(stmt)).all()
+
+        for user_id in credits.keys() - existing:
+            db.add(Account(user_id=user_id,
+                           currency=currencies[user_id],
+                           balance=credits[user_id],
+                           status=ValidAccountStatus.ACTIVE))
+
+    # New Subscriptions are Flushed First, so a Cancellation in the Same Batch Applies to Them
+    await db.flush()
+    changed = set(subscriptions)
+    if canceled_source_ids:
+        stmt = update(Subscription).where(
+            Subscription.source_id.in_(canceled_source_ids)
+        ).values(status=ValidSubscriptionStatus.CANCELED).returning(
+            Subscription.user_id).execution_options(synchronize_session=False)
+        result = await db.execute(stmt)
+        changed.update(result.scalars().all())
+
+    activated = [SubscriptionResponse.model_validate(periods[-1]) for periods in subscriptions.values()
+                 if periods[-1].source_id not in canceled_source_ids]
+    return AppliedEvents(subscription_users=changed, balances=balances, activated=activated)
+
+
+# Util Function to Mark Pending Events Processed, Returning the IDs this Transaction Claimed
+# SQLite Ignores FOR UPDATE SKIP LOCKED, so Concurrent Workers Reading the Same Batch are
+# Serialized Here: the Later Update Finds processed_at Set and Claims Nothing. The Claim is
+# Rolled Back with the Batch if Applying it Fails.
+async def _claim_events(db: AsyncSession, event_ids: list[str], now: datetime) -> set[str]:
+    stmt = update(WebhookEvent).where(
+        WebhookEvent.id.in_(event_ids),
+        WebhookEvent.processed_at.is_(None)
+    ).values(processed_at=now).returning(WebhookEvent.id)
+    result = await db.execute(stmt, execution_options={"synchronize_session": False})
+    return set(result.scalars().all())
+
+
+# Background Worker that Drains the Webhook Inbox in Batches
+class WebhookInboxWorker:
+    def __init__(self, batch_size: int, poll_seconds: float, max_attempts: int):
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.processed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_batch_seconds = 0.0
+        self.last_lag_seconds = 0.0
+
+    def notify(self):
+        self.wakeup.set()
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _run(self):
+        while True:
+            try:
+                drained = await self.drain_once()
+            except Exception as e:
+                print(f"Webhook Inbox Drain Failed: {str(e)}")
+                drained = 0
+
+            if drained < self.batch_size:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self.wakeup.clear()
+
+    async def drain_once(self) -> int:
+        started = perf_counter()
+        async with AsyncSessionLocal() as db:
+            stmt = select(WebhookEvent).where(
+                WebhookEvent.processed_at.is_(None),
+                WebhookEvent.attempts < self.max_attempts
+            ).order_by(WebhookEvent.received_at).limit(self.batch_size).with_for_update(skip_locked=True)
+            result = await db.execute(stmt)
+            events = result.scalars().all()
+            if not events:
+                return 0
+
+            event_ids = [event.id for event in events]
+            now = datetime.now(timezone.utc)
+            self.last_lag_seconds = (now - _as_utc(events[0].received_at)).total_seconds()
+
+            try:
+                claimed = await _claim_events(db, event_ids, now)
+                events = [event for event in events if event.id in claimed]
+                if not events:
+                    await db.rollback()
+                    return 0
+
+                applied = await apply_events(db, events)
+                await db.commit()
+                await self._publish(applied)
+                self.processed += len(events)
+
+            except Exception:
+                await db.rollback()
+                await self._apply_individually(event_ids)
+
+        self.batches += 1
+        self.last_batch_seconds = perf_counter() - started
+        return len(events)
+
+    # Committed Changes Reach the Caches Only after the Commit
+    async def _publish(self, applied: AppliedEvents):
+        subscription_status_cache.invalidate(applied.subscription_users)
+        await balance_cache.put_rows(applied.balances)
+        await publish_account_updates(applied.balances)
+        await publish_subscription_updates(applied.activated)
+
+    # A Failing Batch is Retried One Event per Transaction, so a Bad Event Cannot Block Others
+    async def _apply_individually(self, event_ids: list[str]):
+        for event_id in event_ids:
+            async with AsyncSessionLocal() as db:
+                event = await db.get(WebhookEvent, event_id, with_for_update=True)
+                if event is None or event.processed_at is not None:
+                    continue
+
+                try:
+                    if not await _claim_events(db, [event_id], datetime.now(timezone.utc)):
+                        await db.rollback()
+                        continue
+
+                    applied = await apply_events(db, [event])
+                    await db.commit()
+                    await self._publish(applied)
+                    self.processed += 1
+
+                except Exception as e:
+                    await db.rollback()
+                    await db.execute(update(WebhookEvent).where(WebhookEvent.id == event_id).values(
+                        attempts=WebhookEvent.attempts + 1, last_error=str(e)))
+                    await db.commit()
+                    self.failed += 1
+
+    async def metrics(self, db: AsyncSession) -> dict:
+        stmt = select(func.count(), func.min(WebhookEvent.received_at)).where(
+            WebhookEvent.processed_at.is_(None))
+        pending, oldest = (await db.execute(stmt)).one()
+        oldest_age = (datetime.now(timezone.utc) - _as_utc(oldest)).total_seconds() if oldest else 0.0
+
+        return {
+            "pending": pending,
+            "oldest_pending_age_seconds": oldest_age,
+            "processed": self.processed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_batch_seconds": self.last_batch_seconds,
+            "last_lag_seconds": self.last_lag_seconds,
+        }
+
+
+webhook_worker = WebhookInboxWorker(WEBHOOK_BATCH_SIZE, WEBHOOK_POLL_SECONDS, WEBHOOK_MAX_ATTEMPTS)
@@ -145,6 +145,60 @@ class TransactionResponse(TransactionBase):
     )
 
 
+# Request Model for Settling Many Transfers in One Database Transaction
+class TransactionBatchRequest(BaseModel):
+    transfers: List[TransactionRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=5000,
+        description="Transfers to be Settled from the Current User's Account"
+    )
+    atomic: bool = Field(
+        default=True,
+        description="Roll Back the Whole Batch if any Transfer is Rejected"
+    )
+
+
+# Per-Item Result of a Batch Transfer
+class TransactionBatchItemResult(BaseModel):
+    index: int = Field(
+        ...,
+        description="Position of the Transfer in the Submitted Batch"
+    )
+    status: ValidTransactionStatus = Field(
+        ...,
+        description="Outcome of the Transfer"
+    )
+    transaction: Optional[TransactionResponse] = Field(
+        None,
+        description="Recorded Transaction, if the Transfer was Completed"
+    )
+    detail: Optional[str] = Field(
+        None,
+        description="Reason the Transfer was Rejected or Canceled"
+    )
+
+
+# Response Model for Batch Transfers
+class TransactionBatchResponse(BaseModel):
+    committed: bool = Field(
+        ...,
+        description="Whether any Balance Changes were Committed"
+    )
+    completed: int = Field(
+        ...,
+        description="Number of Completed Transfers"
+    )
+    rejected: int = Field(
+        ...,
+        description="Number of Rejected or Canceled Transfers"
+    )
+    results: List[TransactionBatchItemResult] = Field(
+        ...,
+        description="Per-Item Results in Submission Order"
+    )
+
+
 class SubscriptionBase(BaseModel):
     user_id: UUID = Field(
         ...,
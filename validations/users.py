@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
 
@@ -120,3 +120,44 @@ class UserPublicResponse(UserBase):
         ...,
         description="Named Position Role of the User"
     )
+
+
+
+# Per-Row Error from Bulk User Provisioning
+class BulkUserError(BaseModel):
+    index: int = Field(
+        ...,
+        description="Position of the Row in the Submitted Batch"
+    )
+    username: Optional[str] = Field(
+        None,
+        description="Username of the Row, if it could be Read"
+    )
+    detail: str = Field(
+        ...,
+        description="Reason the Row was not Created"
+    )
+
+
+# Response Model for Bulk User Provisioning
+class BulkUserResponse(BaseModel):
+    created: int = Field(
+        ...,
+        description="Number of Users Created"
+    )
+    failed: int = Field(
+        ...,
+        description="Number of Rows Rejected"
+    )
+    elapsed_seconds: float = Field(
+        ...,
+        description="Wall Time Spent Provisioning the Batch"
+    )
+    users_per_second: float = Field(
+        ...,
+        description="Provisioning Throughput"
+    )
+    errors: List[BulkUserError] = Field(
+        default_factory=list,
+        description="Rejected Rows with their Reasons"
+    )